@@ -3,7 +3,11 @@ from werkzeug.exceptions import HTTPException, BadRequest
 
 from config import Config
 from app_config.database import init_db
-from extensions import jwt
+from app_config.cli import init_cli
+from app_config.scheduler import init_scheduler
+from extensions import (
+    jwt, catalog_cache, sql_profiler, metrics, table_versions, hash_pool, rate_limiter, token_blocklist, audit_log
+)
 
 from routes.auth_routes import auth_bp
 from routes.health_routes import health_bp
@@ -14,6 +18,7 @@ from routes.category_routes import category_bp
 from routes.book_copy_routes import book_copy_bp
 from routes.loan_routes import loan_bp
 from routes.export_routes import export_bp
+from routes.debug_routes import debug_bp
 
 
 def create_app():
@@ -31,6 +36,16 @@ def create_app():
 
     init_db(app)
     jwt.init_app(app)
+    table_versions.init_app(app)
+    token_blocklist.init_app(app)
+    catalog_cache.init_app(app)
+    sql_profiler.init_app(app)
+    hash_pool.init_app(app)
+    rate_limiter.init_app(app)
+    audit_log.init_app(app)
+    metrics.init_app(app)
+    init_cli(app)
+    init_scheduler(app)
 
     @app.errorhandler(Exception)
     def handle_error(err):
@@ -44,11 +59,13 @@ def create_app():
             err (Exception): The caught exception.
 
         Returns:
-            tuple: JSON response and HTTP status code.
+            tuple: JSON response, HTTP status code and headers of HTTP errors (e.g. Retry-After).
                   Format: {"error": "ErrorType", "message": "description"}
         """
+        headers = []
         if isinstance(err, HTTPException):
             code = err.code
+            headers = [(k, v) for k, v in err.get_headers() if k.lower() != "content-type"]
             if isinstance(err, BadRequest):
                 message = "Invalid request payload"  # safer message
             else:
@@ -60,7 +77,7 @@ def create_app():
         return jsonify({
             "error": type(err).__name__,
             "message": message
-        }), code
+        }), code, headers
 
     app.register_blueprint(health_bp, url_prefix="/api")
     app.register_blueprint(user_bp, url_prefix="/api/users")
@@ -71,6 +88,7 @@ def create_app():
     app.register_blueprint(book_copy_bp, url_prefix="/api/book_copies")
     app.register_blueprint(loan_bp, url_prefix="/api/loans")
     app.register_blueprint(export_bp, url_prefix="/api/export")
+    app.register_blueprint(debug_bp, url_prefix="/api/debug")
 
     return app
 
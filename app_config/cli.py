@@ -0,0 +1,96 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app_config.search_index import rebuild_search_index
+from extensions import db
+from services.seed_service import SeedService
+from utils.password_utils import check_password, hash_password
+
+
+def init_cli(app):
+    """
+    Register the custom `flask` CLI commands.
+
+    Args:
+        app (Flask): Application to register the commands on.
+    """
+    app.cli.add_command(seed_command)
+    app.cli.add_command(search_reindex_command)
+    app.cli.add_command(bcrypt_calibrate_command)
+
+
+@click.command("seed")
+@click.option("--loans", type=click.IntRange(min=0), default=100_000, show_default=True,
+              help="Number of loans to generate.")
+@click.option("--users", type=click.IntRange(min=1), help="Number of users (default: loans / 20).")
+@click.option("--books", type=click.IntRange(min=1), help="Number of books (default: loans / 50).")
+@click.option("--years", type=click.IntRange(min=1), default=3, show_default=True,
+              help="Years of loan history.")
+@click.option("--seed", "seed_value", type=int, default=42, show_default=True, help="Random seed.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=10_000, show_default=True,
+              help="Rows per insert batch.")
+@with_appcontext
+def seed_command(loans, users, books, years, seed_value, batch_size):
+    """
+    Fill the database with realistic synthetic library data.
+    """
+    started = time.perf_counter()
+    counts = SeedService(seed=seed_value, batch_size=batch_size).seed(
+        loans, users=users, books=books, years=years
+    )
+    elapsed = time.perf_counter() - started
+
+    for table, count in counts.items():
+        click.echo(f"{table:<12}{count:>12,}")
+    click.echo(f"Seeded in {elapsed:.1f}s; synthetic users log in with password "
+               f"'{SeedService.SYNTHETIC_PASSWORD}'")
+
+
+@click.command("search-reindex")
+@with_appcontext
+def search_reindex_command():
+    """
+    Rebuild the book search index from the current books.
+    """
+    started = time.perf_counter()
+    rebuild_search_index(db.engine)
+    click.echo(f"Search index rebuilt in {time.perf_counter() - started:.1f}s")
+
+
+@click.command("bcrypt-calibrate")
+@click.option("--target-ms", type=click.FloatRange(min=1), default=250, show_default=True,
+              help="Longest acceptable time to verify one password.")
+@click.option("--min-rounds", type=click.IntRange(4, 31), default=10, show_default=True,
+              help="Lowest cost considered.")
+@click.option("--max-rounds", type=click.IntRange(4, 31), default=16, show_default=True,
+              help="Highest cost considered.")
+@click.option("--samples", type=click.IntRange(min=1), default=3, show_default=True,
+              help="Verifications timed per cost.")
+@with_appcontext
+def bcrypt_calibrate_command(target_ms, min_rounds, max_rounds, samples):
+    """
+    Pick the highest bcrypt cost whose verification stays within a target time on this host.
+    """
+    password = "calibration-Password@123"
+    chosen = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        hashed = hash_password(password, rounds)
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            check_password(hashed, password)
+            timings.append((time.perf_counter() - started) * 1000)
+        elapsed = sorted(timings)[len(timings) // 2]
+        click.echo(f"cost {rounds:>2}: {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = rounds
+
+    if chosen is None:
+        click.echo(f"Even cost {min_rounds} takes longer than {target_ms:g} ms; "
+                   f"BCRYPT_LOG_ROUNDS={min_rounds} is the lowest allowed here")
+        return
+    click.echo(f"Suggested BCRYPT_LOG_ROUNDS={chosen} (current: {current_app.config['BCRYPT_LOG_ROUNDS']})")
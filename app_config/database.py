@@ -1,4 +1,10 @@
+import logging
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+
 from extensions import db, bcrypt
+from app_config.search_index import init_search_index
 
 
 def init_db(app):
@@ -12,5 +18,31 @@ def init_db(app):
         from models.book_model import Book
         from models.book_copy_model import BookCopy
         from models.loan_model import Loan
+        from models.overdue_loan_model import OverdueLoan
+        from models.overdue_scan_model import OverdueScan
+        from models.overdue_scan_state_model import OverdueScanState
+        from models.revoked_token_model import RevokedToken
+        from models.audit_event_model import AuditEvent
         db.create_all()
+        _create_missing_indexes()
+        init_search_index(db.engine)
+
+
+def _create_missing_indexes():
+    """
+    Create model indexes that are missing from already existing tables.
+
+    ``db.create_all()`` skips tables that already exist, so indexes declared on
+    a model after its table was first created would otherwise never be built.
+    ``IF NOT EXISTS`` is used because reflection does not report expression
+    indexes on every backend, which defeats ``checkfirst``.
+    A unique index that existing duplicate rows prevent is skipped with a warning.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+            except IntegrityError as e:
+                logging.warning(f"Could not create index {index.name}, existing rows violate it: {e.orig}")
 
@@ -0,0 +1,17 @@
+from extensions import token_blocklist
+from utils.scheduler import PeriodicJob
+from services.loan_service import LoanService
+
+
+def init_scheduler(app):
+    """
+    Register the periodic background jobs of the app.
+
+    Args:
+        app (Flask): Application to run the jobs for.
+    """
+    overdue_scan = PeriodicJob("overdue-scan", lambda: LoanService().refresh_overdue_snapshot())
+    overdue_scan.init_app(app, app.config["OVERDUE_SCAN_INTERVAL"])
+
+    blocklist_sync = PeriodicJob("token-blocklist-sync", token_blocklist.sync)
+    blocklist_sync.init_app(app, app.config["TOKEN_BLOCKLIST_SYNC_INTERVAL"])
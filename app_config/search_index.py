@@ -0,0 +1,149 @@
+"""
+Full-text search index over books, their author and category names.
+
+SQLite uses an FTS5 table, PostgreSQL a tsvector document with a GIN index
+plus a pg_trgm index for fuzzy matching. Both are kept in sync by database
+triggers, so every write path (ORM, bulk inserts, COPY) updates the index.
+Other databases have no index; search falls back to LIKE there.
+"""
+
+SEARCH_TABLE = "book_search"
+
+_SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+        title, author, category,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+]
+
+_SQLITE_ROW = f"""INSERT INTO {SEARCH_TABLE} (rowid, title, author, category) VALUES (
+        new.id, new.title,
+        (SELECT name FROM author WHERE id = new.author_id),
+        (SELECT name FROM category WHERE id = new.category_id)
+    );"""
+
+_SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS book_search_ai AFTER INSERT ON book BEGIN
+    {_SQLITE_ROW}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS book_search_au AFTER UPDATE OF title, author_id, category_id ON book BEGIN
+    DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    {_SQLITE_ROW}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS book_search_ad AFTER DELETE ON book BEGIN
+    DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS book_search_author_au AFTER UPDATE OF name ON author BEGIN
+    UPDATE {SEARCH_TABLE} SET author = new.name WHERE rowid IN (SELECT id FROM book WHERE author_id = new.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS book_search_category_au AFTER UPDATE OF name ON category BEGIN
+    UPDATE {SEARCH_TABLE} SET category = new.name WHERE rowid IN (SELECT id FROM book WHERE category_id = new.id);
+    END""",
+]
+
+_SQLITE_BACKFILL = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, title, author, category)
+    SELECT b.id, b.title, a.name, c.name
+    FROM book b LEFT JOIN author a ON a.id = b.author_id LEFT JOIN category c ON c.id = b.category_id
+"""
+
+# Title terms weigh most, then author, then category
+_PG_ROWS = f"""
+    INSERT INTO {SEARCH_TABLE} (book_id, document, search_text)
+    SELECT b.id,
+           setweight(to_tsvector('simple', b.title), 'A')
+           || setweight(to_tsvector('simple', coalesce(a.name, '')), 'B')
+           || setweight(to_tsvector('simple', coalesce(c.name, '')), 'C'),
+           lower(b.title || ' ' || coalesce(a.name, '') || ' ' || coalesce(c.name, ''))
+    FROM book b LEFT JOIN author a ON a.id = b.author_id LEFT JOIN category c ON c.id = b.category_id
+"""
+
+_PG_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""CREATE TABLE {SEARCH_TABLE} (
+        book_id integer PRIMARY KEY REFERENCES book (id) ON DELETE CASCADE,
+        document tsvector NOT NULL,
+        search_text text NOT NULL
+    )""",
+    f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+    f"CREATE INDEX ix_{SEARCH_TABLE}_search_text_trgm ON {SEARCH_TABLE} USING GIN (search_text gin_trgm_ops)",
+]
+
+_PG_FUNCTIONS = [
+    f"""CREATE OR REPLACE FUNCTION book_search_sync(book_ids integer[]) RETURNS void AS $$
+    {_PG_ROWS}
+    WHERE b.id = ANY(book_ids)
+    ON CONFLICT (book_id) DO UPDATE SET document = EXCLUDED.document, search_text = EXCLUDED.search_text
+    $$ LANGUAGE sql""",
+    """CREATE OR REPLACE FUNCTION book_search_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_TABLE_NAME = 'book' THEN
+            PERFORM book_search_sync(ARRAY[NEW.id]);
+        ELSIF TG_TABLE_NAME = 'author' THEN
+            PERFORM book_search_sync(ARRAY(SELECT id FROM book WHERE author_id = NEW.id));
+        ELSE
+            PERFORM book_search_sync(ARRAY(SELECT id FROM book WHERE category_id = NEW.id));
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS book_search_book ON book",
+    """CREATE TRIGGER book_search_book AFTER INSERT OR UPDATE OF title, author_id, category_id ON book
+    FOR EACH ROW EXECUTE FUNCTION book_search_trigger()""",
+    "DROP TRIGGER IF EXISTS book_search_author ON author",
+    """CREATE TRIGGER book_search_author AFTER UPDATE OF name ON author
+    FOR EACH ROW EXECUTE FUNCTION book_search_trigger()""",
+    "DROP TRIGGER IF EXISTS book_search_category ON category",
+    """CREATE TRIGGER book_search_category AFTER UPDATE OF name ON category
+    FOR EACH ROW EXECUTE FUNCTION book_search_trigger()""",
+]
+
+
+def init_search_index(engine):
+    """
+    Create the search index and its triggers if missing.
+
+    A newly created index is filled from the existing books.
+
+    Args:
+        engine (Engine): Engine of the application database.
+    """
+    dialect = engine.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return
+
+    with engine.begin() as conn:
+        exists = engine.dialect.has_table(conn, SEARCH_TABLE)
+        if dialect == "sqlite":
+            if not exists:
+                for statement in _SQLITE_DDL:
+                    conn.exec_driver_sql(statement)
+            for statement in _SQLITE_TRIGGERS:
+                conn.exec_driver_sql(statement)
+            if not exists:
+                conn.exec_driver_sql(_SQLITE_BACKFILL)
+        else:
+            if not exists:
+                for statement in _PG_DDL:
+                    conn.exec_driver_sql(statement)
+            for statement in _PG_FUNCTIONS:
+                conn.exec_driver_sql(statement)
+            if not exists:
+                conn.exec_driver_sql(_PG_ROWS)
+
+
+def rebuild_search_index(engine):
+    """
+    Refill the search index from scratch.
+
+    Args:
+        engine (Engine): Engine of the application database.
+    """
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            conn.exec_driver_sql(f"DELETE FROM {SEARCH_TABLE}")
+            conn.exec_driver_sql(_SQLITE_BACKFILL)
+        elif dialect == "postgresql":
+            conn.exec_driver_sql(f"TRUNCATE {SEARCH_TABLE}")
+            conn.exec_driver_sql(_PG_ROWS)
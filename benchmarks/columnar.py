@@ -0,0 +1,155 @@
+"""
+Benchmark of large list responses: ORM objects vs Core row tuples.
+
+Seeds the synthetic dataset and builds one page of `--rows` loans three ways,
+each including JSON encoding with the app's JSON provider:
+
+    orm       select(Loan) + Loan.json() per row (the path used with ?include=)
+    rows      Core column tuples + one dict per row (default list format)
+    columnar  Core column tuples as {"columns", "rows"} (?format=columnar)
+
+For every path it reports the median and best time over `--repeat` runs and
+the peak Python memory of one run.
+
+Usage:
+    python -m benchmarks.columnar --size 100k --rows 100000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def build_paths():
+    """
+    Return the list-building paths in execution order.
+
+    Returns:
+        dict: Path name -> function taking a page size and returning the JSON body.
+    """
+    from flask import current_app
+
+    from extensions import db
+    from models.loan_model import Loan
+    from repositories.loan_repository import LoanRepository
+    from utils.pagination import keyset_page, rows_body
+
+    repo = LoanRepository()
+
+    def orm(limit):
+        loans, next_cursor = keyset_page(db.session, db.select(Loan), Loan.id, limit)
+        return current_app.json.dumps({'loans': [loan.json() for loan in loans], 'next_cursor': next_cursor})
+
+    def rows(limit):
+        columns, page, next_cursor = repo.find_page_rows(limit)
+        return current_app.json.dumps(rows_body('loans', columns, page, next_cursor, 'json'))
+
+    def columnar(limit):
+        columns, page, next_cursor = repo.find_page_rows(limit)
+        return current_app.json.dumps(rows_body('loans', columns, page, next_cursor, 'columnar'))
+
+    return {"orm": orm, "rows": rows, "columnar": columnar}
+
+
+def run_path(fn, limit, repeat):
+    """
+    Time one path and measure its peak memory.
+
+    The session is cleared after every run, so ORM runs do not reuse
+    instances from the identity map.
+
+    Args:
+        fn (callable): Path function from `build_paths`.
+        limit (int): Number of rows per page.
+        repeat (int): Timed runs.
+
+    Returns:
+        dict: {"median_ms", "best_ms", "peak_mem_kib", "bytes"}
+    """
+    from extensions import db
+
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        db.session.remove()
+        started = time.perf_counter()
+        size = len(fn(limit))
+        samples.append((time.perf_counter() - started) * 1000)
+
+    db.session.remove()
+    tracemalloc.start()
+    fn(limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.remove()
+
+    return {
+        "median_ms": statistics.median(samples),
+        "best_ms": min(samples),
+        "peak_mem_kib": peak / 1024,
+        "bytes": size,
+    }
+
+
+def main(argv=None):
+    """
+    Parse arguments, seed a temporary database and compare the paths.
+
+    Args:
+        argv (list[str], optional): Command line arguments, defaults to sys.argv.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Compare ORM and Core row paths for large list responses.")
+    parser.add_argument("--size", default="100k", help="Dataset size: 1k, 100k or 1m.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Loans per page.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the dataset.")
+    args = parser.parse_args(argv)
+
+    db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    db_file.close()
+    os.environ["DB_URL"] = f"sqlite:///{db_file.name}"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+    from app import create_app
+    from benchmarks.dataset import SIZES, seed
+    from extensions import db
+
+    if args.size not in SIZES:
+        parser.error(f"--size must be one of {', '.join(SIZES)}")
+
+    try:
+        app = create_app()
+        with app.app_context():
+            started = time.perf_counter()
+            counts = seed(args.size, args.seed)
+            print(f"Seeded {args.size} dataset in {time.perf_counter() - started:.1f}s: {counts}")
+
+            limit = min(args.rows, counts["loans"])
+            paths = build_paths()
+            results = {}
+            print(f"\n{limit} rows per page\n{'path':<12}{'median ms':>11}{'best ms':>10}{'peak KiB':>11}{'KiB out':>10}")
+            for name, fn in paths.items():
+                result = run_path(fn, limit, args.repeat)
+                results[name] = result
+                print(f"{name:<12}{result['median_ms']:>11.1f}{result['best_ms']:>10.1f}"
+                      f"{result['peak_mem_kib']:>11.1f}{result['bytes'] / 1024:>10.1f}")
+
+            baseline = results["orm"]["median_ms"]
+            for name in ("rows", "columnar"):
+                print(f"{name}: {baseline / results[name]['median_ms']:.2f}x faster than orm")
+            db.engine.dispose()
+    finally:
+        os.unlink(db_file.name)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
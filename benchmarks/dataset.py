@@ -0,0 +1,49 @@
+"""
+Synthetic dataset used by the benchmark suite.
+
+The data comes from SeedService, the generator behind `flask seed`, so the
+benchmarks measure the same shape of data the seed command produces.
+"""
+
+from extensions import db
+from models.user_model import User
+from services.seed_service import SeedService
+
+# Dataset name -> number of loans; every other table is sized from it
+SIZES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+BENCH_USERNAME = "benchuser"
+BENCH_PASSWORD = SeedService.SYNTHETIC_PASSWORD
+
+
+def seed(size, seed_value=42):
+    """
+    Fill an empty database with a deterministic synthetic library.
+
+    User 1 is the benchmark user (BENCH_USERNAME / BENCH_PASSWORD), an active
+    member without loans; everything else is generated by SeedService.
+
+    Args:
+        size (str): Key of SIZES.
+        seed_value (int, optional): Random seed. Default 42.
+
+    Returns:
+        dict: Row counts per table.
+    """
+    db.session.add(User(
+        id=1,
+        username=BENCH_USERNAME,
+        email="benchuser@example.com",
+        password=SeedService.SYNTHETIC_PASSWORD_HASH,
+        role="member",
+        is_active=True,
+    ))
+    db.session.flush()
+
+    counts = SeedService(seed=seed_value).seed(loans=SIZES[size])
+    counts["users"] += 1
+    return counts
@@ -0,0 +1,327 @@
+"""
+Benchmark suite for the API, driven through the Flask test client.
+
+Builds the app against a temporary SQLite database, seeds a synthetic dataset
+and times representative flows. For every scenario it reports p50/p95/p99
+latency, SQL statements per request and peak Python memory of one request,
+and can save the results as a JSON baseline or compare against one.
+
+Usage:
+    python -m benchmarks.run --size 1k
+    python -m benchmarks.run --size 100k --save baseline.json
+    python -m benchmarks.run --size 100k --compare baseline.json --threshold 15
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+EXPORT_ENTITIES = ("books", "authors", "categories", "book_copies", "loans", "users")
+EXPORT_FORMATS = ("csv", "ndjson", "xlsx")
+
+
+def percentile(samples, pct):
+    """
+    Return the pct-th percentile of samples using nearest-rank.
+
+    Args:
+        samples (list[float]): Measured values.
+        pct (float): Percentile in 0..100.
+
+    Returns:
+        float: Percentile value.
+    """
+    ordered = sorted(samples)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class BenchContext:
+    """
+    State shared by scenarios: test client, dataset sizes and checkout bookkeeping.
+
+    Args:
+        client (FlaskClient): Test client of the app under test.
+        counts (dict): Row counts per table of the seeded dataset.
+        available_copies (list[int]): IDs of copies free for checkout.
+    """
+
+    def __init__(self, client, counts, available_copies):
+        self.client = client
+        self.counts = counts
+        self.available_copies = available_copies
+        self.open_loans = []
+        self.rng = random.Random(7)
+
+
+def build_scenarios():
+    """
+    Return the benchmark scenarios in execution order.
+
+    Returns:
+        dict: Scenario name -> (request function taking a BenchContext, is_export flag).
+    """
+    def list_books(ctx):
+        after = ctx.rng.randint(0, max(0, ctx.counts["books"] - 50))
+        return ctx.client.get(f"/api/books?limit=50&after={after}")
+
+    def list_books_columnar(ctx):
+        after = ctx.rng.randint(0, max(0, ctx.counts["books"] - 50))
+        return ctx.client.get(f"/api/books?limit=50&after={after}&format=columnar")
+
+    def checkout(ctx):
+        copy_id = ctx.available_copies.pop()
+        response = ctx.client.post("/api/loans", json={"user_id": 1, "book_copy_id": copy_id})
+        loan = (response.get_json(silent=True) or {}).get("loan")
+        if loan:
+            ctx.open_loans.append(loan["id"])
+        return response
+
+    def return_loan(ctx):
+        loan_id = ctx.open_loans.pop()
+        return ctx.client.put(f"/api/loans/{loan_id}/return", json={"user_id": 1})
+
+    def loan_stats(ctx):
+        return ctx.client.get("/api/loans/stats")
+
+    def availability(ctx):
+        return ctx.client.get("/api/book_copies/availability?limit=50")
+
+    def login(ctx):
+        from benchmarks.dataset import BENCH_USERNAME, BENCH_PASSWORD
+        return ctx.client.post("/api/auth/login", json={"username": BENCH_USERNAME, "password": BENCH_PASSWORD})
+
+    scenarios = {
+        "list_books": (list_books, False),
+        "list_books_columnar": (list_books_columnar, False),
+        "checkout": (checkout, False),
+        "return": (return_loan, False),
+        "loan_stats": (loan_stats, False),
+        "availability": (availability, False),
+        "login": (login, False),
+    }
+
+    def export(entity, fmt):
+        return lambda ctx: ctx.client.get(f"/api/export/{entity}.{fmt}")
+
+    for fmt in EXPORT_FORMATS:
+        for entity in EXPORT_ENTITIES:
+            scenarios[f"export_{entity}_{fmt}"] = (export(entity, fmt), True)
+    return scenarios
+
+
+def consume(response):
+    """
+    Read a response body chunk by chunk without keeping it in memory.
+
+    Args:
+        response (TestResponse): Response to drain.
+    """
+    for _ in response.iter_encoded():
+        pass
+    response.close()
+
+
+def run_scenario(ctx, request_fn, iterations, statement_counter):
+    """
+    Time one scenario and measure its SQL statements and peak memory.
+
+    Latency and SQL counts come from `iterations` plain runs; peak memory is
+    taken from one extra run under tracemalloc, so tracing overhead does not
+    distort the timings.
+
+    Args:
+        ctx (BenchContext): Shared benchmark state.
+        request_fn (callable): Issues one request and returns the response.
+        iterations (int): Number of timed runs.
+        statement_counter (list[int]): Single-item counter incremented per SQL statement.
+
+    Returns:
+        dict: Latency percentiles (ms), SQL statements per request, peak memory (KiB) and errors.
+    """
+    latencies = []
+    statements = []
+    errors = 0
+
+    for _ in range(iterations + 1):
+        statement_counter[0] = 0
+        start = time.perf_counter()
+        response = request_fn(ctx)
+        consume(response)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statements.append(statement_counter[0])
+        if response.status_code >= 400:
+            errors += 1
+
+    # The first run warms caches and connections; keep it out of the stats
+    latencies, statements = latencies[1:], statements[1:]
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    consume(request_fn(ctx))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "sql_per_request": round(statistics.fmean(statements), 2),
+        "peak_mem_kib": round(peak / 1024, 1),
+        "errors": errors,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Print per-scenario p50 latency and SQL deltas against a baseline.
+
+    Args:
+        results (dict): Current scenario results.
+        baseline (dict): Saved baseline document.
+        threshold (float): Percent slowdown of p50 that counts as a regression.
+
+    Returns:
+        list[str]: Names of regressed scenarios.
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"\nComparison with baseline ({baseline.get('meta', {}).get('created_at', '?')}):")
+    print(f"{'scenario':<28}{'p50 base':>10}{'p50 now':>10}{'delta':>9}{'sql base':>10}{'sql now':>9}")
+    for name, current in results.items():
+        base = base_results.get(name)
+        if not base:
+            continue
+        delta = (current["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100 if base["p50_ms"] else 0.0
+        flag = ""
+        if delta > threshold or current["sql_per_request"] > base["sql_per_request"]:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28}{base['p50_ms']:>10.2f}{current['p50_ms']:>10.2f}{delta:>8.1f}%"
+              f"{base['sql_per_request']:>10.1f}{current['sql_per_request']:>9.1f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Args:
+        argv (list[str], optional): Arguments, defaults to sys.argv.
+
+    Returns:
+        int: Exit status; 1 if a comparison found regressions.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints through the Flask test client.")
+    parser.add_argument("--size", default="1k", help="Dataset size: 1k, 100k or 1m loans.")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per scenario.")
+    parser.add_argument("--export-iterations", type=int, default=3, help="Timed runs per export scenario.")
+    parser.add_argument("--scenarios", help="Comma-separated scenario names or prefixes to run.")
+    parser.add_argument("--save", help="Write results as a JSON baseline to this path.")
+    parser.add_argument("--compare", help="Compare results against a JSON baseline.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p50 slowdown in percent.")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset random seed.")
+    args = parser.parse_args(argv)
+
+    db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    db_file.close()
+    os.environ["DB_URL"] = f"sqlite:///{db_file.name}"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+    # Scenarios repeat logins and exports far beyond the production limits
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    from sqlalchemy import event
+    from app import create_app
+    from benchmarks.dataset import SIZES, seed
+    from extensions import db
+    from models.book_copy_model import BookCopy
+
+    if args.size not in SIZES:
+        parser.error(f"--size must be one of {', '.join(SIZES)}")
+
+    try:
+        app = create_app()
+        with app.app_context():
+            started = time.perf_counter()
+            counts = seed(args.size, args.seed)
+            print(f"Seeded {args.size} dataset in {time.perf_counter() - started:.1f}s: {counts}")
+
+            available = db.session.scalars(
+                db.select(BookCopy.id).where(BookCopy.available == True)
+            ).all()
+
+            statement_counter = [0]
+
+            @event.listens_for(db.engine, "before_cursor_execute")
+            def count_statement(*_):
+                statement_counter[0] += 1
+
+        scenarios = build_scenarios()
+        if args.scenarios:
+            wanted = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+            scenarios = {n: s for n, s in scenarios.items() if any(n.startswith(w) for w in wanted)}
+
+        # Every checkout needs its own free copy; returns reuse the checked out loans
+        needed = args.iterations + 2
+        ctx = BenchContext(app.test_client(), counts, list(available[-needed:]))
+
+        results = {}
+        print(f"\n{'scenario':<28}{'p50':>9}{'p95':>9}{'p99':>9}{'sql':>7}{'peak KiB':>11}")
+        for name, (request_fn, is_export) in scenarios.items():
+            iterations = args.export_iterations if is_export else args.iterations
+            if name == "return":
+                iterations = min(iterations, len(ctx.open_loans) - 2)
+            if iterations < 1:
+                continue
+            result = run_scenario(ctx, request_fn, iterations, statement_counter)
+            results[name] = result
+            print(f"{name:<28}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                  f"{result['sql_per_request']:>7.1f}{result['peak_mem_kib']:>11.1f}"
+                  + (f"  ({result['errors']} errors)" if result["errors"] else ""))
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        os.unlink(db_file.name)
+
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "size": args.size,
+            "counts": counts,
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("size") != args.size:
+            print(f"\nWarning: baseline was recorded with size {baseline.get('meta', {}).get('size')}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} scenario(s) regressed: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,57 @@ class Config:
 
     Environment Variables Optional:
         JWT_ACCESS_TOKEN_EXPIRES_HOURS: Token expiration in hours (default: 2)
+        HASH_POOL_WORKERS: Threads hashing and verifying passwords, 0 hashes on the request thread
+            (default: CPU count, at most 4)
+        HASH_POOL_MAX_QUEUE: bcrypt jobs that may wait for a worker; more are refused with 503 (default: 16)
+        HASH_POOL_MAX_WAIT: Seconds a queued bcrypt job may wait before it is refused with 503, 0 waits
+            forever (default: 2)
+        TOKEN_BLOCKLIST_SYNC_INTERVAL: Seconds between checks for tokens revoked by other worker processes;
+            tokens revoked by the serving process are blocked at once (default: 5)
+        AUDIT_ENABLED: Record audit events (logins, logouts, checkouts, returns, catalog edits) (default: true)
+        AUDIT_QUEUE_SIZE: Audit events buffered in memory; events beyond it are dropped (default: 10000)
+        AUDIT_BATCH_SIZE: Most audit events written by one INSERT (default: 500)
+        AUDIT_FLUSH_INTERVAL: Seconds a queued audit event waits at most before its batch is written (default: 1)
+        AUDIT_SHUTDOWN_TIMEOUT: Seconds the process waits at exit for queued audit events (default: 5)
+        RATE_LIMIT_ENABLED: Enforce the per-route rate limits (default: true)
+        RATE_LIMIT_STORAGE_URI: Where rate limit windows are kept: memory:// for one process, or
+            sqlite:////path/to/file.db to share them between the worker processes of a host (default: memory://)
+        RATE_LIMIT_LOGIN / RATE_LIMIT_FILL_EXTERNAL / RATE_LIMIT_HARVEST_EXTERNAL / RATE_LIMIT_EXPORT: Moving
+            window limits per client and route in `limits` notation, ';'-separated, empty disables (defaults:
+            "10/minute;50/hour", "5/minute", "2/minute;10/hour", "10/minute"; EXPORT applies to each
+            /api/export/*.xlsx route)
+        BCRYPT_LOG_ROUNDS: bcrypt cost (work factor) of new password hashes; stored hashes with another
+            cost are rehashed on the next successful login. `flask bcrypt-calibrate` suggests a value (default: 12)
+        PAGE_SIZE_DEFAULT: Page size for list endpoints when no limit is given (default: 50)
+        PAGE_SIZE_MAX: Largest page size a client may request (default: 200)
+        EXPORT_BATCH_SIZE: Rows fetched per round trip by streaming exports (default: 1000)
+        GOOGLE_BOOKS_API_URL: Google Books volumes endpoint (default: public API)
+        GOOGLE_BOOKS_TIMEOUT: Request timeout in seconds (default: 10)
+        GOOGLE_BOOKS_RETRIES: Retries per request on errors, 429 and 5xx (default: 3)
+        GOOGLE_BOOKS_BACKOFF: Exponential backoff factor in seconds between retries (default: 0.5)
+        GOOGLE_BOOKS_MAX_CONCURRENCY: Concurrent requests when harvesting (default: 8)
+        HARVEST_MAX_RESULTS: Largest number of results harvested per query (default: 1000)
+        HARVEST_MAX_QUERIES: Most queries accepted by one POST /api/books/harvest_external (default: 20)
+        LOAN_STATS_CACHE_TTL: Seconds loan totals are cached per process, 0 disables (default: 30)
+        LOAN_BATCH_MAX_SIZE: Most book copies checked out by one POST /api/loans/batch (default: 100)
+        LOAN_RETURN_BATCH_MAX_SIZE: Most book copies returned by one POST /api/loans/batch/return (default: 5000)
+        OVERDUE_SCAN_INTERVAL: Seconds between incremental refreshes of the overdue loan snapshot,
+            0 disables the background job (default: 3600)
+        OVERDUE_SCAN_LEASE: Seconds a scan run holds its claim; other processes skip the scan meanwhile,
+            and the claim of a crashed run expires after it (default: 600)
+        CACHE_<ENTITY>_TTL / CACHE_<ENTITY>_MAX_ITEMS: Read-through cache TTL in seconds (0 disables)
+            and size bound per catalog entity, for AUTHOR, CATEGORY and BOOK
+        SQL_PROFILER_ENABLED: Profile SQL per request, add Server-Timing headers (default: false)
+        SQL_PROFILER_BUFFER_SIZE: Request profiles kept for /api/debug/requests (default: 100)
+        SQL_SLOW_QUERY_MS: Statements at least this slow are logged (default: 100)
+        SQL_EXPLAIN_SLOW_QUERIES: Log the EXPLAIN plan of slow SELECTs (default: true)
+        SQL_N_PLUS_ONE_THRESHOLD: Repeats of one statement shape flagged as N+1 (default: 5)
+        METRICS_MULTIPROC_DIR: Directory shared by worker processes to aggregate /api/metrics;
+            unset keeps metrics per process (default: unset)
+        METRICS_FLUSH_INTERVAL: Seconds between metric snapshots written by each process (default: 5)
+        SEARCH_MAX_CANDIDATES: Matches ranked per book search, 0 ranks all (default: 10000)
+        TABLE_VERSION_DIR: Directory of the per-table version stamps behind ETags and catalog cache
+            invalidation, shared by all worker processes (default: a temp dir derived from DB_URL)
     """
     SQLALCHEMY_DATABASE_URI = os.environ["DB_URL"]
 
@@ -25,3 +76,74 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(
         hours=int(os.environ.get("JWT_ACCESS_TOKEN_EXPIRES_HOURS", 2))
     )
+
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = float(os.environ.get("TOKEN_BLOCKLIST_SYNC_INTERVAL", 5))
+
+    AUDIT_ENABLED = os.environ.get("AUDIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    AUDIT_QUEUE_SIZE = int(os.environ.get("AUDIT_QUEUE_SIZE", 10000))
+    AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", 500))
+    AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", 1))
+    AUDIT_SHUTDOWN_TIMEOUT = float(os.environ.get("AUDIT_SHUTDOWN_TIMEOUT", 5))
+
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATE_LIMIT_STORAGE_URI = os.environ.get("RATE_LIMIT_STORAGE_URI", "memory://")
+    RATE_LIMITS = {
+        "login": os.environ.get("RATE_LIMIT_LOGIN", "10/minute;50/hour"),
+        "fill_external": os.environ.get("RATE_LIMIT_FILL_EXTERNAL", "5/minute"),
+        "harvest_external": os.environ.get("RATE_LIMIT_HARVEST_EXTERNAL", "2/minute;10/hour"),
+        "export": os.environ.get("RATE_LIMIT_EXPORT", "10/minute"),
+    }
+
+    BCRYPT_LOG_ROUNDS = int(os.environ.get("BCRYPT_LOG_ROUNDS", 12))
+    HASH_POOL_WORKERS = int(os.environ.get("HASH_POOL_WORKERS", min(4, os.cpu_count() or 1)))
+    HASH_POOL_MAX_QUEUE = int(os.environ.get("HASH_POOL_MAX_QUEUE", 16))
+    HASH_POOL_MAX_WAIT = float(os.environ.get("HASH_POOL_MAX_WAIT", 2))
+
+    PAGE_SIZE_DEFAULT = int(os.environ.get("PAGE_SIZE_DEFAULT", 50))
+    PAGE_SIZE_MAX = int(os.environ.get("PAGE_SIZE_MAX", 200))
+
+    EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+
+    GOOGLE_BOOKS_API_URL = os.environ.get(
+        "GOOGLE_BOOKS_API_URL", "https://www.googleapis.com/books/v1/volumes"
+    )
+    GOOGLE_BOOKS_TIMEOUT = float(os.environ.get("GOOGLE_BOOKS_TIMEOUT", 10))
+    GOOGLE_BOOKS_RETRIES = int(os.environ.get("GOOGLE_BOOKS_RETRIES", 3))
+    GOOGLE_BOOKS_BACKOFF = float(os.environ.get("GOOGLE_BOOKS_BACKOFF", 0.5))
+    GOOGLE_BOOKS_MAX_CONCURRENCY = int(os.environ.get("GOOGLE_BOOKS_MAX_CONCURRENCY", 8))
+    HARVEST_MAX_RESULTS = int(os.environ.get("HARVEST_MAX_RESULTS", 1000))
+    HARVEST_MAX_QUERIES = int(os.environ.get("HARVEST_MAX_QUERIES", 20))
+
+    LOAN_STATS_CACHE_TTL = float(os.environ.get("LOAN_STATS_CACHE_TTL", 30))
+    LOAN_BATCH_MAX_SIZE = int(os.environ.get("LOAN_BATCH_MAX_SIZE", 100))
+    LOAN_RETURN_BATCH_MAX_SIZE = int(os.environ.get("LOAN_RETURN_BATCH_MAX_SIZE", 5000))
+    OVERDUE_SCAN_INTERVAL = float(os.environ.get("OVERDUE_SCAN_INTERVAL", 3600))
+    OVERDUE_SCAN_LEASE = float(os.environ.get("OVERDUE_SCAN_LEASE", 600))
+
+    CACHE_REGIONS = {
+        "author": {
+            "ttl": int(os.environ.get("CACHE_AUTHOR_TTL", 300)),
+            "max_items": int(os.environ.get("CACHE_AUTHOR_MAX_ITEMS", 1000)),
+        },
+        "category": {
+            "ttl": int(os.environ.get("CACHE_CATEGORY_TTL", 300)),
+            "max_items": int(os.environ.get("CACHE_CATEGORY_MAX_ITEMS", 500)),
+        },
+        "book": {
+            "ttl": int(os.environ.get("CACHE_BOOK_TTL", 120)),
+            "max_items": int(os.environ.get("CACHE_BOOK_MAX_ITEMS", 5000)),
+        },
+    }
+
+    SQL_PROFILER_ENABLED = os.environ.get("SQL_PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+    SQL_PROFILER_BUFFER_SIZE = int(os.environ.get("SQL_PROFILER_BUFFER_SIZE", 100))
+    SQL_SLOW_QUERY_MS = float(os.environ.get("SQL_SLOW_QUERY_MS", 100))
+    SQL_EXPLAIN_SLOW_QUERIES = os.environ.get("SQL_EXPLAIN_SLOW_QUERIES", "true").lower() in ("1", "true", "yes")
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get("SQL_N_PLUS_ONE_THRESHOLD", 5))
+
+    METRICS_MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+
+    SEARCH_MAX_CANDIDATES = int(os.environ.get("SEARCH_MAX_CANDIDATES", 10000))
+
+    TABLE_VERSION_DIR = os.environ.get("TABLE_VERSION_DIR")
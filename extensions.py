@@ -2,6 +2,23 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 
+from utils.audit_log import AuditLog
+from utils.cache import CatalogCache
+from utils.hash_pool import HashPool
+from utils.sql_profiler import SqlProfiler
+from utils.metrics import MetricsCollector
+from utils.rate_limit import RateLimiter
+from utils.table_versions import TableVersions
+from utils.token_blocklist import TokenBlocklist
+
 db = SQLAlchemy()
 bcrypt = Bcrypt()
-jwt = JWTManager()
\ No newline at end of file
+jwt = JWTManager()
+catalog_cache = CatalogCache()
+sql_profiler = SqlProfiler()
+metrics = MetricsCollector()
+table_versions = TableVersions()
+hash_pool = HashPool()
+rate_limiter = RateLimiter()
+token_blocklist = TokenBlocklist()
+audit_log = AuditLog()
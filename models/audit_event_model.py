@@ -0,0 +1,40 @@
+from extensions import db
+
+
+class AuditEvent(db.Model):
+    """
+    Audit trail entry of a security or data changing action.
+
+    Rows are written in batches by the background writer of `AuditLog`, so
+    `created_at` is the time the action happened, not the time of the insert.
+
+    Args:
+        event_type (str): What happened, e.g. 'login', 'checkout', 'catalog_delete'.
+        created_at (datetime): When it happened (UTC).
+        actor_id (int, optional): Authenticated user who made the request.
+        user_id (int, optional): User the event concerns (e.g. who logged in or borrowed).
+        entity (str, optional): Kind of object affected, e.g. 'loan' or 'book'.
+        entity_id (int, optional): ID of the object affected.
+        details (dict, optional): Further event specific data.
+
+    Attributes:
+        id (int): Auto-generated primary key.
+
+    Returns:
+        AuditEvent: AuditEvent model instance.
+    """
+    __tablename__ = 'audit_event'
+    __table_args__ = (
+        db.Index('ix_audit_event_entity_entity_id', 'entity', 'entity_id'),
+        db.Index('ix_audit_event_user_id_created_at', 'user_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(32), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, index=True)
+    actor_id = db.Column(db.Integer, nullable=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    entity = db.Column(db.String(32), nullable=True)
+    entity_id = db.Column(db.Integer, nullable=True)
+    details = db.Column(db.JSON, nullable=True)
+
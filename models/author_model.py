@@ -29,3 +29,7 @@ class Author(db.Model):
             'id': self.id,
             'name': self.name
         }
+
+
+# Case-insensitive uniqueness of author names, enforced by the database.
+db.Index('uq_author_name_lower', db.func.lower(Author.name), unique=True)
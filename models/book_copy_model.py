@@ -1,4 +1,5 @@
 from extensions import db
+from utils.includes import embed_includes
 
 
 class BookCopy(db.Model):
@@ -20,22 +21,32 @@ class BookCopy(db.Model):
         BookCopy: BookCopy model instance.
     """
     __tablename__ = 'book_copy'
+    __table_args__ = (
+        # Keyset pagination of the copies of one book.
+        db.Index('ix_book_copy_book_id_id', 'book_id', 'id'),
+        # Availability report: available copies grouped by book.
+        db.Index('ix_book_copy_available_book_id', 'available', 'book_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     book_id = db.Column(db.Integer, db.ForeignKey('book.id'), nullable=False)
     available = db.Column(db.Boolean, default=True, nullable=False)
     location = db.Column(db.String(100), nullable=False)  # shelf location
 
-    def json(self):
+    def json(self, include=()):
         """
         Convert BookCopy object to JSON-serializable dictionary.
 
+        Args:
+            include (Iterable[str], optional): Relationship paths to embed, e.g. 'book.author'.
+
         Returns:
-            dict: Dictionary containing book copy id, book_id, availability status, and location.
+            dict: Dictionary containing book copy id, book_id, availability status, and location,
+                plus the included related objects.
         """
-        return {
+        return embed_includes(self, {
             'id': self.id,
             'book_id': self.book_id,
             'available': self.available,
             'location': self.location,
-        }
+        }, include)
@@ -1,4 +1,5 @@
 from extensions import db
+from utils.includes import embed_includes
 
 
 class Book(db.Model):
@@ -15,28 +16,43 @@ class Book(db.Model):
         title (str): Book title, max 150 characters, required.
         author_id (int): Reference to the associated author.
         category_id (int): Reference to the book category.
+        author (relationship): Many-to-one relationship with the Author.
         copies (relationship): One-to-many relationship with BookCopy instances.
 
     Returns:
         Book: Book model instance.
     """
+    __table_args__ = (
+        # Keyset pagination of books filtered by author or category.
+        db.Index('ix_book_author_id_id', 'author_id', 'id'),
+        db.Index('ix_book_category_id_id', 'category_id', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
     author_id = db.Column(db.Integer, db.ForeignKey('author.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
+    author = db.relationship('Author', lazy=True)
     copies = db.relationship('BookCopy', backref='book', lazy=True)
 
-    def json(self):
+    def json(self, include=()):
         """
         Convert Book object to JSON-serializable dictionary.
 
+        Args:
+            include (Iterable[str], optional): Relationship paths to embed, e.g. 'author', 'copies'.
+
         Returns:
-            dict: Dictionary containing book id, title, author_id, and category_id.
+            dict: Dictionary containing book id, title, author_id, and category_id,
+                plus the included related objects.
         """
-        return {
+        return embed_includes(self, {
             'id': self.id,
             'title': self.title,
             'author_id': self.author_id,
             'category_id': self.category_id,
-        }
+        }, include)
+
 
+# Case-insensitive uniqueness of book titles, enforced by the database.
+db.Index('uq_book_title_lower', db.func.lower(Book.title), unique=True)
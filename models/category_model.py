@@ -32,3 +32,7 @@ class Category(db.Model):
             'id': self.id,
             'name': self.name
         }
+
+
+# Case-insensitive uniqueness of category names, enforced by the database.
+db.Index('uq_category_name_lower', db.func.lower(Category.name), unique=True)
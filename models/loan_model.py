@@ -1,4 +1,5 @@
 from extensions import db
+from utils.includes import embed_includes
 from datetime import date, timedelta
 
 
@@ -25,6 +26,19 @@ class Loan(db.Model):
     Returns:
         Loan: Loan model instance.
     """
+    __table_args__ = (
+        # At most one active (not returned) loan per book copy.
+        db.Index(
+            'uq_loan_active_book_copy', 'book_copy_id', unique=True,
+            sqlite_where=db.text('is_returned = 0'),
+            postgresql_where=db.text('is_returned = false'),
+        ),
+        # Keyset pagination of a user's loan history.
+        db.Index('ix_loan_user_id_id', 'user_id', 'id'),
+        # Overdue scans: active loans by due date.
+        db.Index('ix_loan_is_returned_return_date', 'is_returned', 'return_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     book_copy_id = db.Column(db.Integer, db.ForeignKey('book_copy.id'), nullable=False)
@@ -34,18 +48,22 @@ class Loan(db.Model):
 
     book_copy = db.relationship('BookCopy', backref='loans', lazy=True)
 
-    def json(self):
+    def json(self, include=()):
         """
         Convert Loan object to JSON-serializable dictionary.
 
+        Args:
+            include (Iterable[str], optional): Relationship paths to embed, e.g. 'book_copy.book'.
+
         Returns:
-            dict: Dictionary containing loan id, user_id, book_copy_id, dates in ISO format, and return status.
+            dict: Dictionary containing loan id, user_id, book_copy_id, dates in ISO format, and return status,
+                plus the included related objects.
         """
-        return {
+        return embed_includes(self, {
             'id': self.id,
             'user_id': self.user_id,
             'book_copy_id': self.book_copy_id,
             'loan_date': self.loan_date.isoformat(),
             'return_date': self.return_date.isoformat(),
             'is_returned': self.is_returned
-        }
+        }, include)
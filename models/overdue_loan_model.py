@@ -0,0 +1,38 @@
+from extensions import db
+from sqlalchemy import func
+
+
+class OverdueLoan(db.Model):
+    """
+    Snapshot entry of a loan found overdue by the overdue scanner.
+
+    The table is maintained incrementally by LoanService.refresh_overdue_snapshot;
+    readers still join the loan to drop entries returned since the last scan.
+
+    Args:
+        loan_id (int): Foreign key reference to the overdue loan.
+        user_id (int): Borrowing user, copied from the loan.
+        book_copy_id (int): Borrowed book copy, copied from the loan.
+        return_date (date): Due date that was missed, copied from the loan.
+
+    Attributes:
+        loan_id (int): Primary key, reference to the overdue loan.
+        user_id (int): Reference to the borrowing user.
+        book_copy_id (int): Reference to the borrowed book copy.
+        return_date (date): Missed due date.
+        detected_at (datetime): When the scanner first found the loan overdue.
+
+    Returns:
+        OverdueLoan: OverdueLoan model instance.
+    """
+    __tablename__ = 'overdue_loan'
+    __table_args__ = (
+        # Keyset pagination of one user's overdue loans.
+        db.Index('ix_overdue_loan_user_id_loan_id', 'user_id', 'loan_id'),
+    )
+
+    loan_id = db.Column(db.Integer, db.ForeignKey('loan.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    book_copy_id = db.Column(db.Integer, db.ForeignKey('book_copy.id'), nullable=False)
+    return_date = db.Column(db.Date, nullable=False)
+    detected_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
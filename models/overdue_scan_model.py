@@ -0,0 +1,52 @@
+from extensions import db
+from sqlalchemy import func
+
+
+class OverdueScan(db.Model):
+    """
+    Log entry of one overdue scanner run; the latest entry is the scan watermark.
+
+    A run examines only loans due in [previous scanned_through, scanned_through)
+    and loans created after the previous max_loan_id.
+
+    Args:
+        scanned_through (date): Exclusive upper bound of the due dates examined.
+        max_loan_id (int): Highest loan ID that existed when the run started.
+        added (int): Loans added to the overdue snapshot.
+        removed (int): Snapshot entries dropped because the loan was returned.
+
+    Attributes:
+        id (int): Auto-generated primary key.
+        scanned_through (date): Exclusive upper bound of the due dates examined.
+        max_loan_id (int): Highest loan ID covered by the run.
+        added (int): Loans added to the overdue snapshot.
+        removed (int): Snapshot entries dropped.
+        finished_at (datetime): When the run committed.
+
+    Returns:
+        OverdueScan: OverdueScan model instance.
+    """
+    __tablename__ = 'overdue_scan'
+
+    id = db.Column(db.Integer, primary_key=True)
+    scanned_through = db.Column(db.Date, nullable=False)
+    max_loan_id = db.Column(db.Integer, nullable=False, default=0)
+    added = db.Column(db.Integer, nullable=False, default=0)
+    removed = db.Column(db.Integer, nullable=False, default=0)
+    finished_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+
+    def json(self):
+        """
+        Convert OverdueScan object to JSON-serializable dictionary.
+
+        Returns:
+            dict: Dictionary containing the scan watermark and its counters.
+        """
+        return {
+            'id': self.id,
+            'scanned_through': self.scanned_through.isoformat(),
+            'max_loan_id': self.max_loan_id,
+            'added': self.added,
+            'removed': self.removed,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
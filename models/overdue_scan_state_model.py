@@ -0,0 +1,30 @@
+from extensions import db
+
+
+class OverdueScanState(db.Model):
+    """
+    Single-row claim that serializes overdue scanner runs across worker processes.
+
+    Every worker process runs the overdue scan job; a run first claims this
+    row with a conditional UPDATE and skips the scan if another run holds an
+    unexpired claim. The claim expires after OVERDUE_SCAN_LEASE seconds, so a
+    crashed run does not block the scanner for good.
+
+    Args:
+        id (int): Always 1.
+        claimed_by (str, optional): Token of the run holding the claim.
+        claimed_until (datetime, optional): When the claim expires (UTC).
+
+    Attributes:
+        id (int): Primary key, always 1.
+        claimed_by (str or None): Token of the run holding the claim, None when free.
+        claimed_until (datetime or None): Claim expiry (UTC), None when free.
+
+    Returns:
+        OverdueScanState: OverdueScanState model instance.
+    """
+    __tablename__ = 'overdue_scan_state'
+
+    id = db.Column(db.Integer, primary_key=True)
+    claimed_by = db.Column(db.String(32))
+    claimed_until = db.Column(db.DateTime)
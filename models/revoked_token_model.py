@@ -0,0 +1,30 @@
+from extensions import db
+from sqlalchemy import func
+
+
+class RevokedToken(db.Model):
+    """
+    Revoked (logged out) JWT, kept until the token would have expired anyway.
+
+    Args:
+        jti (str): Unique token identifier from the JWT payload.
+        user_id (int): User the token was issued to.
+        expires_at (int): Token expiry as a Unix timestamp (the JWT `exp` claim).
+
+    Attributes:
+        id (int): Auto-generated primary key.
+        jti (str): Unique token identifier.
+        user_id (int): User the token was issued to.
+        expires_at (int): Token expiry as a Unix timestamp.
+        revoked_at (datetime): When the token was revoked.
+
+    Returns:
+        RevokedToken: RevokedToken model instance.
+    """
+    __tablename__ = 'revoked_token'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.Integer, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
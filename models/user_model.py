@@ -50,3 +50,8 @@ class User(db.Model):
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+# Case-insensitive uniqueness of usernames and emails, enforced by the database.
+db.Index('uq_user_username_lower', func.lower(User.username), unique=True)
+db.Index('uq_user_email_lower', func.lower(User.email), unique=True)
@@ -1,5 +1,6 @@
 from models.author_model import Author
-from extensions import db
+from extensions import db, catalog_cache
+from utils.pagination import keyset_page
 
 
 class AuthorRepository:
@@ -15,7 +16,7 @@ class AuthorRepository:
 
     def find_by_name(self, name):
         """
-        Retrieve author by name from the database.
+        Retrieve author by name (case-insensitive) from the database.
 
         Args:
             name (str): Author name to search for.
@@ -23,7 +24,28 @@ class AuthorRepository:
         Returns:
             Author or None: Author instance if found, None otherwise.
         """
-        return db.session.query(Author).filter_by(name=name).first()
+        return db.session.query(Author).filter(db.func.lower(Author.name) == db.func.lower(name)).first()
+
+    def find_by_names(self, names):
+        """
+        Retrieve all authors whose name is in the given collection, in one query.
+
+        Names are compared case-insensitively with the database's lower(), the
+        function of the unique index, so both sides fold case the same way (on
+        SQLite only ASCII letters are folded).
+
+        Args:
+            names (Iterable[str]): Author names to look up.
+
+        Returns:
+            list[Author]: Matching Author instances.
+        """
+        names = set(names)
+        if not names:
+            return []
+        return db.session.query(Author).filter(
+            db.func.lower(Author.name).in_([db.func.lower(name) for name in names])
+        ).all()
 
     def find_by_id(self, author_id):
         """
@@ -34,8 +56,11 @@ class AuthorRepository:
 
         Returns:
             Author or None: Author instance if found, None otherwise.
-               """
-        return db.session.get(Author, author_id)
+        """
+        return catalog_cache.get_instance(
+            "author", db.session, Author, f"id:{author_id}",
+            lambda: db.session.get(Author, author_id)
+        )
 
     def find_all(self):
         """
@@ -44,7 +69,26 @@ class AuthorRepository:
         Returns:
             list[Author]: List of all Author instances.
         """
-        return db.session.query(Author).all()
+        return catalog_cache.get_instances(
+            "author", db.session, Author, ("all",),
+            lambda: db.session.query(Author).all()
+        )
+
+    def find_page(self, limit, after=None):
+        """
+        Retrieve one keyset page of authors ordered by ID.
+
+        Args:
+            limit (int): Maximum number of authors to return.
+            after (int, optional): Cursor; only authors with a greater ID are returned.
+
+        Returns:
+            tuple[list[Author], int | None]: Authors in the page and the next cursor.
+        """
+        return catalog_cache.get_page(
+            "author", db.session, Author, (limit, after),
+            lambda: keyset_page(db.session, db.select(Author), Author.id, limit, after)
+        )
 
     def save(self, author):
         """
@@ -58,8 +102,52 @@ class AuthorRepository:
         """
         db.session.add(author)
         db.session.flush()
+        catalog_cache.invalidate("author")
+        return author
+
+    def bulk_create(self, names):
+        """
+        Insert several new authors with one multi-row INSERT ... RETURNING.
+
+        Does not commit; the caller commits the surrounding transaction.
+
+        Args:
+            names (Iterable[str]): Names of the authors to create.
+
+        Returns:
+            list[Row]: (id, name) rows of the created authors.
+        """
+        rows = [{'name': name} for name in names]
+        if not rows:
+            return []
+        stmt = db.insert(Author).returning(Author.id, Author.name)
+        created = db.session.execute(stmt, rows).all()
+        catalog_cache.invalidate("author")
+        return created
+
+    def update(self, author):
+        """
+        Commit changes to an existing author and drop it from the cache.
+
+        Args:
+            author (Author): Modified Author instance.
+
+        Returns:
+            Author: The updated author.
+        """
+        db.session.commit()
+        catalog_cache.invalidate("author", f"id:{author.id}")
         return author
 
+    def rollback(self):
+        """
+        Roll back the current database transaction.
+
+        Returns:
+            None
+        """
+        db.session.rollback()
+
     def commit(self):
         """
         Commit current database transaction.
@@ -68,6 +156,7 @@ class AuthorRepository:
             None
         """
         db.session.commit()
+        catalog_cache.invalidate("author")
 
     def delete(self, author):
         """
@@ -79,5 +168,7 @@ class AuthorRepository:
         Returns:
             None
         """
+        author_id = author.id
         db.session.delete(author)
         db.session.commit()
+        catalog_cache.invalidate("author", f"id:{author_id}")
@@ -1,5 +1,10 @@
+from sqlalchemy import func
+
 from extensions import db
 from models.book_copy_model import BookCopy
+from models.book_model import Book
+from utils.includes import loader_options
+from utils.pagination import keyset_page, keyset_rows
 
 
 class BookCopyRepository:
@@ -47,18 +52,63 @@ class BookCopyRepository:
         except Exception as e:
             raise
 
-    def get_by_id(self, book_copy_id):
+    def find_page(self, limit, after=None, book_id=None, available=None, include=()):
+        """
+        Retrieve one keyset page of book copies ordered by ID, optionally filtered.
+
+        Args:
+            limit (int): Maximum number of copies to return.
+            after (int, optional): Cursor; only copies with a greater ID are returned.
+            book_id (int, optional): Only copies of this book.
+            available (bool, optional): Only copies with this availability status.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
+
+        Returns:
+            tuple[list[BookCopy], int | None]: Copies in the page and the next cursor.
+        """
+        stmt = db.select(BookCopy).options(*loader_options(BookCopy, include))
+        if book_id is not None:
+            stmt = stmt.where(BookCopy.book_id == book_id)
+        if available is not None:
+            stmt = stmt.where(BookCopy.available == available)
+        return keyset_page(self.db_session, stmt, BookCopy.id, limit, after)
+
+    def find_page_rows(self, limit, after=None, book_id=None, available=None):
+        """
+        Retrieve one keyset page of book copies as plain column tuples.
+
+        Same filters and order as `find_page`, but selects the columns of
+        `BookCopy.json` with Core, so no BookCopy instances are built.
+
+        Args:
+            limit (int): Maximum number of copies to return.
+            after (int, optional): Cursor; only copies with a greater ID are returned.
+            book_id (int, optional): Only copies of this book.
+            available (bool, optional): Only copies with this availability status.
+
+        Returns:
+            tuple[list[str], list[tuple], int | None]: Column names, rows and the next cursor.
+        """
+        stmt = db.select(BookCopy.id, BookCopy.book_id, BookCopy.available, BookCopy.location)
+        if book_id is not None:
+            stmt = stmt.where(BookCopy.book_id == book_id)
+        if available is not None:
+            stmt = stmt.where(BookCopy.available == available)
+        return keyset_rows(self.db_session, stmt, BookCopy.id, limit, after)
+
+    def get_by_id(self, book_copy_id, include=()):
         """
         Retrieve book copy by ID with error handling.
 
         Args:
             book_copy_id (int): Primary key ID of the book copy.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
 
         Returns:
             BookCopy or None: BookCopy instance if found, None if error occurs.
         """
         try:
-            return self.db_session.get(BookCopy, book_copy_id)
+            return self.db_session.get(BookCopy, book_copy_id, options=loader_options(BookCopy, include))
         except Exception as e:
             print(f"Error getting book copy by ID {book_copy_id}: {e}")
 
@@ -127,3 +177,31 @@ class BookCopyRepository:
             list[BookCopy]: List of BookCopy instances where available=True.
         """
         return self.db_session.query(BookCopy).filter_by(available=True).all()
+
+    def count_available_per_book(self, limit, after=None):
+        """
+        Count available copies per book for one keyset page of books, with a single GROUP BY query.
+
+        Groups are produced in book_id order from the (available, book_id)
+        index, so a page only reads the copies of its own books.
+
+        Args:
+            limit (int): Maximum number of books in the page.
+            after (int, optional): Cursor; only books with a greater ID are counted.
+
+        Returns:
+            tuple[list[tuple], int | None]: (book_id, title, count) rows, one per book
+                with available copies, and the next cursor.
+        """
+        stmt = (
+            db.select(
+                BookCopy.book_id,
+                func.coalesce(Book.title, "Unknown").label("title"),
+                func.count(BookCopy.id).label("count"),
+            )
+            .outerjoin(Book, Book.id == BookCopy.book_id)
+            .where(BookCopy.available == True)
+            .group_by(BookCopy.book_id, Book.title)
+        )
+        _, rows, next_cursor = keyset_rows(self.db_session, stmt, BookCopy.book_id, limit, after)
+        return rows, next_cursor
@@ -1,6 +1,12 @@
+from models.author_model import Author
 from models.book_model import Book
-from extensions import db
-from sqlalchemy import func
+from models.category_model import Category
+from extensions import db, catalog_cache
+from sqlalchemy import func, or_
+from app_config.search_index import SEARCH_TABLE
+from utils.db_errors import is_unique_violation
+from utils.includes import loader_options
+from utils.pagination import keyset_page, keyset_rows
 
 
 class BookRepository:
@@ -42,18 +48,179 @@ class BookRepository:
             print(f"Error getting all books: {e}")
             return []
 
-    def get_by_id(self, book_id):
+    def find_page(self, limit, after=None, author_id=None, category_id=None, include=()):
+        """
+        Retrieve one keyset page of books ordered by ID, optionally filtered.
+
+        Args:
+            limit (int): Maximum number of books to return.
+            after (int, optional): Cursor; only books with a greater ID are returned.
+            author_id (int, optional): Only books by this author.
+            category_id (int, optional): Only books in this category.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
+
+        Returns:
+            tuple[list[Book], int | None]: Books in the page and the next cursor.
+        """
+        stmt = db.select(Book).options(*loader_options(Book, include))
+        if author_id is not None:
+            stmt = stmt.where(Book.author_id == author_id)
+        if category_id is not None:
+            stmt = stmt.where(Book.category_id == category_id)
+        return keyset_page(self.db_session, stmt, Book.id, limit, after)
+
+    def find_page_rows(self, limit, after=None, author_id=None, category_id=None):
+        """
+        Retrieve one keyset page of books as plain column tuples.
+
+        Same filters and order as `find_page`, but selects the columns of
+        `Book.json` with Core, so no Book instances are built.
+
+        Args:
+            limit (int): Maximum number of books to return.
+            after (int, optional): Cursor; only books with a greater ID are returned.
+            author_id (int, optional): Only books by this author.
+            category_id (int, optional): Only books in this category.
+
+        Returns:
+            tuple[list[str], list[tuple], int | None]: Column names, rows and the next cursor.
+        """
+        stmt = db.select(Book.id, Book.title, Book.author_id, Book.category_id)
+        if author_id is not None:
+            stmt = stmt.where(Book.author_id == author_id)
+        if category_id is not None:
+            stmt = stmt.where(Book.category_id == category_id)
+        return keyset_rows(self.db_session, stmt, Book.id, limit, after)
+
+    def search(self, terms, limit, offset=0, max_candidates=None):
+        """
+        Ranked prefix search for books by title, author and category name.
+
+        Every term matches as a word prefix. Books matching all terms are
+        returned first-ranked; only if no book matches all terms, books matching
+        any term (SQLite) or similar text (PostgreSQL, pg_trgm) are returned.
+        Title matches rank above author matches, which rank above category matches.
+        With `max_candidates`, only that many matches are ranked, which bounds
+        the cost of very broad queries at the price of ranking only a subset.
+
+        Args:
+            terms (list[str]): Search words, letters and digits only.
+            limit (int): Maximum number of books to return.
+            offset (int, optional): Number of ranked results to skip.
+            max_candidates (int, optional): Maximum number of matches ranked.
+
+        Returns:
+            tuple[list[Book], int | None]: Books in rank order and the offset of the
+                next page, None on the last page.
+        """
+        dialect = self.db_session.get_bind().dialect.name
+        if dialect == "sqlite":
+            books = self._search_sqlite(terms, limit + 1, offset, max_candidates)
+        elif dialect == "postgresql":
+            books = self._search_postgresql(terms, limit + 1, offset, max_candidates)
+        else:
+            books = self._search_like(terms, limit + 1, offset)
+
+        if len(books) > limit:
+            return books[:limit], offset + limit
+        return books, None
+
+    def _search_sqlite(self, terms, limit, offset, max_candidates):
+        """
+        Search the FTS5 index, ranked by bm25.
+        """
+        prefixes = [f'"{term}"*' for term in terms]
+        match_all = " ".join(prefixes)
+        exists = db.text(f"SELECT 1 FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :q LIMIT 1")
+        if self.db_session.execute(exists, {"q": match_all}).first() is None:
+            match_all = " OR ".join(prefixes)
+
+        stmt = db.text(f"""
+            SELECT book.id, book.title, book.author_id, book.category_id
+            FROM (
+                SELECT rowid AS book_id, bm25({SEARCH_TABLE}, 10.0, 5.0, 2.0) AS score
+                FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :q LIMIT :candidates
+            ) m JOIN book ON book.id = m.book_id
+            ORDER BY m.score, book.id
+            LIMIT :limit OFFSET :offset
+        """)
+        return self.db_session.scalars(
+            db.select(Book).from_statement(stmt),
+            {"q": match_all, "candidates": max_candidates or -1, "limit": limit, "offset": offset}
+        ).all()
+
+    def _search_postgresql(self, terms, limit, offset, max_candidates):
+        """
+        Search the tsvector index ranked by ts_rank, falling back to trigram similarity.
+        """
+        query = " & ".join(f"{term}:*" for term in terms)
+        exists = db.text(
+            f"SELECT 1 FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('simple', :q) LIMIT 1"
+        )
+        if self.db_session.execute(exists, {"q": query}).first() is not None:
+            stmt = db.text(f"""
+                SELECT book.id, book.title, book.author_id, book.category_id
+                FROM (
+                    SELECT book_id, ts_rank(document, to_tsquery('simple', :q)) AS score
+                    FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('simple', :q) LIMIT :candidates
+                ) m JOIN book ON book.id = m.book_id
+                ORDER BY m.score DESC, book.id
+                LIMIT :limit OFFSET :offset
+            """)
+            params = {"q": query}
+        else:
+            stmt = db.text(f"""
+                SELECT book.id, book.title, book.author_id, book.category_id
+                FROM (
+                    SELECT book_id, word_similarity(:q, search_text) AS score
+                    FROM {SEARCH_TABLE} WHERE :q <% search_text LIMIT :candidates
+                ) m JOIN book ON book.id = m.book_id
+                ORDER BY m.score DESC, book.id
+                LIMIT :limit OFFSET :offset
+            """)
+            params = {"q": " ".join(terms)}
+
+        params.update(candidates=max_candidates, limit=limit, offset=offset)
+        return self.db_session.scalars(db.select(Book).from_statement(stmt), params).all()
+
+    def _search_like(self, terms, limit, offset):
+        """
+        Unindexed fallback: every term must appear in the title, author or category name.
+        """
+        stmt = (
+            db.select(Book)
+            .join(Author, Author.id == Book.author_id)
+            .join(Category, Category.id == Book.category_id)
+        )
+        for term in terms:
+            pattern = f"%{term}%"
+            stmt = stmt.where(or_(
+                Book.title.ilike(pattern), Author.name.ilike(pattern), Category.name.ilike(pattern)
+            ))
+        stmt = stmt.order_by(Book.id).limit(limit).offset(offset)
+        return self.db_session.scalars(stmt).all()
+
+    def get_by_id(self, book_id, include=()):
         """
         Retrieve book by ID with error handling.
 
+        Plain lookups are served from the catalog cache; lookups with related
+        objects go to the database to load them eagerly.
+
         Args:
             book_id (int): Primary key ID of the book.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
 
         Returns:
             Book or None: Book instance if found, None on error or not found.
         """
         try:
-            return self.db_session.get(Book, book_id)
+            if include:
+                return self.db_session.get(Book, book_id, options=loader_options(Book, include))
+            return catalog_cache.get_instance(
+                "book", self.db_session, Book, f"id:{book_id}",
+                lambda: self.db_session.get(Book, book_id)
+            )
         except Exception as e:
             print(f"Error getting book by ID {book_id}: {e}")
             return None
@@ -87,6 +254,42 @@ class BookRepository:
         """
         return self.db_session.query(Book).filter_by(title=title, author_id=author_id).first()
 
+    def find_existing_titles(self, titles):
+        """
+        Retrieve which of the given titles already exist, case-insensitively, in one query.
+
+        Titles are matched with the database's lower(), the function of the
+        unique index (on SQLite it only folds ASCII letters). The matches are
+        returned lowercased with Python's str.lower(), which folds at least as
+        much, so a candidate conflicting with the index always compares equal.
+
+        Args:
+            titles (Iterable[str]): Candidate book titles.
+
+        Returns:
+            set[str]: Lowercased (str.lower) titles of existing books.
+        """
+        titles = set(titles)
+        if not titles:
+            return set()
+        stmt = db.select(Book.title).where(func.lower(Book.title).in_([func.lower(title) for title in titles]))
+        return {title.lower() for title in self.db_session.scalars(stmt)}
+
+    def bulk_create(self, rows):
+        """
+        Insert several new books with a single executemany INSERT.
+
+        Does not commit; the caller commits the surrounding transaction.
+
+        Args:
+            rows (list[dict]): Column values (title, author_id, category_id) per book.
+
+        Returns:
+            None
+        """
+        if rows:
+            self.db_session.execute(db.insert(Book), rows)
+
     def save(self, book):
         """
         Save new book to database with transaction management and commit.
@@ -104,6 +307,8 @@ class BookRepository:
 
         except Exception as e:
             self.db_session.rollback()
+            if is_unique_violation(e):
+                return None, "Book with this title already exists"
             return None, f"Error creating book: {e}"
 
     def delete(self, book_id):
@@ -121,6 +326,7 @@ class BookRepository:
             if book:
                 self.db_session.delete(book)
                 self.db_session.commit()
+                catalog_cache.invalidate("book", f"id:{book_id}")
                 return True
             return False
         except Exception as e:
@@ -136,15 +342,19 @@ class BookRepository:
             book (Book): Modified Book instance to update.
 
         Returns:
-            Book or None: Updated book on success, None on failure.
+            tuple: (Book, None) on success or (None, error_message) on failure.
         """
+        book_id = book.id
         try:
             self.db_session.commit()
-            return book
+            catalog_cache.invalidate("book", f"id:{book_id}")
+            return book, None
         except Exception as e:
             self.db_session.rollback()
-            print(f"Error updating book {book.id}: {e}")
-            return None
+            if is_unique_violation(e):
+                return None, "Book with this title already exists"
+            print(f"Error updating book {book_id}: {e}")
+            return None, "Failed to update book"
 
     def commit(self):
         """
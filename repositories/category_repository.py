@@ -1,5 +1,6 @@
 from models.category_model import Category
-from extensions import db
+from extensions import db, catalog_cache
+from utils.pagination import keyset_page
 
 
 class CategoryRepository:
@@ -15,7 +16,7 @@ class CategoryRepository:
 
     def find_by_name(self, name):
         """
-        Retrieve category by name from the database.
+        Retrieve category by name (case-insensitive) from the database.
 
         Args:
             name (str): Category name to search for.
@@ -23,7 +24,28 @@ class CategoryRepository:
         Returns:
             Category or None: Category instance if found, None otherwise.
         """
-        return db.session.query(Category).filter_by(name=name).first()
+        return db.session.query(Category).filter(db.func.lower(Category.name) == db.func.lower(name)).first()
+
+    def find_by_names(self, names):
+        """
+        Retrieve all categories whose name is in the given collection, in one query.
+
+        Names are compared case-insensitively with the database's lower(), the
+        function of the unique index, so both sides fold case the same way (on
+        SQLite only ASCII letters are folded).
+
+        Args:
+            names (Iterable[str]): Category names to look up.
+
+        Returns:
+            list[Category]: Matching Category instances.
+        """
+        names = set(names)
+        if not names:
+            return []
+        return db.session.query(Category).filter(
+            db.func.lower(Category.name).in_([db.func.lower(name) for name in names])
+        ).all()
 
     def find_by_id(self, category_id):
         """
@@ -35,7 +57,10 @@ class CategoryRepository:
         Returns:
             Category or None: Category instance if found, None otherwise.
         """
-        return db.session.get(Category, category_id)
+        return catalog_cache.get_instance(
+            "category", db.session, Category, f"id:{category_id}",
+            lambda: db.session.get(Category, category_id)
+        )
 
     def find_all(self):
         """
@@ -44,7 +69,26 @@ class CategoryRepository:
         Returns:
             list[Category]: List of all Category instances.
         """
-        return db.session.query(Category).all()
+        return catalog_cache.get_instances(
+            "category", db.session, Category, ("all",),
+            lambda: db.session.query(Category).all()
+        )
+
+    def find_page(self, limit, after=None):
+        """
+        Retrieve one keyset page of categories ordered by ID.
+
+        Args:
+            limit (int): Maximum number of categories to return.
+            after (int, optional): Cursor; only categories with a greater ID are returned.
+
+        Returns:
+            tuple[list[Category], int | None]: Categories in the page and the next cursor.
+        """
+        return catalog_cache.get_page(
+            "category", db.session, Category, (limit, after),
+            lambda: keyset_page(db.session, db.select(Category), Category.id, limit, after)
+        )
 
     def save(self, category):
         """
@@ -58,8 +102,38 @@ class CategoryRepository:
         """
         db.session.add(category)
         db.session.flush()
+        catalog_cache.invalidate("category", f"id:{category.id}")
         return category
 
+    def bulk_create(self, names):
+        """
+        Insert several new categories with one multi-row INSERT ... RETURNING.
+
+        Does not commit; the caller commits the surrounding transaction.
+
+        Args:
+            names (Iterable[str]): Names of the categories to create.
+
+        Returns:
+            list[Row]: (id, name) rows of the created categories.
+        """
+        rows = [{'name': name} for name in names]
+        if not rows:
+            return []
+        stmt = db.insert(Category).returning(Category.id, Category.name)
+        created = db.session.execute(stmt, rows).all()
+        catalog_cache.invalidate("category")
+        return created
+
+    def rollback(self):
+        """
+        Roll back the current database transaction.
+
+        Returns:
+            None
+        """
+        db.session.rollback()
+
     def commit(self):
         """
         Commit current database transaction.
@@ -68,6 +142,7 @@ class CategoryRepository:
             None
         """
         db.session.commit()
+        catalog_cache.invalidate("category")
 
     def delete(self, category):
         """
@@ -79,5 +154,7 @@ class CategoryRepository:
         Returns:
             None
         """
+        category_id = category.id
         db.session.delete(category)
         db.session.commit()
+        catalog_cache.invalidate("category", f"id:{category_id}")
@@ -1,5 +1,12 @@
+from sqlalchemy import String, case, cast, func
+from sqlalchemy.exc import IntegrityError
+
 from models.loan_model import Loan
+from models.book_copy_model import BookCopy
+from models.book_model import Book
 from extensions import db
+from utils.includes import loader_options
+from utils.pagination import keyset_page, keyset_rows
 
 
 class LoanRepository:
@@ -60,6 +67,169 @@ class LoanRepository:
             print(f"Error creating loan: {e}")
             return None
 
+    def checkout(self, loan_data):
+        """
+        Atomically claim an available book copy and create a loan for it.
+
+        The copy is claimed with a conditional UPDATE (available -> False) and the
+        loan is inserted in the same transaction. The partial unique index on active
+        loans per book copy rejects any concurrent checkout that slips through, so
+        at most one request can win for a given copy.
+
+        Args:
+            loan_data (dict): Dictionary containing loan attributes, including book_copy_id.
+
+        Returns:
+            tuple: (Loan, None) on success or (None, error_message) on failure.
+        """
+        try:
+            claimed = self.db_session.execute(
+                db.update(BookCopy)
+                .where(BookCopy.id == loan_data['book_copy_id'], BookCopy.available == True)
+                .values(available=False)
+            ).rowcount
+            if not claimed:
+                self.db_session.rollback()
+                return None, "Book is already on loan"
+
+            loan = Loan(**loan_data)
+            self.db_session.add(loan)
+            self.db_session.commit()
+            return loan, None
+        except IntegrityError:
+            self.db_session.rollback()
+            return None, "Book is already on loan"
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error creating loan: {e}")
+            return None, "Failed to create loan"
+
+    def checkout_batch(self, user_id, book_copy_ids, loan_date, return_date, all_or_nothing=False):
+        """
+        Claim several book copies and create their loans in one transaction.
+
+        All available copies are claimed with one conditional UPDATE, their loans
+        are inserted with one multi-row INSERT and the transaction is committed
+        once. In all-or-nothing mode nothing is written unless every copy could
+        be claimed.
+
+        Args:
+            user_id (int): Borrowing user.
+            book_copy_ids (list[int]): Distinct IDs of the copies to check out.
+            loan_date (date): Loan start date for all loans.
+            return_date (date): Expected return date for all loans.
+            all_or_nothing (bool, optional): Roll back if any copy fails. Default False.
+
+        Returns:
+            tuple: ({book_copy_id: Loan or error message}, None) on success or
+                (None, error_message) on failure.
+        """
+        try:
+            existing = set(self.db_session.scalars(
+                db.select(BookCopy.id).where(BookCopy.id.in_(book_copy_ids))
+            ))
+            claim = (
+                db.update(BookCopy)
+                .where(BookCopy.id.in_(existing), BookCopy.available == True)
+                .values(available=False)
+            )
+            if db.engine.dialect.update_returning:
+                claimed = set(self.db_session.scalars(claim.returning(BookCopy.id)))
+            else:
+                claimed = set(self.db_session.scalars(
+                    db.select(BookCopy.id)
+                    .where(BookCopy.id.in_(existing), BookCopy.available == True)
+                    .with_for_update()
+                ))
+                self.db_session.execute(claim.where(BookCopy.id.in_(claimed)))
+
+            results = {
+                copy_id: "Book copy does not exist" if copy_id not in existing else "Book is already on loan"
+                for copy_id in book_copy_ids if copy_id not in claimed
+            }
+            if not claimed or (all_or_nothing and results):
+                self.db_session.rollback()
+                return results, None
+
+            loans = self.db_session.scalars(
+                db.insert(Loan).returning(Loan),
+                [
+                    {'user_id': user_id, 'book_copy_id': copy_id, 'loan_date': loan_date,
+                     'return_date': return_date, 'is_returned': False}
+                    for copy_id in book_copy_ids if copy_id in claimed
+                ]
+            ).all()
+            self.db_session.commit()
+            results.update((loan.book_copy_id, loan) for loan in loans)
+            return results, None
+        except IntegrityError:
+            self.db_session.rollback()
+            return None, "Book is already on loan"
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error creating loans: {e}")
+            return None, "Failed to create loans"
+
+    def return_by_book_copies(self, book_copy_ids):
+        """
+        Close the active loans of several book copies in one transaction.
+
+        One UPDATE marks the active loans returned, a second one marks their
+        copies available again; both are set-based, so the cost per copy stays
+        constant however many copies are returned together.
+
+        Args:
+            book_copy_ids (list[int]): Distinct IDs of the returned copies.
+
+        Returns:
+            tuple: ({book_copy_id: Row(id, book_copy_id, user_id, return_date) or error message}, None)
+                on success or (None, error_message) on failure.
+        """
+        try:
+            close = (
+                db.update(Loan)
+                .where(Loan.book_copy_id.in_(book_copy_ids), Loan.is_returned == False)
+                .values(is_returned=True)
+                .execution_options(synchronize_session=False)
+            )
+            if db.engine.dialect.update_returning:
+                returned = self.db_session.execute(
+                    close.returning(Loan.id, Loan.book_copy_id, Loan.user_id, Loan.return_date)
+                ).all()
+            else:
+                returned = self.db_session.execute(
+                    db.select(Loan.id, Loan.book_copy_id, Loan.user_id, Loan.return_date)
+                    .where(Loan.book_copy_id.in_(book_copy_ids), Loan.is_returned == False)
+                    .with_for_update()
+                ).all()
+                self.db_session.execute(close.where(Loan.id.in_([row.id for row in returned])))
+
+            results = {row.book_copy_id: row for row in returned}
+            if results:
+                self.db_session.execute(
+                    db.update(BookCopy)
+                    .where(BookCopy.id.in_(list(results)))
+                    .values(available=True)
+                    .execution_options(synchronize_session=False)
+                )
+
+            unmatched = [copy_id for copy_id in book_copy_ids if copy_id not in results]
+            if unmatched:
+                existing = set(self.db_session.scalars(
+                    db.select(BookCopy.id).where(BookCopy.id.in_(unmatched))
+                ))
+                results.update(
+                    (copy_id, "No active loan for this copy" if copy_id in existing else "Book copy does not exist")
+                    for copy_id in unmatched
+                )
+
+            self.db_session.commit()
+            return results, None
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error returning loans: {e}")
+            return None, "Failed to return books"
+
     def get_active_loans(self):
         """
         Retrieve all active (non-returned) loans with error handling.
@@ -73,17 +243,18 @@ class LoanRepository:
             print(f"Error fetching active loans: {e}")
             return []
 
-    def get_by_id(self, loan_id):
+    def get_by_id(self, loan_id, include=()):
         """
         Retrieve loan by ID from the database.
 
         Args:
             loan_id (int): Primary key ID of the loan.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
 
         Returns:
             Loan or None: Loan instance if found, None otherwise.
         """
-        return self.db_session.get(Loan, loan_id)
+        return self.db_session.get(Loan, loan_id, options=loader_options(Loan, include))
 
     def update(self, loan):
         """
@@ -115,6 +286,56 @@ class LoanRepository:
         """
         return self.db_session.query(Loan).filter_by(user_id=user_id).all()
 
+    def get_page_by_user_id(self, user_id, limit, after=None, is_returned=None, include=()):
+        """
+        Retrieve one keyset page of a user's loans ordered by ID.
+
+        Args:
+            user_id (int): User ID to filter loans by.
+            limit (int): Maximum number of loans to return.
+            after (int, optional): Cursor; only loans with a greater ID are returned.
+            is_returned (bool, optional): Only loans with this return status.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
+
+        Returns:
+            tuple[list[Loan], int | None]: Loans in the page and the next cursor.
+        """
+        stmt = db.select(Loan).where(Loan.user_id == user_id).options(*loader_options(Loan, include))
+        if is_returned is not None:
+            stmt = stmt.where(Loan.is_returned == is_returned)
+        return keyset_page(self.db_session, stmt, Loan.id, limit, after)
+
+    def find_page_rows(self, limit, after=None, user_id=None, is_returned=None):
+        """
+        Retrieve one keyset page of loans as plain column tuples.
+
+        Selects the columns of `Loan.json` with Core, so no Loan instances are
+        built. Dates are cast to text by the database, which yields the same
+        ISO format as `date.isoformat` without a conversion per row.
+
+        Args:
+            limit (int): Maximum number of loans to return.
+            after (int, optional): Cursor; only loans with a greater ID are returned.
+            user_id (int, optional): Only loans of this user.
+            is_returned (bool, optional): Only loans with this return status.
+
+        Returns:
+            tuple[list[str], list[tuple], int | None]: Column names, rows and the next cursor.
+        """
+        stmt = db.select(
+            Loan.id,
+            Loan.user_id,
+            Loan.book_copy_id,
+            cast(Loan.loan_date, String).label('loan_date'),
+            cast(Loan.return_date, String).label('return_date'),
+            Loan.is_returned,
+        )
+        if user_id is not None:
+            stmt = stmt.where(Loan.user_id == user_id)
+        if is_returned is not None:
+            stmt = stmt.where(Loan.is_returned == is_returned)
+        return keyset_rows(self.db_session, stmt, Loan.id, limit, after)
+
     def count_all_loans(self):
         """
         Get total count of all loans in the database.
@@ -135,3 +356,96 @@ class LoanRepository:
             int: Number of loans matching the specified return status.
         """
         return self.db_session.query(Loan).filter_by(is_returned=returned).count()
+
+    @staticmethod
+    def _statistics_columns(today):
+        """
+        Build conditional aggregates that compute all loan counters in one scan.
+
+        Args:
+            today (date): Reference date for overdue loans.
+
+        Returns:
+            tuple: Labeled aggregate columns (total, returned, not returned, overdue).
+        """
+        def count_if(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        return (
+            func.count(Loan.id).label('total_loans'),
+            count_if(Loan.is_returned == True).label('returned_loans'),
+            count_if(Loan.is_returned == False).label('not_returned_loans'),
+            count_if((Loan.is_returned == False) & (Loan.return_date < today)).label('overdue_loans'),
+        )
+
+    def get_statistics(self, today):
+        """
+        Compute total, returned, not returned and overdue loan counts in a single query.
+
+        Args:
+            today (date): Reference date for overdue loans.
+
+        Returns:
+            dict: Counts keyed by total_loans, returned_loans, not_returned_loans, overdue_loans.
+        """
+        stmt = db.select(*self._statistics_columns(today))
+        return dict(self.db_session.execute(stmt).one()._mapping)
+
+    def get_statistics_breakdown(self, today, by_user=False, by_category=False, user_limit=None, user_after=None):
+        """
+        Compute loan totals and the requested breakdowns in a single grouped query.
+
+        Loans are grouped once by every requested dimension (user, category or
+        both); the totals and each breakdown are then rolled up from those groups,
+        so the loan table is scanned only once however many breakdowns are asked
+        for. The per-user breakdown is a keyset page ordered by user ID.
+
+        Args:
+            today (date): Reference date for overdue loans.
+            by_user (bool, optional): Include per-user counters. Default False.
+            by_category (bool, optional): Include per-category counters. Default False.
+            user_limit (int, optional): Maximum number of users in the per-user page.
+            user_after (int, optional): Cursor; only users with a greater ID are included.
+
+        Returns:
+            dict: Counts keyed by total_loans, returned_loans, not_returned_loans,
+                overdue_loans, plus 'by_user' ({user_id: counts}) and 'next_user_cursor'
+                and/or 'by_category' ({category_id: counts}) when requested.
+        """
+        columns = self._statistics_columns(today)
+        counters = [column.name for column in columns]
+        keys = []
+        if by_user:
+            keys.append(Loan.user_id)
+        if by_category:
+            keys.append(Book.category_id)
+
+        stmt = db.select(*keys, *columns).group_by(*keys)
+        if by_category:
+            stmt = (
+                stmt.select_from(Loan)
+                .outerjoin(BookCopy, BookCopy.id == Loan.book_copy_id)
+                .outerjoin(Book, Book.id == BookCopy.book_id)
+            )
+
+        def add(totals, row):
+            for name in counters:
+                totals[name] = totals.get(name, 0) + row[name]
+
+        stats = dict.fromkeys(counters, 0)
+        users, categories = {}, {}
+        for row in self.db_session.execute(stmt).mappings():
+            add(stats, row)
+            if by_user and (user_after is None or row['user_id'] > user_after):
+                add(users.setdefault(row['user_id'], {}), row)
+            if by_category and row['category_id'] is not None:
+                add(categories.setdefault(row['category_id'], {}), row)
+
+        if by_user:
+            user_ids = sorted(users)
+            page = user_ids[:user_limit] if user_limit is not None else user_ids
+            stats['by_user'] = {user_id: users[user_id] for user_id in page}
+            stats['next_user_cursor'] = page[-1] if len(user_ids) > len(page) else None
+        if by_category:
+            stats['by_category'] = categories
+        return stats
@@ -0,0 +1,202 @@
+from datetime import timedelta
+
+from sqlalchemy import func, literal, or_
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.loan_model import Loan
+from models.overdue_loan_model import OverdueLoan
+from models.overdue_scan_model import OverdueScan
+from models.overdue_scan_state_model import OverdueScanState
+from utils.includes import loader_options
+from utils.pagination import keyset_page
+
+
+class OverdueLoanRepository:
+    """
+    Repository class for the overdue loan snapshot and its scan log.
+
+    Args:
+        db_session (Session, optional): Database session instance, defaults to db.session.
+
+    Attributes:
+        db_session (Session): Database session for executing queries.
+
+    Returns:
+        OverdueLoanRepository: Repository instance for overdue loan operations.
+    """
+    def __init__(self, db_session=None):
+        """
+        Initialize repository with database session.
+
+        Args:
+            db_session (Session, optional): Custom database session, defaults to db.session.
+        """
+        self.db_session = db_session or db.session
+
+    def get_last_scan(self):
+        """
+        Retrieve the most recent scan, the watermark of the next one.
+
+        Returns:
+            OverdueScan or None: Latest scan, None if the scanner never ran.
+        """
+        return self.db_session.scalars(
+            db.select(OverdueScan).order_by(OverdueScan.id.desc()).limit(1)
+        ).first()
+
+    def claim_scan(self, owner, now, lease_seconds):
+        """
+        Claim the right to run the next scan, unless another run holds it.
+
+        The claim is a conditional UPDATE of the single scan state row, committed
+        on its own, so concurrent runs in other processes are serialized by the
+        row lock and only one of them sees the row unclaimed.
+
+        Args:
+            owner (str): Token identifying this run.
+            now (datetime): Current UTC time.
+            lease_seconds (float): How long the claim is valid.
+
+        Returns:
+            bool: True if this run holds the claim.
+        """
+        claimed_until = now + timedelta(seconds=lease_seconds)
+        try:
+            claimed = self.db_session.execute(
+                db.update(OverdueScanState)
+                .where(
+                    OverdueScanState.id == 1,
+                    or_(OverdueScanState.claimed_until.is_(None), OverdueScanState.claimed_until < now)
+                )
+                .values(claimed_by=owner, claimed_until=claimed_until)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not claimed and self.db_session.get(OverdueScanState, 1) is None:
+                self.db_session.add(OverdueScanState(id=1, claimed_by=owner, claimed_until=claimed_until))
+                self.db_session.flush()
+                claimed = 1
+            self.db_session.commit()
+            return bool(claimed)
+        except IntegrityError:
+            # Another run created the state row first and holds the claim
+            self.db_session.rollback()
+            return False
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error claiming overdue scan: {e}")
+            return False
+
+    def release_scan(self, owner):
+        """
+        Release a claim taken by `claim_scan`.
+
+        Args:
+            owner (str): Token the claim was taken with.
+        """
+        try:
+            self.db_session.execute(
+                db.update(OverdueScanState)
+                .where(OverdueScanState.id == 1, OverdueScanState.claimed_by == owner)
+                .values(claimed_by=None, claimed_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error releasing overdue scan claim: {e}")
+
+    def refresh(self, today):
+        """
+        Bring the overdue snapshot up to date incrementally.
+
+        Only loans due since the previous scan, or created after it, are examined;
+        both are range scans on an index (is_returned, return_date) and the primary
+        key respectively. Entries whose loan was returned are dropped from the
+        snapshot, which only touches the snapshot itself. The first run examines
+        all active loans once. Callers serialize runs with `claim_scan`.
+
+        Args:
+            today (date): Loans due before this date are overdue.
+
+        Returns:
+            tuple: (OverdueScan, None) on success or (None, error_message) on failure.
+        """
+        try:
+            last = self.get_last_scan()
+            max_loan_id = self.db_session.scalar(db.select(func.max(Loan.id))) or 0
+
+            overdue = [Loan.is_returned == False, Loan.return_date < today]
+            if last is not None:
+                ranges = [Loan.return_date >= last.scanned_through, Loan.id > last.max_loan_id]
+            else:
+                ranges = [literal(True)]
+
+            added = 0
+            for loan_range in ranges:
+                added += self.db_session.execute(
+                    db.insert(OverdueLoan).from_select(
+                        ['loan_id', 'user_id', 'book_copy_id', 'return_date'],
+                        db.select(Loan.id, Loan.user_id, Loan.book_copy_id, Loan.return_date)
+                        .where(*overdue, loan_range, Loan.id <= max_loan_id)
+                        .where(~db.select(OverdueLoan.loan_id).where(OverdueLoan.loan_id == Loan.id).exists())
+                    )
+                ).rowcount
+
+            removed = self.db_session.execute(
+                db.delete(OverdueLoan)
+                .where(
+                    db.select(Loan.id)
+                    .where(Loan.id == OverdueLoan.loan_id, or_(Loan.is_returned == True, Loan.return_date >= today))
+                    .exists()
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+            scan = OverdueScan(scanned_through=today, max_loan_id=max_loan_id, added=added, removed=removed)
+            self.db_session.add(scan)
+            self.db_session.commit()
+            return scan, None
+        except IntegrityError:
+            # Another process refreshed the snapshot concurrently
+            self.db_session.rollback()
+            return None, "Overdue scan already in progress"
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error refreshing overdue loans: {e}")
+            return None, "Failed to refresh overdue loans"
+
+    def get_page(self, today, limit, after=None, user_id=None, include=(), from_snapshot=True):
+        """
+        Retrieve one keyset page of overdue loans from the snapshot.
+
+        Snapshot entries are joined to their loan, so loans returned since the
+        last scan are left out. With from_snapshot=False the loans table is
+        queried directly through the (is_returned, return_date) index instead,
+        for when the snapshot could not be brought up to date.
+
+        Args:
+            today (date): Loans due before this date are overdue.
+            limit (int): Maximum number of loans to return.
+            after (int, optional): Cursor; only loans with a greater ID are returned.
+            user_id (int, optional): Only loans of this user.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
+            from_snapshot (bool, optional): Read through the snapshot. Default True.
+
+        Returns:
+            tuple[list[Loan], int | None]: Overdue loans in the page and the next cursor.
+        """
+        stmt = (
+            db.select(Loan)
+            .where(Loan.is_returned == False, Loan.return_date < today)
+            .options(*loader_options(Loan, include))
+        )
+        if not from_snapshot:
+            if user_id is not None:
+                stmt = stmt.where(Loan.user_id == user_id)
+            return keyset_page(self.db_session, stmt, Loan.id, limit, after)
+
+        stmt = stmt.join(OverdueLoan, OverdueLoan.loan_id == Loan.id)
+        if user_id is not None:
+            stmt = stmt.where(OverdueLoan.user_id == user_id)
+        return keyset_page(self.db_session, stmt, OverdueLoan.loan_id, limit, after)
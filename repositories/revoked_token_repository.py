@@ -0,0 +1,75 @@
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.revoked_token_model import RevokedToken
+
+
+class RevokedTokenRepository:
+    """
+    Repository class for the persistent JWT blocklist.
+
+    Args:
+        db_session (Session, optional): Database session instance, defaults to db.session.
+
+    Attributes:
+        db_session (Session): Database session for executing queries.
+
+    Returns:
+        RevokedTokenRepository: Repository instance for revoked token operations.
+    """
+    def __init__(self, db_session=None):
+        """
+        Initialize repository with database session.
+
+        Args:
+            db_session (Session, optional): Custom database session, defaults to db.session.
+        """
+        self.db_session = db_session or db.session
+
+    def add(self, jti, user_id, expires_at, now):
+        """
+        Record a revoked token and drop tokens that have expired since.
+
+        Expired rows are only purged here, on the (rare) revocation path, so the
+        periodic blocklist sync never writes.
+
+        Args:
+            jti (str): Token identifier.
+            user_id (int): User the token was issued to.
+            expires_at (int): Token expiry as a Unix timestamp.
+            now (int): Current Unix timestamp.
+
+        Returns:
+            tuple: (RevokedToken, None) on success or (None, error_message) on failure.
+        """
+        try:
+            self.db_session.execute(
+                db.delete(RevokedToken)
+                .where(RevokedToken.expires_at <= now)
+                .execution_options(synchronize_session=False)
+            )
+            token = RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at)
+            self.db_session.add(token)
+            self.db_session.commit()
+            return token, None
+        except IntegrityError:
+            self.db_session.rollback()
+            return None, "Token already revoked"
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error revoking token: {e}")
+            return None, "Failed to revoke token"
+
+    def get_active(self, now):
+        """
+        Retrieve the identifiers and expiry of all revoked tokens that have not expired.
+
+        Args:
+            now (int): Current Unix timestamp.
+
+        Returns:
+            list[Row]: Rows of (jti, expires_at).
+        """
+        return self.db_session.execute(
+            db.select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+        ).all()
@@ -1,5 +1,31 @@
 from extensions import db
 from models.user_model import User
+from utils.db_errors import is_unique_violation, violated_constraint
+from utils.pagination import keyset_page
+
+
+# Names under which the database reports a duplicate email: the case-insensitive
+# index, the column's unique constraint on PostgreSQL and on SQLite
+EMAIL_CONSTRAINTS = ('uq_user_email_lower', 'user_email_key', 'user.email')
+
+
+def _unique_violation_message(error):
+    """
+    Map a unique violation on the user table to the matching validation message.
+
+    The violated constraint is matched by name, never by the conflicting
+    value, so a username containing "email" is not reported as an email.
+
+    Args:
+        error (IntegrityError): Error raised by the flush or commit.
+
+    Returns:
+        str: Message naming the taken username or email.
+    """
+    constraint = violated_constraint(error)
+    if any(name in constraint for name in EMAIL_CONSTRAINTS):
+        return "Email already in use."
+    return "Username already taken."
 
 
 class UserRepository:
@@ -43,6 +69,8 @@ class UserRepository:
             return user, None
         except Exception as e:
             self.db_session.rollback()
+            if is_unique_violation(e):
+                return None, _unique_violation_message(e)
             return None, str(e)
 
     def find_by_id(self, user_id):
@@ -92,6 +120,23 @@ class UserRepository:
         """
         stmt = db.select(User)
         return self.db_session.scalars(stmt).all()
+
+    def find_page(self, limit, after=None, role=None):
+        """
+        Retrieve one keyset page of users ordered by ID, optionally filtered by role.
+
+        Args:
+            limit (int): Maximum number of users to return.
+            after (int, optional): Cursor; only users with a greater ID are returned.
+            role (str, optional): Only users with this role.
+
+        Returns:
+            tuple[list[User], int | None]: Users in the page and the next cursor.
+        """
+        stmt = db.select(User)
+        if role is not None:
+            stmt = stmt.where(User.role == role)
+        return keyset_page(self.db_session, stmt, User.id, limit, after)
     
     def delete(self, user):
         """
@@ -111,6 +156,35 @@ class UserRepository:
             self.db_session.rollback()
             return False, str(e)
 
+    def replace_password_hash(self, user, old_hash, new_hash):
+        """
+        Replace a user's password hash unless it changed in the meantime.
+
+        The UPDATE only matches while the stored hash is still `old_hash`, so a
+        rehash never overwrites a password changed by a concurrent request.
+
+        Args:
+            user (User): User whose hash is replaced.
+            old_hash (str): Hash the new one was derived from.
+            new_hash (str): Hash of the same password with the current cost.
+
+        Returns:
+            bool: True if the hash was replaced, False otherwise.
+        """
+        try:
+            replaced = self.db_session.execute(
+                db.update(User)
+                .where(User.id == user.id, User.password == old_hash)
+                .values(password=new_hash)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db_session.commit()
+            return bool(replaced)
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error replacing password hash: {e}")
+            return False
+
     def update(self, user: User, **fields):
         """
         Update specified fields of an existing user and commit the transaction.
@@ -132,4 +206,6 @@ class UserRepository:
             return user, None
         except Exception as e:
             self.db_session.rollback()
+            if is_unique_violation(e):
+                return None, _unique_violation_message(e)
             return None, str(e)
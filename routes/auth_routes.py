@@ -1,8 +1,9 @@
 from datetime import timedelta
 
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
 
+from extensions import rate_limiter
 from services.auth_service import AuthService
 
 auth_bp = Blueprint('auth_bp', __name__)
@@ -10,6 +11,7 @@ auth_service = AuthService()
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limiter.limit('login')
 def login():
     """
     Authenticate user and return JWT access token.
@@ -18,6 +20,8 @@ def login():
         200: Access token and user info on success.
         400: Missing required data.
         401: Authentication failed.
+        429: Rate limit exceeded (with Retry-After).
+        503: Password hashing at capacity (with Retry-After).
     """
 
     data = request.get_json()
@@ -60,13 +64,18 @@ def login():
 @jwt_required()
 def logout():
     """
-    Log out authenticated user.
+    Log out authenticated user and revoke the token used.
 
     Returns:
         200: Success message.
-        401: Unauthorized if JWT is missing/invalid.
+        401: Unauthorized if JWT is missing/invalid/revoked.
+        500: Token could not be revoked.
     """
     current_user_id = get_jwt_identity()
+    claims = get_jwt()
+    revoked, error = auth_service.revoke_token(claims['jti'], int(current_user_id), claims['exp'])
+    if not revoked:
+        return jsonify({'error': error}), 500
     auth_service.log_logout(current_user_id)
 
     return jsonify({
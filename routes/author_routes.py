@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from services.author_service import AuthorService
+from utils.etag import conditional_get
+from utils.pagination import parse_page_args
 
 author_bp = Blueprint('author_bp', __name__, url_prefix='/api/authors')
 author_service = AuthorService()
@@ -15,29 +17,44 @@ def create_author():
 
     Returns:
         201: Author created successfully.
-        400: Missing author name.
+        400: Missing author name or author already exists.
     """
     data = request.get_json()
     if not data or not data.get('name'):
         return jsonify({'error': 'Author name is required'}), 400
 
-    author = author_service.create_author(data['name'])
+    author, error = author_service.create_author(data['name'])
+    if error:
+        return jsonify({'error': error}), 400
     return jsonify({'message': 'Author created', 'author': author.json()}), 201
 
 
 @author_bp.route('', methods=['GET'])
+@conditional_get('author')
 def get_authors():
     """
-    Get a list of all authors.
+    Get one page of authors.
+
+    Args:
+        Query parameters: limit (int, optional), after (int, optional cursor)
 
     Returns:
-        200: List of all authors.
+        200: Page of authors and the cursor for the next page.
+        400: Invalid pagination parameters.
     """
-    authors = author_service.get_all_authors()
-    return jsonify([author.json() for author in authors]), 200
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+
+    authors, next_cursor = author_service.get_authors_page(limit, after)
+    return jsonify({
+        'authors': [author.json() for author in authors],
+        'next_cursor': next_cursor
+    }), 200
 
 
 @author_bp.route('/<int:author_id>', methods=['GET'])
+@conditional_get('author')
 def get_author(author_id):
     """
     Get an author by ID.
@@ -66,16 +83,16 @@ def update_author(author_id):
 
     Returns:
         200: Author updated successfully.
-        400: Missing name field.
+        400: Missing name field or name taken by another author.
         404: Author not found.
     """
     data = request.get_json()
     if not data or not data.get('name'):
         return jsonify({'error': 'Name is required'}), 400
 
-    author = author_service.update_author(author_id, data['name'])
-    if not author:
-        return jsonify({'error': 'Author not found'}), 404
+    author, error = author_service.update_author(author_id, data['name'])
+    if error:
+        return jsonify({'error': error}), 404 if error == 'Author not found' else 400
 
     return jsonify({'message': 'Author updated', 'author': author.json()}), 200
 
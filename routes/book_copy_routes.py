@@ -1,36 +1,83 @@
 from flask import Blueprint, request, jsonify
 from services.book_copy_service import BookCopyService
+from utils.etag import conditional_get
+from utils.includes import parse_include_arg
+from utils.pagination import parse_filter_args, parse_format_arg, parse_page_args, rows_body, str_to_bool
 
 book_copy_bp = Blueprint('book_copy', __name__)
 book_copy_service = BookCopyService()
 
+# ?include= names accepted by book copy reads and the relationships they load
+COPY_INCLUDES = {'book': 'book', 'author': 'book.author', 'category': 'book.category'}
+COPY_INCLUDE_TABLES = {'book': ('book',), 'author': ('book', 'author'), 'category': ('book', 'category')}
+
 
 @book_copy_bp.route('', methods=['GET'])
+@conditional_get('book_copy', include_tables=COPY_INCLUDE_TABLES)
 def get_all_book_copies():
     """
-    Get all book copies.
+    Get one page of book copies.
+
+    Args:
+        Query parameters: limit (int, optional), after (int, optional cursor),
+            book_id (int, optional), available (bool, optional),
+            include (str, optional): Comma-separated related objects to embed: book, author, category
+                (author and category are embedded in the book),
+            format (str, optional): 'json' (default) or 'columnar' ({'columns', 'rows', 'next_cursor'}).
 
     Returns:
-        200: List of all book copies.
+        200: Page of book copies and the cursor for the next page.
+        400: Invalid pagination, filter, include or format parameters.
     """
-    copies = book_copy_service.get_all_copies()
-    return jsonify([copy.json() for copy in copies]), 200
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+    include, error = parse_include_arg(COPY_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
+    fmt, error = parse_format_arg()
+    if error:
+        return jsonify({'error': error}), 400
+
+    filters, error = parse_filter_args(book_id=int, available=str_to_bool)
+    if error:
+        return jsonify({'error': error}), 400
+    if not include:
+        columns, rows, next_cursor = book_copy_service.get_copy_rows_page(limit, after, **filters)
+        return jsonify(rows_body('book_copies', columns, rows, next_cursor, fmt)), 200
+    if fmt == 'columnar':
+        return jsonify({'error': 'include is not supported with format=columnar'}), 400
+
+    copies, next_cursor = book_copy_service.get_copies_page(limit, after, include=include, **filters)
+    return jsonify({
+        'book_copies': [copy.json(include) for copy in copies],
+        'next_cursor': next_cursor
+    }), 200
 
 
 @book_copy_bp.route('/<int:book_copy_id>', methods=['GET'])
+@conditional_get('book_copy', include_tables=COPY_INCLUDE_TABLES)
 def get_book_copy(book_copy_id):
     """
     Get a specific book copy by ID.
 
     Args:
         book_copy_id (int): Book copy ID from URL path.
+        Query parameter: include (str, optional): Related objects to embed: book, author, category.
 
     Returns:
         200: Book copy details.
+        400: Unknown include.
         404: Book copy not found.
     """
-    copy = book_copy_service.get_copy_by_id(book_copy_id)
-    return jsonify(copy.json()), 200
+    include, error = parse_include_arg(COPY_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
+
+    copy = book_copy_service.get_copy_by_id(book_copy_id, include)
+    if not copy:
+        return jsonify({'error': 'Book copy not found'}), 404
+    return jsonify(copy.json(include)), 200
 
 
 @book_copy_bp.route('', methods=['POST'])
@@ -117,12 +164,35 @@ def delete_book_copy(book_copy_id):
 
 
 @book_copy_bp.route('/availability', methods=['GET'])
+@conditional_get('book_copy', 'book')
 def get_available_book_copies():
     """
-    List all available book copies with count per book.
+    Count available book copies for one page of books, with an optional page of the copies.
+
+    Args:
+        Query parameters: include_copies (bool, optional, default true),
+            limit (int, optional), after (int, optional cursor) of the copies,
+            book_limit (int, optional), book_after (int, optional cursor) of the per-book counts
 
     Returns:
-        200: Available book copies grouped by book with counts.
+        200: Available copy counts for a page of books and, if requested, a page of available copies.
+        400: Invalid pagination or include_copies parameters.
     """
-    copies = book_copy_service.get_available_copies_with_counts()
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+    book_limit, book_after, error = parse_page_args('book_limit', 'book_after')
+    if error:
+        return jsonify({'error': error}), 400
+    flags, error = parse_filter_args(include_copies=str_to_bool)
+    if error:
+        return jsonify({'error': error}), 400
+
+    copies = book_copy_service.get_available_copies_with_counts(
+        include_copies=flags['include_copies'] is not False,
+        limit=limit,
+        after=after,
+        book_limit=book_limit,
+        book_after=book_after
+    )
     return jsonify(copies), 200
@@ -1,44 +1,122 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from services.book_service import BookService
 from services.fill_books_service import FillBooksService
+from utils.authz import role_required
+from utils.etag import conditional_get
+from utils.includes import parse_include_arg
+from utils.pagination import parse_filter_args, parse_format_arg, parse_page_args, rows_body
 
 
 from flask import request
-from extensions import db
+from extensions import db, rate_limiter
 
 book_bp = Blueprint('book_bp', __name__)
 book_service = BookService()
 fill_books_service = FillBooksService()
 
+# ?include= names accepted by book reads and the relationships they load
+BOOK_INCLUDES = {'author': 'author', 'category': 'category', 'copies': 'copies'}
+BOOK_INCLUDE_TABLES = {'author': ('author',), 'category': ('category',), 'copies': ('book_copy',)}
+
 
 @book_bp.route('', methods=['GET'])
+@conditional_get('book', include_tables=BOOK_INCLUDE_TABLES)
 def get_books():
     """
-    Get all books.
+    Get one page of books.
+
+    Args:
+        Query parameters: limit (int, optional), after (int, optional cursor),
+            author_id (int, optional), category_id (int, optional),
+            include (str, optional): Comma-separated related objects to embed: author, category, copies,
+            format (str, optional): 'json' (default) or 'columnar' ({'columns', 'rows', 'next_cursor'}).
 
     Returns:
-        200: List of all books.
+        200: Page of books and the cursor for the next page.
+        400: Invalid pagination, filter, include or format parameters.
     """
-    books = book_service.get_all_books()
-    return jsonify([book.json() for book in books]), 200
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+    include, error = parse_include_arg(BOOK_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
+    fmt, error = parse_format_arg()
+    if error:
+        return jsonify({'error': error}), 400
+
+    filters, error = parse_filter_args(author_id=int, category_id=int)
+    if error:
+        return jsonify({'error': error}), 400
+    if not include:
+        columns, rows, next_cursor = book_service.get_book_rows_page(limit, after, **filters)
+        return jsonify(rows_body('books', columns, rows, next_cursor, fmt)), 200
+    if fmt == 'columnar':
+        return jsonify({'error': 'include is not supported with format=columnar'}), 400
+
+    books, next_cursor = book_service.get_books_page(limit, after, include=include, **filters)
+    return jsonify({
+        'books': [book.json(include) for book in books],
+        'next_cursor': next_cursor
+    }), 200
+
+
+@book_bp.route('/search', methods=['GET'])
+@conditional_get('book', 'author', 'category')
+def search_books():
+    """
+    Search books by title, author and category name.
+
+    Words match as prefixes; results are ranked, title matches first.
+
+    Args:
+        Query parameters: q (str), limit (int, optional),
+            after (int, optional cursor from the previous page)
+
+    Returns:
+        200: Page of matching books and the cursor for the next page.
+        400: Missing query or invalid pagination parameters.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+    if after is not None and after < 0:
+        return jsonify({'error': 'after must not be negative'}), 400
+
+    books, next_cursor = book_service.search_books(query, limit, after or 0)
+    return jsonify({
+        'books': [book.json() for book in books],
+        'next_cursor': next_cursor
+    }), 200
 
 
 @book_bp.route('/<int:book_id>', methods=['GET'])
+@conditional_get('book', include_tables=BOOK_INCLUDE_TABLES)
 def get_book(book_id):
     """
     Get a specific book by ID.
 
     Args:
         book_id (int): Book ID from URL path.
+        Query parameter: include (str, optional): Related objects to embed: author, category, copies.
 
     Returns:
         200: Book details.
+        400: Unknown include.
         404: Book not found.
     """
-    book = book_service.get_book_by_id(book_id)
+    include, error = parse_include_arg(BOOK_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
+
+    book = book_service.get_book_by_id(book_id, include)
     if not book:
         return jsonify({'error': 'Book not found'}), 404
-    return jsonify(book.json()), 200
+    return jsonify(book.json(include)), 200
 
 
 @book_bp.route('', methods=['POST'])
@@ -140,6 +218,7 @@ def delete_book(book_id):
 
 
 @book_bp.route('/fill_external', methods=['POST'])
+@rate_limiter.limit('fill_external')
 def fill_books():
     """
     Fetch and store books from external API.
@@ -149,6 +228,7 @@ def fill_books():
 
     Returns:
         201: Books added successfully.
+        429: Rate limit exceeded (with Retry-After).
         500: External API or database error.
     """
     data = request.get_json()
@@ -168,6 +248,49 @@ def fill_books():
         return jsonify({"error": str(e)}), 500
 
 
+@book_bp.route('/harvest_external', methods=['POST'])
+@role_required('admin', 'librarian')
+@rate_limiter.limit('harvest_external')
+def harvest_books():
+    """
+    Harvest books for many queries from external API, walking result pages concurrently (librarian or admin only).
+
+    Args:
+        JSON body: {'queries': list[str] (at most HARVEST_MAX_QUERIES), 'max_results': int (optional, per query)}
+
+    Returns:
+        201: Books added and page counts.
+        400: Missing or invalid queries, or too many queries.
+        429: Rate limit exceeded (with Retry-After).
+        500: Database error.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+
+    queries = data.get('queries')
+    if not isinstance(queries, list) or not queries or not all(isinstance(q, str) and q.strip() for q in queries):
+        return jsonify({'error': 'queries must be a non-empty list of strings'}), 400
+    max_queries = current_app.config["HARVEST_MAX_QUERIES"]
+    if len(queries) > max_queries:
+        return jsonify({'error': f'At most {max_queries} queries per request'}), 400
+
+    try:
+        max_results = int(data.get('max_results', 40))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'max_results must be an integer'}), 400
+
+    try:
+        result = fill_books_service.harvest_books([q.strip() for q in queries], max_results)
+        return jsonify({
+            "message": f"{len(result['books'])} books added",
+            **result
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
 @book_bp.route('/by-title/<string:title>', methods=['GET'])
 def get_book_by_title(title):
     """
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from services.category_service import CategoryService
+from utils.etag import conditional_get
+from utils.pagination import parse_page_args
 
 category_bp = Blueprint('category_bp', __name__)
 category_service = CategoryService()
@@ -32,17 +34,30 @@ def add_category():
 
 
 @category_bp.route('', methods=['GET'])
+@conditional_get('category')
 def get_all_categories():
     """
-    Get a list of all categories.
+    Get one page of categories.
+
+    Args:
+        Query parameters: limit (int, optional), after (int, optional cursor)
 
     Returns:
-        200: List of all categories.
+        200: Page of categories and the cursor for the next page.
+        400: Invalid pagination parameters.
     """
-    categories = category_service.get_all_categories()
-    return jsonify([category.json() for category in categories]), 200
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+
+    categories, next_cursor = category_service.get_categories_page(limit, after)
+    return jsonify({
+        'categories': [category.json() for category in categories],
+        'next_cursor': next_cursor
+    }), 200
 
 @category_bp.route('/<int:category_id>', methods=['GET'])
+@conditional_get('category')
 def get_category_by_id(category_id):
     """
     Get category details by ID.
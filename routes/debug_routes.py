@@ -0,0 +1,29 @@
+from flask import Blueprint, request, jsonify
+
+from extensions import sql_profiler
+from utils.authz import role_required
+
+debug_bp = Blueprint('debug', __name__)
+
+
+@debug_bp.route('/requests', methods=['GET'])
+@role_required('admin')
+def get_request_profiles():
+    """
+    Get SQL profiles of the most recent requests (admin only).
+
+    Args:
+        Query parameters: limit (int, optional)
+
+    Returns:
+        200: Whether profiling is enabled and the recent request profiles, newest first.
+        400: Invalid limit.
+    """
+    limit = request.args.get('limit', type=int)
+    if 'limit' in request.args and (limit is None or limit < 1):
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+
+    return jsonify({
+        'enabled': sql_profiler.enabled,
+        'requests': sql_profiler.recent(limit)
+    }), 200
@@ -1,29 +1,42 @@
 
-from flask import Blueprint, send_file
-from extensions import db
+from flask import Blueprint, Response, current_app, jsonify, send_file, stream_with_context
 from models.book_model import Book
 from models.author_model import Author
 from models.category_model import Category
 from models.book_copy_model import BookCopy
 from models.loan_model import Loan
 from models.user_model import User
-from utils.export_utils import rows_to_dataframe, make_xlsx_bytes
+from extensions import rate_limiter
+from utils.export_utils import iter_csv, iter_ndjson, write_xlsx_streaming
 
 export_bp = Blueprint("export_bp", __name__, url_prefix="/api/export")
 
+# Entity name in the URL -> model whose table is exported
+EXPORT_MODELS = {
+    "books": Book,
+    "authors": Author,
+    "categories": Category,
+    "book_copies": BookCopy,
+    "loans": Loan,
+    "users": User,
+}
 
-def _as_xlsx_response(sheets: dict[str, "pd.DataFrame"], filename: str):
+
+def _as_xlsx_response(sheets: dict, filename: str):
     """
     Generate a downloadable Excel (.xlsx) response from given sheet(s).
 
+    The workbook is built in constant-memory mode in a temp file, which is
+    then streamed to the client in chunks.
+
     Args:
-        sheets (dict): Sheet name -> DataFrame.
+        sheets (dict): Sheet name -> model class to export.
         filename (str): Filename for download.
 
     Returns:
         Flask Response: Excel file download.
     """
-    xlsx_io = make_xlsx_bytes(sheets)
+    xlsx_io = write_xlsx_streaming(sheets, current_app.config["EXPORT_BATCH_SIZE"])
     return send_file(
         xlsx_io,
         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -34,83 +47,85 @@ def _as_xlsx_response(sheets: dict[str, "pd.DataFrame"], filename: str):
 
 
 @export_bp.route("/books.xlsx", methods=["GET"])
+@rate_limiter.limit("export")
 def export_books():
     """
     Export all books as an Excel file.
 
     Returns:
         200: Downloadable Excel (.xlsx) file of books.
+        429: Rate limit exceeded (with Retry-After).
     """
-    rows = db.session.query(Book).all()
-    return _as_xlsx_response({"books": rows_to_dataframe(rows)}, "books.xlsx")
+    return _as_xlsx_response({"books": Book}, "books.xlsx")
 
 
 @export_bp.route("/authors.xlsx", methods=["GET"])
+@rate_limiter.limit("export")
 def export_authors():
     """
     Export all authors as an Excel file.
 
     Returns:
         200: Downloadable Excel (.xlsx) file of authors.
+        429: Rate limit exceeded (with Retry-After).
     """
-    rows = db.session.query(Author).all()
-    return _as_xlsx_response({
-        "authors": rows_to_dataframe(rows)
-    }, "authors.xlsx")
+    return _as_xlsx_response({"authors": Author}, "authors.xlsx")
 
 
 @export_bp.route("/categories.xlsx", methods=["GET"])
+@rate_limiter.limit("export")
 def export_categories():
     """
     Export all categories as an Excel file.
 
     Returns:
         200: Downloadable Excel (.xlsx) file of categories.
+        429: Rate limit exceeded (with Retry-After).
     """
-    rows = db.session.query(Category).all()
-    return _as_xlsx_response({
-        "categories": rows_to_dataframe(rows)},
-        "categories.xlsx")
+    return _as_xlsx_response({"categories": Category}, "categories.xlsx")
+
 
 @export_bp.route("/book_copies.xlsx", methods=["GET"])
+@rate_limiter.limit("export")
 def export_book_copies():
     """
     Export all book copies as an Excel file.
 
     Returns:
         200: Downloadable Excel (.xlsx) file of book copies.
+        429: Rate limit exceeded (with Retry-After).
     """
-    rows = db.session.query(BookCopy).all()
-    return _as_xlsx_response({
-        "book_copies": rows_to_dataframe(rows)
-    }, "book_copies.xlsx")
+    return _as_xlsx_response({"book_copies": BookCopy}, "book_copies.xlsx")
 
 
 @export_bp.route("/loans.xlsx", methods=["GET"])
+@rate_limiter.limit("export")
 def export_loans():
     """
     Export all loans as an Excel file.
 
     Returns:
         200: Downloadable Excel (.xlsx) file of loans.
+        429: Rate limit exceeded (with Retry-After).
     """
-    rows = db.session.query(Loan).all()
-    return _as_xlsx_response({"loans": rows_to_dataframe(rows)}, "loans.xlsx")
+    return _as_xlsx_response({"loans": Loan}, "loans.xlsx")
 
 
 @export_bp.route("/users.xlsx", methods=["GET"])
+@rate_limiter.limit("export")
 def export_users():
     """
     Export all users as an Excel file.
 
     Returns:
         200: Downloadable Excel (.xlsx) file of users.
+        429: Rate limit exceeded (with Retry-After).
     """
-    rows = db.session.query(User).all()
-    return _as_xlsx_response({"users": rows_to_dataframe(rows)}, "users.xlsx")
+    return _as_xlsx_response({"users": User}, "users.xlsx")
 
 
 @export_bp.route("/all.xlsx", methods=["GET"])
+@rate_limiter.limit("export")
 def export_all():
     """
     Export all entities (books, authors, categories, book copies, loans, users)
@@ -118,13 +133,57 @@ def export_all():
 
     Returns:
         200: Downloadable Excel (.xlsx) file with all sheets.
+        429: Rate limit exceeded (with Retry-After).
+    """
+    return _as_xlsx_response(EXPORT_MODELS, "library_export.xlsx")
+
+
+@export_bp.route("/<string:entity>.csv", methods=["GET"])
+def export_csv(entity):
+    """
+    Stream all rows of an entity as CSV.
+
+    Rows are fetched in batches and written to a chunked response, so memory
+    use does not grow with the table size.
+
+    Args:
+        entity (str): One of books, authors, categories, book_copies, loans, users.
+
+    Returns:
+        200: Streamed CSV download.
+        404: Unknown entity.
+    """
+    model = EXPORT_MODELS.get(entity)
+    if model is None:
+        return jsonify({"error": f"Unknown export entity: {entity}"}), 404
+
+    chunks = iter_csv(model, current_app.config["EXPORT_BATCH_SIZE"])
+    return Response(
+        stream_with_context(chunks),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={entity}.csv"},
+    )
+
+
+@export_bp.route("/<string:entity>.ndjson", methods=["GET"])
+def export_ndjson(entity):
     """
-    sheets = {
-        "books":       rows_to_dataframe(db.session.query(Book).all()),
-        "authors":     rows_to_dataframe(db.session.query(Author).all()),
-        "categories":  rows_to_dataframe(db.session.query(Category).all()),
-        "book_copies": rows_to_dataframe(db.session.query(BookCopy).all()),
-        "loans":       rows_to_dataframe(db.session.query(Loan).all()),
-        "users":       rows_to_dataframe(db.session.query(User).all()),
-    }
-    return _as_xlsx_response(sheets, "library_export.xlsx")
+    Stream all rows of an entity as newline-delimited JSON.
+
+    Args:
+        entity (str): One of books, authors, categories, book_copies, loans, users.
+
+    Returns:
+        200: Streamed NDJSON download.
+        404: Unknown entity.
+    """
+    model = EXPORT_MODELS.get(entity)
+    if model is None:
+        return jsonify({"error": f"Unknown export entity: {entity}"}), 404
+
+    chunks = iter_ndjson(model, current_app.config["EXPORT_BATCH_SIZE"])
+    return Response(
+        stream_with_context(chunks),
+        mimetype="application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={entity}.ndjson"},
+    )
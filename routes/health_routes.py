@@ -1,4 +1,6 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
+
+from extensions import catalog_cache, metrics
 
 health_bp = Blueprint("health_bp", __name__)
 
@@ -12,3 +14,27 @@ def health():
         200: Service is healthy and operational.
     """
     return jsonify({"status": "ok"}), 200
+
+
+@health_bp.get("/health/cache")
+def cache_stats():
+    """
+    Report hit/miss counters of the catalog read-through cache.
+
+    Returns:
+        200: Hits, misses and hit rate per cached entity.
+    """
+    return jsonify(catalog_cache.stats()), 200
+
+
+@health_bp.get("/metrics")
+def prometheus_metrics():
+    """
+    Expose request, database pool, cache and bcrypt metrics for Prometheus.
+
+    With METRICS_MULTIPROC_DIR set, the values of all worker processes are merged.
+
+    Returns:
+        200: Metrics in the Prometheus text exposition format.
+    """
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
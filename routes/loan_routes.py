@@ -1,28 +1,65 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from services.loan_service import LoanService
+from utils.authz import role_required
+from utils.includes import parse_include_arg
+from utils.pagination import parse_filter_args, parse_format_arg, parse_page_args, rows_body, str_to_bool
 
 loan_bp = Blueprint('loan_bp', __name__)
 loan_service = LoanService()
 
+# ?include= names accepted by loan reads and the relationships they load
+LOAN_INCLUDES = {
+    'book_copy': 'book_copy',
+    'book': 'book_copy.book',
+    'author': 'book_copy.book.author',
+    'category': 'book_copy.book.category',
+}
+
 
 @loan_bp.route('', methods=['GET'])
 def get_all_loans():
     """
-    Get all loans for current user.
+    Get one page of loans for current user.
 
     Args:
-        Query parameter: user_id (int)
+        Query parameters: user_id (int), limit (int, optional), after (int, optional cursor),
+            is_returned (bool, optional),
+            include (str, optional): Comma-separated related objects to embed: book_copy, book, author,
+                category (nested as book_copy.book.author),
+            format (str, optional): 'json' (default) or 'columnar' ({'columns', 'rows', 'next_cursor'}).
 
     Returns:
-        200: List of user's loans.
-        400: Missing user_id parameter.
+        200: Page of user's loans and the cursor for the next page.
+        400: Missing user_id or invalid pagination, filter, include or format parameters.
     """
-    current_user_id = request.args.get('user_id', type=int)
+    filters, error = parse_filter_args(user_id=int, is_returned=str_to_bool)
+    if error:
+        return jsonify({'error': error}), 400
+    current_user_id = filters['user_id']
     if not current_user_id:
         return jsonify({'error': 'Missing user_id in query parameters'}), 400
 
-    loans = loan_service.get_loans_by_user(current_user_id)
-    return jsonify({'loans': loans}), 200
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+    include, error = parse_include_arg(LOAN_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
+    fmt, error = parse_format_arg()
+    if error:
+        return jsonify({'error': error}), 400
+
+    is_returned = filters['is_returned']
+    if not include:
+        columns, rows, next_cursor = loan_service.get_loan_rows_by_user(current_user_id, limit, after, is_returned)
+        return jsonify(rows_body('loans', columns, rows, next_cursor, fmt)), 200
+    if fmt == 'columnar':
+        return jsonify({'error': 'include is not supported with format=columnar'}), 400
+
+    loans, next_cursor = loan_service.get_loans_by_user(
+        current_user_id, limit, after, is_returned=is_returned, include=include
+    )
+    return jsonify({'loans': loans, 'next_cursor': next_cursor}), 200
 
 
 @loan_bp.route('', methods=['POST'])
@@ -68,6 +105,103 @@ def create_loan():
         return jsonify({'error': str(e)}), 400
 
 
+@loan_bp.route('/batch', methods=['POST'])
+def create_loans_batch():
+    """
+    Check out several book copies to one user in a single transaction.
+
+    Args:
+        JSON body: {'user_id': int, 'book_copy_ids': [int, ...], 'all_or_nothing': bool (optional)}
+
+    Returns:
+        201: At least one loan created; per-copy results.
+        400: Invalid body, unknown user or no loan created; per-copy results if any.
+        500: Server error.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'Missing JSON body'}), 400
+
+    user_id = data.get('user_id')
+    all_or_nothing = data.get('all_or_nothing', False)
+
+    if not user_id:
+        return jsonify({'error': 'Missing user_id'}), 400
+    book_copy_ids, error = _parse_book_copy_ids(data, current_app.config['LOAN_BATCH_MAX_SIZE'])
+    if error:
+        return jsonify({'error': error}), 400
+    if not isinstance(all_or_nothing, bool):
+        return jsonify({'error': 'all_or_nothing must be a boolean'}), 400
+
+    results, error = loan_service.create_loans_batch(user_id, book_copy_ids, all_or_nothing)
+    if error:
+        if error in ("User does not exist", "Book is already on loan"):
+            return jsonify({'error': error}), 400
+        return jsonify({'error': error}), 500
+
+    created = sum(1 for result in results if result['status'] == 'created')
+    return jsonify({
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    }), 201 if created else 400
+
+
+@loan_bp.route('/batch/return', methods=['POST'])
+@role_required('admin', 'librarian')
+def return_books_batch():
+    """
+    Return the active loans of many scanned book copies at once (librarian or admin only).
+
+    Args:
+        JSON body: {'book_copy_ids': [int, ...]}
+
+    Returns:
+        200: Per-copy results with the number of returned and failed copies.
+        400: Invalid body.
+        500: Server error.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'Missing JSON body'}), 400
+
+    book_copy_ids, error = _parse_book_copy_ids(data, current_app.config['LOAN_RETURN_BATCH_MAX_SIZE'])
+    if error:
+        return jsonify({'error': error}), 400
+
+    results, error = loan_service.return_by_book_copies(book_copy_ids)
+    if error:
+        return jsonify({'error': error}), 500
+
+    returned = sum(1 for result in results if result['status'] == 'returned')
+    return jsonify({
+        'returned': returned,
+        'failed': len(results) - returned,
+        'results': results
+    }), 200
+
+
+def _parse_book_copy_ids(data, max_size):
+    """
+    Read and validate the `book_copy_ids` list of a batch request body.
+
+    Args:
+        data (dict): Parsed JSON body.
+        max_size (int): Largest number of IDs accepted.
+
+    Returns:
+        tuple[list[int] | None, str | None]: (ids, None) or (None, error_message).
+    """
+    book_copy_ids = data.get('book_copy_ids')
+    if not isinstance(book_copy_ids, list) or not book_copy_ids:
+        return None, 'book_copy_ids must be a non-empty list'
+    if not all(isinstance(i, int) and not isinstance(i, bool) for i in book_copy_ids):
+        return None, 'book_copy_ids must contain integers'
+    if len(book_copy_ids) > max_size:
+        return None, f'At most {max_size} book copies per batch'
+    return book_copy_ids, None
+
+
 @loan_bp.route('/<int:loan_id>/return', methods=['PUT'])
 def return_book(loan_id):
     """
@@ -98,6 +232,36 @@ def return_book(loan_id):
     }), 200
 
 
+@loan_bp.route('/overdue', methods=['GET'])
+@role_required('admin', 'librarian')
+def get_overdue_loans():
+    """
+    Get one page of overdue loans (librarian or admin only).
+
+    Args:
+        Query parameters: limit (int, optional), after (int, optional cursor),
+            user_id (int, optional),
+            include (str, optional): Comma-separated related objects to embed: book_copy, book, author,
+                category (nested as book_copy.book.author)
+
+    Returns:
+        200: Page of overdue loans with days_overdue and the cursor for the next page.
+        400: Invalid pagination, user_id or include parameters.
+    """
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+    include, error = parse_include_arg(LOAN_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
+    filters, error = parse_filter_args(user_id=int)
+    if error:
+        return jsonify({'error': error}), 400
+
+    loans, next_cursor = loan_service.get_overdue_loans(limit, after, include=include, **filters)
+    return jsonify({'loans': loans, 'next_cursor': next_cursor}), 200
+
+
 @loan_bp.route('/<int:loan_id>', methods=['GET'])
 def get_loan_by_id(loan_id):
     """
@@ -105,18 +269,26 @@ def get_loan_by_id(loan_id):
 
     Args:
         loan_id (int): Loan ID from URL path.
-        Query parameter: user_id (int)
+        Query parameters: user_id (int),
+            include (str, optional): Comma-separated related objects to embed: book_copy, book, author,
+                category (nested as book_copy.book.author)
 
     Returns:
         200: Loan details.
-        400: Missing user_id parameter.
+        400: Missing or invalid user_id parameter or unknown include.
         404: Loan not found.
     """
-    current_user_id = request.args.get('user_id', type=int)
+    filters, error = parse_filter_args(user_id=int)
+    if error:
+        return jsonify({'error': error}), 400
+    current_user_id = filters['user_id']
     if not current_user_id:
         return jsonify({'error': 'Missing user_id in query parameters'}), 400
+    include, error = parse_include_arg(LOAN_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
 
-    loan, error = loan_service.get_loan_by_id_for_user(loan_id, current_user_id)
+    loan, error = loan_service.get_loan_by_id_for_user(loan_id, current_user_id, include)
     if error:
         return jsonify({'error': error}), 404
     return jsonify({'loan': loan}), 200
@@ -125,25 +297,73 @@ def get_loan_by_id(loan_id):
 @loan_bp.route('/stats', methods=['GET'])
 def loan_statistics():
     """
-    Get loan statistics (total, returned, not returned counts).
+    Get loan statistics (total, returned, not returned and overdue counts).
+
+    Args:
+        Query parameters: by (str, optional): Comma-separated breakdowns, 'user' and/or 'category',
+            limit (int, optional), after (int, optional cursor): page of the per-user breakdown,
+                ordered by user ID; limit defaults to PAGE_SIZE_DEFAULT and is capped at
+                PAGE_SIZE_MAX, and the response carries 'next_user_cursor'.
 
     Returns:
         200: Loan statistics summary.
+        400: Unknown breakdown or invalid pagination parameters.
     """
-    stats = loan_service.get_loan_statistics()
+    breakdowns = {b.strip() for b in request.args.get('by', '').split(',') if b.strip()}
+    unknown = breakdowns - {'user', 'category'}
+    if unknown:
+        return jsonify({'error': f"Unknown breakdown: {', '.join(sorted(unknown))}"}), 400
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+
+    stats = loan_service.get_loan_statistics(
+        by_user='user' in breakdowns,
+        by_category='category' in breakdowns,
+        user_limit=limit,
+        user_after=after
+    )
     return jsonify(stats), 200
 
 
 @loan_bp.route('/user/<int:user_id>', methods=['GET'])
 def get_loans_by_user_id(user_id):
     """
-    Get loan history for a specific user.
+    Get one page of loan history for a specific user.
 
     Args:
         user_id (int): User ID from URL path.
+        Query parameters: limit (int, optional), after (int, optional cursor),
+            is_returned (bool, optional),
+            include (str, optional): Comma-separated related objects to embed: book_copy, book, author,
+                category (nested as book_copy.book.author),
+            format (str, optional): 'json' (default) or 'columnar' ({'columns', 'rows', 'next_cursor'}).
 
     Returns:
-        200: List of user's loans.
+        200: Page of user's loans and the cursor for the next page.
+        400: Invalid pagination, is_returned, include or format parameters.
     """
-    loans = loan_service.get_loans_by_user(user_id)
-    return jsonify({'loans': loans}), 200
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+    include, error = parse_include_arg(LOAN_INCLUDES)
+    if error:
+        return jsonify({'error': error}), 400
+    fmt, error = parse_format_arg()
+    if error:
+        return jsonify({'error': error}), 400
+
+    filters, error = parse_filter_args(is_returned=str_to_bool)
+    if error:
+        return jsonify({'error': error}), 400
+    is_returned = filters['is_returned']
+    if not include:
+        columns, rows, next_cursor = loan_service.get_loan_rows_by_user(user_id, limit, after, is_returned)
+        return jsonify(rows_body('loans', columns, rows, next_cursor, fmt)), 200
+    if fmt == 'columnar':
+        return jsonify({'error': 'include is not supported with format=columnar'}), 400
+
+    loans, next_cursor = loan_service.get_loans_by_user(
+        user_id, limit, after, is_returned=is_returned, include=include
+    )
+    return jsonify({'loans': loans, 'next_cursor': next_cursor}), 200
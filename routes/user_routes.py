@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from services.user_service import UserService
+from utils.pagination import parse_page_args
 
 user_bp = Blueprint('user_bp', __name__)
 user_service = UserService()
@@ -16,6 +17,7 @@ def add_user():
     Returns:
         201: User created successfully.
         400: Missing required fields or validation error.
+        503: Password hashing at capacity (with Retry-After).
     """
     data = request.get_json()
 
@@ -44,13 +46,24 @@ def add_user():
 @user_bp.route('', methods=['GET'])
 def get_all_users():
     """
-    Get all users.
+    Get one page of users.
+
+    Args:
+        Query parameters: limit (int, optional), after (int, optional cursor), role (str, optional)
 
     Returns:
-        200: List of all users.
+        200: Page of users and the cursor for the next page.
+        400: Invalid pagination parameters.
     """
-    users = user_service.get_all_users()
-    return jsonify([user.to_dict() for user in users]), 200
+    limit, after, error = parse_page_args()
+    if error:
+        return jsonify({'error': error}), 400
+
+    users, next_cursor = user_service.get_users_page(limit, after, role=request.args.get('role'))
+    return jsonify({
+        'users': [user.to_dict() for user in users],
+        'next_cursor': next_cursor
+    }), 200
 
 
 @user_bp.route('/<int:user_id>', methods=['GET'])
@@ -139,6 +152,7 @@ def update_user(user_id):
         200: User updated successfully.
         400: Missing data or validation error.
         404: User not found.
+        503: Password hashing at capacity (with Retry-After).
     """
     data = request.get_json()
     if not data:
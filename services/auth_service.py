@@ -1,3 +1,7 @@
+import time
+
+from extensions import audit_log, token_blocklist
+from repositories.revoked_token_repository import RevokedTokenRepository
 from services.user_service import UserService
 from utils.password_utils import check_password
 import logging
@@ -16,11 +20,15 @@ class AuthService:
         Initialize AuthService with an instance of UserService.
         """
         self.user_service = UserService()
+        self.revoked_token_repo = RevokedTokenRepository()
 
     def authenticate(self, username, password):
         """
         Authenticate a user by verifying username and password.
 
+        After a successful login, a stored hash whose bcrypt cost differs from
+        BCRYPT_LOG_ROUNDS is replaced by one with the configured cost.
+
         Args:
             username (str): The username of the user attempting to log in.
             password (str): The plaintext password provided by the user.
@@ -34,19 +42,44 @@ class AuthService:
         """
         user = self.user_service.get_user_by_username(username)
         if not user:
-            logging.warning(f"Failed login attempt - user not found: {username}")
+            audit_log.record('login_failed', username=username, reason='unknown_user')
             return None, "Invalid username or password"
 
         if not check_password(user.password, password):
-            logging.warning(f"Failed login attempt - wrong password: {username}")
+            audit_log.record('login_failed', user_id=user.id, username=username, reason='wrong_password')
             return None, "Invalid username or password"
 
         if not user.is_active:
+            audit_log.record('login_failed', user_id=user.id, username=username, reason='deactivated')
             return None, "Account is deactivated"
 
-        logging.info(f"Successful authentication for user: {username}")
+        if self.user_service.upgrade_password_hash(user, password):
+            logging.info(f"Rehashed password with the configured bcrypt cost for user: {username}")
+
+        audit_log.record('login', user_id=user.id)
         return user, None
 
+    def revoke_token(self, jti, user_id, expires_at):
+        """
+        Revoke a token until it expires.
+
+        The token is persisted for the other worker processes and blocked in
+        this process immediately.
+
+        Args:
+            jti (str): Identifier of the token to revoke.
+            user_id (int): User the token was issued to.
+            expires_at (int): Token expiry as a Unix timestamp (the `exp` claim).
+
+        Returns:
+            tuple[bool, str | None]: (True, None) on success or (False, error message).
+        """
+        _, error = self.revoked_token_repo.add(jti, user_id, expires_at, int(time.time()))
+        if error and error != "Token already revoked":
+            return False, error
+        token_blocklist.add(jti, expires_at)
+        return True, None
+
     def log_logout(self, user_id):
         """
         Record a logout event for the given user.
@@ -54,12 +87,7 @@ class AuthService:
         Args:
             user_id (int): ID of the user who is logging out.
         """
-        try:
-            user = self.user_service.get_user_by_id(user_id)
-            if user:
-                logging.info(f"User {user.username} logged out")
-        except Exception as e:
-            logging.error(f"Logout logging error: {str(e)}")
+        audit_log.record('logout', user_id=user_id)
 
 
 
@@ -1,6 +1,10 @@
 
+from sqlalchemy.exc import IntegrityError
+
+from extensions import audit_log
 from models.author_model import Author
 from repositories.author_repository import AuthorRepository
+from utils.db_errors import is_unique_violation
 
 
 class AuthorService:
@@ -20,16 +24,26 @@ class AuthorService:
         """
         Create and save a new author.
 
+        Names are unique case-insensitively; a duplicate is rejected by the
+        database's unique index instead of a lookup before the insert.
+
         Args:
             name (str): Author name.
 
         Returns:
-            Author: Created Author instance.
+            tuple[Author | None, str | None]: (Created author, None) or (None, error message)
         """
         author = Author(name=name)
-        self.repo.save(author)
-        self.repo.commit()
-        return author
+        try:
+            self.repo.save(author)
+            self.repo.commit()
+        except IntegrityError as e:
+            self.repo.rollback()
+            if is_unique_violation(e):
+                return None, "Author already exists"
+            raise
+        audit_log.record('catalog_create', entity='author', entity_id=author.id)
+        return author, None
 
     def get_all_authors(self):
         """
@@ -40,6 +54,19 @@ class AuthorService:
         """
         return self.repo.find_all()
 
+    def get_authors_page(self, limit, after=None):
+        """
+        Return one keyset page of authors.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+
+        Returns:
+            tuple[list[Author], int | None]: (Authors, next cursor)
+        """
+        return self.repo.find_page(limit, after)
+
     def get_author_by_id(self, author_id):
         """
         Get an author by their ID.
@@ -61,14 +88,21 @@ class AuthorService:
             new_name (str): New author name.
 
         Returns:
-            Author or None: Updated Author, or None if not found.
+            tuple[Author | None, str | None]: (Updated author, None) or (None, error message)
         """
         author = self.repo.find_by_id(author_id)
         if not author:
-            return None
+            return None, "Author not found"
         author.name = new_name
-        self.repo.commit()
-        return author
+        try:
+            self.repo.update(author)
+        except IntegrityError as e:
+            self.repo.rollback()
+            if is_unique_violation(e):
+                return None, "Author already exists"
+            raise
+        audit_log.record('catalog_update', entity='author', entity_id=author.id, fields=['name'])
+        return author, None
 
     def delete_author(self, author_id):
         """
@@ -84,4 +118,5 @@ class AuthorService:
         if not author:
             return False
         self.repo.delete(author)
+        audit_log.record('catalog_delete', entity='author', entity_id=author_id)
         return True
@@ -1,3 +1,4 @@
+from extensions import audit_log
 from models.book_copy_model import BookCopy
 from repositories.book_copy_repository import BookCopyRepository
 from services.book_service import BookService
@@ -28,17 +29,49 @@ class BookCopyService:
         """
         return self.book_copy_repo.find_all()
 
-    def get_copy_by_id(self, book_copy_id):
+    def get_copies_page(self, limit, after=None, book_id=None, available=None, include=()):
+        """
+        Return one keyset page of book copies, optionally filtered.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            book_id (int, optional): Book filter.
+            available (bool, optional): Availability filter.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
+
+        Returns:
+            tuple[list[BookCopy], int | None]: (Book copies, next cursor)
+        """
+        return self.book_copy_repo.find_page(limit, after, book_id=book_id, available=available, include=include)
+
+    def get_copy_rows_page(self, limit, after=None, book_id=None, available=None):
+        """
+        Return one keyset page of book copies as column names and row tuples.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            book_id (int, optional): Book filter.
+            available (bool, optional): Availability filter.
+
+        Returns:
+            tuple[list[str], list[tuple], int | None]: (Columns, rows, next cursor)
+        """
+        return self.book_copy_repo.find_page_rows(limit, after, book_id=book_id, available=available)
+
+    def get_copy_by_id(self, book_copy_id, include=()):
         """
         Return a book copy by ID.
 
         Args:
             book_copy_id (int): Book copy ID.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
 
         Returns:
             BookCopy or None: Found book copy or None if not found.
         """
-        return self.book_copy_repo.get_by_id(book_copy_id)
+        return self.book_copy_repo.get_by_id(book_copy_id, include)
 
     def create_copy(self, book_id, available=True, location=None):
         """
@@ -61,8 +94,10 @@ class BookCopyService:
 
         book_copy = BookCopy(book_id=book_id, available=available, location=location)
         copy = self.book_copy_repo.save(book_copy)
-
-        return (copy, None) if copy else (None, "Failed to create book copy")
+        if not copy:
+            return None, "Failed to create book copy"
+        audit_log.record('catalog_create', entity='book_copy', entity_id=copy.id, book_id=book_id)
+        return copy, None
 
     def update_copy(self, data, book_copy_id):
         """
@@ -100,7 +135,11 @@ class BookCopyService:
             book_copy.location = location
 
         updated = self.book_copy_repo.update(book_copy)
-        return (updated, None) if updated else (None, "Failed to edit book copy")
+        if not updated:
+            return None, "Failed to edit book copy"
+        audit_log.record('catalog_update', entity='book_copy', entity_id=book_copy_id,
+                         fields=sorted(field for field in ('book_id', 'available', 'location') if field in data))
+        return updated, None
 
     def delete_copy(self, book_copy_id):
         """
@@ -117,30 +156,44 @@ class BookCopyService:
             return False, "Book copy not found"
 
         success = self.book_copy_repo.delete(book_copy_id)
-        return (True, None) if success else (False, "Failed to delete book copy")
+        if not success:
+            return False, "Failed to delete book copy"
+        audit_log.record('catalog_delete', entity='book_copy', entity_id=book_copy_id)
+        return True, None
 
-    def get_available_copies_with_counts(self):
+    def get_available_copies_with_counts(self, include_copies=True, limit=None, after=None,
+                                         book_limit=None, book_after=None):
         """
-        Return all available copies and count per book.
+        Return one page of available copy counts per book and, optionally, one page of those copies.
+
+        Counts come from a single GROUP BY query joined to the book title, paged
+        by book ID, so neither the number of queries nor the response grows with
+        the catalog.
+
+        Args:
+            include_copies (bool, optional): Whether to include a page of available copies. Default True.
+            limit (int, optional): Page size of the copy list.
+            after (int, optional): Cursor of the copy list from the previous page.
+            book_limit (int, optional): Page size of the per-book counts.
+            book_after (int, optional): Cursor of the per-book counts from the previous page.
 
         Returns:
             dict: {
-                "available_copies": list of available copies (dicts),
-                "count_per_book": {book_id: {"title": str, "count": int}, ...}
+                "count_per_book": {book_id: {"title": str, "count": int}, ...},
+                "next_book_cursor": cursor for the next page of per-book counts,
+                "available_copies": list of available copies (dicts), if include_copies,
+                "next_cursor": cursor for the next page of copies, if include_copies
             }
         """
-        available_copies = self.book_copy_repo.get_available_copies()
-        book_counts = {}
-        for copy in available_copies:
-            book_id = copy.book_id
-            if book_id not in book_counts:
-                book_counts[book_id] = {
-                    "title": copy.book.title if copy.book else "Unknown",
-                    "count": 0
-                }
-            book_counts[book_id]["count"] += 1
-
-        return {
-            "available_copies": [copy.json() for copy in available_copies],
-            "count_per_book": book_counts
+        counts, next_book_cursor = self.book_copy_repo.count_available_per_book(book_limit, book_after)
+        result = {
+            "count_per_book": {book_id: {"title": title, "count": count} for book_id, title, count in counts},
+            "next_book_cursor": next_book_cursor,
         }
+
+        if include_copies:
+            copies, next_cursor = self.book_copy_repo.find_page(limit, after, available=True)
+            result["available_copies"] = [copy.json() for copy in copies]
+            result["next_cursor"] = next_cursor
+
+        return result
@@ -3,11 +3,19 @@ Service layer for managing book-related operations.
 Coordinates validation and cross-entity checks for authors and categories.
 """
 
+import re
+
+from flask import current_app
+
+from extensions import audit_log
 from models.book_model import Book
 from repositories.book_repository import BookRepository
 from services.author_service import AuthorService
 from services.category_service import CategoryService
 
+SEARCH_MAX_TERMS = 8
+_SEARCH_TERM = re.compile(r"[^\W_]+")
+
 
 class BookService:
     """
@@ -36,23 +44,82 @@ class BookService:
         """
         return self.book_repo.find_all()
 
-    def get_book_by_id(self, book_id):
+    def get_books_page(self, limit, after=None, author_id=None, category_id=None, include=()):
+        """
+        Return one keyset page of books, optionally filtered by author or category.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            author_id (int, optional): Author filter.
+            category_id (int, optional): Category filter.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
+
+        Returns:
+            tuple[list[Book], int | None]: (Books, next cursor)
+        """
+        return self.book_repo.find_page(
+            limit, after, author_id=author_id, category_id=category_id, include=include
+        )
+
+    def get_book_rows_page(self, limit, after=None, author_id=None, category_id=None):
+        """
+        Return one keyset page of books as column names and row tuples.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            author_id (int, optional): Author filter.
+            category_id (int, optional): Category filter.
+
+        Returns:
+            tuple[list[str], list[tuple], int | None]: (Columns, rows, next cursor)
+        """
+        return self.book_repo.find_page_rows(limit, after, author_id=author_id, category_id=category_id)
+
+    def search_books(self, query, limit, offset=0):
+        """
+        Return one page of books ranked by how well they match a search query.
+
+        The query is split into words (letters and digits); each word matches
+        title, author or category words by prefix. At most SEARCH_MAX_TERMS
+        words are used, and at most SEARCH_MAX_CANDIDATES (app config) matches
+        are ranked.
+
+        Args:
+            query (str): Free-text search query.
+            limit (int): Page size.
+            offset (int, optional): Position in the ranked results to start at.
+
+        Returns:
+            tuple[list[Book], int | None]: (Books, next cursor)
+        """
+        terms = _SEARCH_TERM.findall(query.lower())[:SEARCH_MAX_TERMS]
+        if not terms:
+            return [], None
+        return self.book_repo.search(
+            terms, limit, offset, max_candidates=current_app.config['SEARCH_MAX_CANDIDATES'] or None
+        )
+
+    def get_book_by_id(self, book_id, include=()):
         """
         Return a single book by its ID.
 
         Args:
             book_id (int): Primary key.
+            include (Iterable[str], optional): Relationship paths to load eagerly.
 
         Returns:
             Book or None: Found book or None.
         """
-        return self.book_repo.get_by_id(book_id)
+        return self.book_repo.get_by_id(book_id, include)
 
     def create_book(self, title, author_id, category_id):
         """
         Create a new book.
 
-        Validates title, author and category existence, and uniqueness by title.
+        Validates title, author and category existence. Title uniqueness
+        (case-insensitive) is enforced by a unique index on insert.
 
         Args:
             title (str): Book title.
@@ -71,9 +138,6 @@ class BookService:
         if not isinstance(category_id, int):
             return None, "Category_id must be an integer"
 
-        if self.book_repo.get_by_title(title.strip()):
-            return None, "Book with this title already exists"
-
         if not self.author_service.get_author_by_id(author_id):
             return None, "Author not found"
 
@@ -82,13 +146,16 @@ class BookService:
 
         book = Book(title=title.strip(), author_id=author_id, category_id=category_id)
         saved_book, save_error = self.book_repo.save(book)
-        return (saved_book, None) if saved_book else (None, save_error)
+        if not saved_book:
+            return None, save_error
+        audit_log.record('catalog_create', entity='book', entity_id=saved_book.id)
+        return saved_book, None
 
     def update_book(self, book_id, data):
         """
         Update book details (title, author, category).
 
-        Validates all inputs and ensures title uniqueness.
+        Validates all inputs; title uniqueness is enforced by the database on commit.
 
         Args:
             book_id (int): Book primary key.
@@ -106,10 +173,6 @@ class BookService:
             if not isinstance(title, str) or not title.strip():
                 return None, "Title must be a non-empty string"
 
-            existing = self.book_repo.get_by_title(title.strip())
-            if existing and existing.id != book_id:
-                return None, "Book with this title already exists"
-
             book.title = title.strip()
 
         author_id = data.get('author_id')
@@ -128,8 +191,13 @@ class BookService:
                 return None, "Category not found"
             book.category_id = category_id
 
-        updated = self.book_repo.update(book)
-        return (updated, None) if updated else (None, "Failed to update book")
+        updated, error = self.book_repo.update(book)
+        if error:
+            return None, error
+        audit_log.record('catalog_update', entity='book', entity_id=book_id,
+                         fields=sorted(field for field in ('title', 'author_id', 'category_id')
+                                       if data.get(field) is not None))
+        return updated, None
 
     def delete_book(self, book_id):
         """
@@ -151,7 +219,10 @@ class BookService:
             return False, "Cannot delete book with existing copies"
 
         success = self.book_repo.delete(book_id)
-        return (True, None) if success else (False, "Failed to delete book")
+        if not success:
+            return False, "Failed to delete book"
+        audit_log.record('catalog_delete', entity='book', entity_id=book_id)
+        return True, None
 
     def get_book_by_title(self, title):
         """
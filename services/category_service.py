@@ -1,6 +1,10 @@
 
+from sqlalchemy.exc import IntegrityError
+
+from extensions import audit_log
 from models.category_model import Category
 from repositories.category_repository import CategoryRepository
+from utils.db_errors import is_unique_violation
 
 
 class CategoryService:
@@ -20,7 +24,8 @@ class CategoryService:
         """
         Create a new category.
 
-        Returns an error if a category with the same name already exists.
+        Returns an error if a category with the same name (case-insensitive)
+        already exists, as reported by the database's unique index.
 
         Args:
             name (str): Category name.
@@ -28,13 +33,16 @@ class CategoryService:
         Returns:
             tuple[Category | None, str | None]: (Created category, None) or (None, error message)
         """
-        existing = self.repo.find_by_name(name)
-        if existing:
-            return None, "Category already exists"
-
         category = Category(name=name)
-        self.repo.save(category)
-        self.repo.commit()
+        try:
+            self.repo.save(category)
+            self.repo.commit()
+        except IntegrityError as e:
+            self.repo.rollback()
+            if is_unique_violation(e):
+                return None, "Category already exists"
+            raise
+        audit_log.record('catalog_create', entity='category', entity_id=category.id)
         return category, None
 
     def get_all_categories(self):
@@ -46,6 +54,19 @@ class CategoryService:
         """
         return self.repo.find_all()
 
+    def get_categories_page(self, limit, after=None):
+        """
+        Return one keyset page of categories.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+
+        Returns:
+            tuple[list[Category], int | None]: (Categories, next cursor)
+        """
+        return self.repo.find_page(limit, after)
+
     def get_category_by_id(self, category_id):
         """
         Return a category by its ID.
@@ -74,13 +95,14 @@ class CategoryService:
         if not category:
             return False, "Category not found"
         self.repo.delete(category)
+        audit_log.record('catalog_delete', entity='category', entity_id=category_id)
         return True, None
 
     def update_category(self, category_id, new_name):
         """
         Update a category's name.
 
-        Returns error if category is not found or save fails.
+        Returns error if category is not found, the name is taken or save fails.
 
         Args:
             category_id (int): Category primary key.
@@ -97,6 +119,11 @@ class CategoryService:
 
         try:
             self.repo.save(category)
-            return category, None
+            self.repo.commit()
         except Exception as e:
+            self.repo.rollback()
+            if is_unique_violation(e):
+                return None, "Category already exists"
             return None, str(e)
+        audit_log.record('catalog_update', entity='category', entity_id=category.id, fields=['name'])
+        return category, None
@@ -1,12 +1,20 @@
 
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
 import requests
-from models.book_model import Book
-from models.author_model import Author
-from models.category_model import Category
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from sqlalchemy.exc import IntegrityError
+from urllib3.util.retry import Retry
+
 from repositories.author_repository import AuthorRepository
 from repositories.category_repository import CategoryRepository
 from repositories.book_repository import BookRepository
 from extensions import db
+from utils.db_errors import is_unique_violation
 
 
 class FillBooksService:
@@ -18,6 +26,7 @@ class FillBooksService:
         category_repo (CategoryRepository): Repository for category persistence.
         book_repo (BookRepository): Repository for book persistence.
     """
+    PAGE_SIZE = 40  # Google Books API maximum for maxResults
 
     def __init__(self):
         """
@@ -26,6 +35,67 @@ class FillBooksService:
         self.author_repo = AuthorRepository()
         self.category_repo = CategoryRepository()
         self.book_repo = BookRepository()
+        self._http = None
+        self._http_lock = threading.Lock()
+
+    def _http_session(self):
+        """
+        Return the pooled HTTP session, creating it on first use from app config.
+
+        The session keeps connections alive across calls and retries failed
+        GETs (connection errors, 429 and 5xx) with exponential backoff.
+
+        Returns:
+            requests.Session: Shared session for Google Books API calls.
+        """
+        with self._http_lock:
+            if self._http is None:
+                config = current_app.config
+                retry = Retry(
+                    total=config["GOOGLE_BOOKS_RETRIES"],
+                    backoff_factor=config["GOOGLE_BOOKS_BACKOFF"],
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_maxsize=config["GOOGLE_BOOKS_MAX_CONCURRENCY"],
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http = session
+            return self._http
+
+    @staticmethod
+    def _fetch_page(session, url, timeout, query, start_index, max_results):
+        """
+        Fetch one page of volumes from the Google Books API.
+
+        Runs on worker threads, so it only uses the arguments it is given.
+
+        Parameters:
+            session (requests.Session): Pooled HTTP session.
+            url (str): Volumes endpoint URL.
+            timeout (float): Request timeout in seconds.
+            query (str): Search query.
+            start_index (int): Index of the first result of the page.
+            max_results (int): Page size (max 40).
+
+        Returns:
+            dict: Decoded JSON response with 'items' and 'totalItems'.
+
+        Raises:
+            requests.RequestException: On connection errors, timeouts or an error status.
+        """
+        res = session.get(
+            url,
+            params={"q": query, "startIndex": start_index, "maxResults": max_results},
+            timeout=timeout,
+        )
+        res.raise_for_status()
+        return res.json()
 
     def fetch_and_store_books(self, query, limit):
         """
@@ -38,11 +108,93 @@ class FillBooksService:
         Returns:
             list[str]: Titles of books successfully added to the database.
         """
-        url = f"https://www.googleapis.com/books/v1/volumes?q={query}&maxResults={limit}"
-        res = requests.get(url)
-        items = res.json().get('items', [])
+        page = self._fetch_page(
+            self._http_session(),
+            current_app.config["GOOGLE_BOOKS_API_URL"],
+            current_app.config["GOOGLE_BOOKS_TIMEOUT"],
+            query, 0, limit
+        )
+        return self.store_items(page.get('items', []))
+
+    def harvest_books(self, queries, max_results):
+        """
+        Fetch many result pages for many queries concurrently and store them.
+
+        The first page of every query is requested at once; when it arrives its
+        totalItems decides which further startIndex pages are requested. Pages
+        are fetched by a bounded thread pool over the pooled HTTP session and
+        stored by this thread, one batch per page, as they complete.
+
+        Parameters:
+            queries (list[str]): Search queries to harvest.
+            max_results (int): Maximum number of results per query (capped by HARVEST_MAX_RESULTS).
+
+        Returns:
+            dict: {
+                "books": titles of books added,
+                "pages_fetched": int,
+                "pages_failed": int
+            }
+        """
+        config = current_app.config
+        session = self._http_session()
+        url = config["GOOGLE_BOOKS_API_URL"]
+        timeout = config["GOOGLE_BOOKS_TIMEOUT"]
+        max_results = max(0, min(max_results, config["HARVEST_MAX_RESULTS"]))
+
         created = []
+        fetched = failed = 0
+
+        with ThreadPoolExecutor(max_workers=config["GOOGLE_BOOKS_MAX_CONCURRENCY"]) as pool:
+            pending = {}
+
+            def submit(query, start_index):
+                size = min(self.PAGE_SIZE, max_results - start_index)
+                future = pool.submit(self._fetch_page, session, url, timeout, query, start_index, size)
+                pending[future] = (query, start_index)
+
+            for query in dict.fromkeys(queries):
+                if max_results:
+                    submit(query, 0)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query, start_index = pending.pop(future)
+                    try:
+                        page = future.result()
+                    except requests.RequestException as e:
+                        failed += 1
+                        logging.warning(f"Google Books page failed (q={query}, startIndex={start_index}): {e}")
+                        continue
+
+                    fetched += 1
+                    created.extend(self.store_items(page.get('items', [])))
 
+                    if start_index == 0:
+                        total = min(page.get('totalItems', 0), max_results)
+                        for next_index in range(self.PAGE_SIZE, total, self.PAGE_SIZE):
+                            submit(query, next_index)
+
+        return {"books": created, "pages_fetched": fetched, "pages_failed": failed}
+
+    @staticmethod
+    def normalize_items(items):
+        """
+        Reduce Google Books volume items to unique (title, author, category) records.
+
+        Items without a title are dropped. The first author/category is used, with
+        defaults when missing. Titles are unique case-insensitively, so later items
+        repeating a title are removed.
+
+        Parameters:
+            items (list[dict]): Raw volume items from the Google Books API.
+
+        Returns:
+            list[tuple[str, str, str]]: (title, author_name, category_name) records in input order.
+        """
+        records = []
+        seen = set()
         for item in items:
             info = item.get("volumeInfo", {})
             title = info.get("title")
@@ -50,29 +202,87 @@ class FillBooksService:
                 continue
 
             # Get first author/category or use defaults
-            author_name = info.get("authors", ["Unknown Author"])[0]
-            category_name = info.get("categories", ["General"])[0]
-
-            # Find or create author
-            author = self.author_repo.find_by_name(author_name)
-            if not author:
-                author = Author(name=author_name)
-                self.author_repo.save(author)
-
-            # Find or create category
-            category = self.category_repo.find_by_name(category_name)
-            if not category:
-                category = Category(name=category_name)
-                self.category_repo.save(category)
-
-            # Skip if book with same title + author exists
-            if self.book_repo.find_by_title_and_author(title, author.id):
+            author_name = (info.get("authors") or ["Unknown Author"])[0]
+            category_name = (info.get("categories") or ["General"])[0]
+
+            if title.lower() in seen:
                 continue
+            seen.add(title.lower())
+            records.append((title, author_name, category_name))
+        return records
+
+    def store_items(self, items):
+        """
+        Store a batch of Google Books volume items with set-based queries.
+
+        Resolves all authors and categories with one IN query each, bulk-inserts
+        the missing ones, skips books whose title already exists using a single
+        lookup, inserts the new books in one batch and commits once. Names and
+        titles are matched case-insensitively, like their unique indexes.
+
+        If a concurrent request inserted one of the rows first, the insert hits a
+        unique index; the transaction is then rolled back and the batch stored
+        again, which re-selects the rows that now exist.
+
+        Parameters:
+            items (list[dict]): Raw volume items from the Google Books API.
+
+        Returns:
+            list[str]: Titles of books successfully added to the database.
+        """
+        records = self.normalize_items(items)
+        if not records:
+            return []
+
+        try:
+            return self._store_records(records)
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_unique_violation(e):
+                raise
+            logging.info(f"Catalog rows inserted concurrently, storing the batch again: {e.orig}")
+            return self._store_records(records)
+
+    def _store_records(self, records):
+        """
+        Store normalized records in one transaction (see `store_items`).
+
+        Parameters:
+            records (list[tuple[str, str, str]]): Records from `normalize_items`.
+
+        Returns:
+            list[str]: Titles of books added to the database.
+        """
+        # Lowercased name -> first spelling seen in the batch
+        author_names = {}
+        category_names = {}
+        for _, author_name, category_name in records:
+            author_names.setdefault(author_name.lower(), author_name)
+            category_names.setdefault(category_name.lower(), category_name)
+
+        # Find or create authors
+        author_ids = {a.name.lower(): a.id for a in self.author_repo.find_by_names(author_names.values())}
+        missing = [name for key, name in author_names.items() if key not in author_ids]
+        author_ids.update({row.name.lower(): row.id for row in self.author_repo.bulk_create(missing)})
+
+        # Find or create categories
+        category_ids = {c.name.lower(): c.id for c in self.category_repo.find_by_names(category_names.values())}
+        missing = [name for key, name in category_names.items() if key not in category_ids]
+        category_ids.update({row.name.lower(): row.id for row in self.category_repo.bulk_create(missing)})
+
+        # Skip books whose title already exists
+        existing = self.book_repo.find_existing_titles(title for title, _, _ in records)
 
-            # Create and save new book
-            book = Book(title=title, author_id=author.id, category_id=category.id)
-            self.book_repo.save(book)
-            created.append(title)
+        books = [
+            {
+                'title': title,
+                'author_id': author_ids[author_name.lower()],
+                'category_id': category_ids[category_name.lower()],
+            }
+            for title, author_name, category_name in records
+            if title.lower() not in existing
+        ]
+        self.book_repo.bulk_create(books)
 
         db.session.commit()
-        return created
+        return [book['title'] for book in books]
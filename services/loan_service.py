@@ -1,7 +1,12 @@
 from repositories.loan_repository import LoanRepository
 from repositories.book_copy_repository import BookCopyRepository
 from repositories.user_repository import UserRepository
-from datetime import date, timedelta
+from repositories.overdue_loan_repository import OverdueLoanRepository
+from extensions import audit_log
+from utils.loan_stats_cache import loan_stats_cache
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from flask import current_app
 
 
 class LoanService:
@@ -12,6 +17,7 @@ class LoanService:
         loan_repo (LoanRepository): Repository for loan persistence.
         book_copy_repo (BookCopyRepository): Repository for book copy queries.
         user_repo (UserRepository): Repository for user validation.
+        overdue_repo (OverdueLoanRepository): Repository for the overdue loan snapshot.
     """
     def __init__(self):
         """
@@ -20,24 +26,47 @@ class LoanService:
         self.loan_repo = LoanRepository()
         self.book_copy_repo = BookCopyRepository()
         self.user_repo = UserRepository()
+        self.overdue_repo = OverdueLoanRepository()
 
-    def get_loans_by_user(self, user_id):
+    def get_loans_by_user(self, user_id, limit, after=None, is_returned=None, include=()):
         """
-        Retrieve all loans made by a specific user.
+        Retrieve one keyset page of loans made by a specific user.
 
         Args:
             user_id (int): ID of the user.
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            is_returned (bool, optional): Return status filter.
+            include (Iterable[str], optional): Relationship paths to load eagerly and embed.
 
         Returns:
-            list[dict]: List of loan records in JSON format.
+            tuple[list[dict], int | None]: Loan records in JSON format and the next cursor.
         """
-        loans = self.loan_repo.get_by_user_id(user_id)
-        return [loan.json() for loan in loans]
+        loans, next_cursor = self.loan_repo.get_page_by_user_id(user_id, limit, after, is_returned, include)
+        return [loan.json(include) for loan in loans], next_cursor
+
+    def get_loan_rows_by_user(self, user_id, limit, after=None, is_returned=None):
+        """
+        Retrieve one keyset page of a user's loans as column names and row tuples.
+
+        Args:
+            user_id (int): ID of the user.
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            is_returned (bool, optional): Return status filter.
+
+        Returns:
+            tuple[list[str], list[tuple], int | None]: (Columns, rows, next cursor)
+        """
+        return self.loan_repo.find_page_rows(limit, after, user_id=user_id, is_returned=is_returned)
 
     def create_loan(self, loan_data):
         """
         Create a new loan if the book copy is available and user exists.
 
+        The availability check and the loan insert run as a single atomic
+        checkout, so concurrent requests for the same copy cannot both succeed.
+
         Args:
             loan_data (dict): Dictionary with keys: user_id, book_copy_id, loan_date (optional), return_date (optional).
 
@@ -58,15 +87,63 @@ class LoanService:
         if not user:
             return None, "User does not exist"
 
-        # Check if book copy is already on loan
-        for loan in self.loan_repo.get_active_loans():
-            if loan.book_copy_id == loan_data.get('book_copy_id'):
-                return None, "Book is already on loan"
+        # Claim the copy and insert the loan in one transaction
+        loan, error = self.loan_repo.checkout(loan_data)
+        if error:
+            return None, error
+        loan_stats_cache.record_checkout()
+        audit_log.record('checkout', user_id=loan.user_id, entity='loan', entity_id=loan.id,
+                         book_copy_id=loan.book_copy_id)
+        return loan.json(), None
+
+    def create_loans_batch(self, user_id, book_copy_ids, all_or_nothing=False):
+        """
+        Check out several book copies to one user at once.
+
+        The user is validated once and all loans are created in a single
+        transaction (see LoanRepository.checkout_batch).
+
+        Args:
+            user_id (int): ID of the borrowing user.
+            book_copy_ids (list[int]): IDs of the copies to check out.
+            all_or_nothing (bool, optional): Create no loan unless all succeed. Default False.
+
+        Returns:
+            tuple[list[dict], str]: (per-copy results in request order, error message).
+                Each result has book_copy_id, status ('created' or 'failed') and
+                either the loan or an error.
+        """
+        user = self.user_repo.find_by_id(user_id)
+        if not user:
+            return None, "User does not exist"
+
+        unique_ids = list(dict.fromkeys(book_copy_ids))
+        today = date.today()
+        outcomes, error = self.loan_repo.checkout_batch(
+            user_id, unique_ids, today, today + timedelta(days=14), all_or_nothing
+        )
+        if error:
+            return None, error
+
+        created = [outcome for outcome in outcomes.values() if not isinstance(outcome, str)]
+        if created:
+            loan_stats_cache.record_checkout(len(created))
+        for loan in created:
+            audit_log.record('checkout', user_id=user_id, entity='loan', entity_id=loan.id,
+                             book_copy_id=loan.book_copy_id)
 
-        loan = self.loan_repo.create(loan_data)
-        if loan:
-            return loan.json(), None
-        return None, "Failed to create loan"
+        results = []
+        seen = set()
+        for copy_id in book_copy_ids:
+            outcome = outcomes.get(copy_id, "Batch rolled back")
+            if copy_id in seen:
+                outcome = "Duplicate book_copy_id"
+            seen.add(copy_id)
+            if isinstance(outcome, str):
+                results.append({'book_copy_id': copy_id, 'status': 'failed', 'error': outcome})
+            else:
+                results.append({'book_copy_id': copy_id, 'status': 'created', 'loan': outcome.json()})
+        return results, None
 
     def return_loan(self, loan_id, user_id):
         """
@@ -87,6 +164,7 @@ class LoanService:
         if loan.is_returned:
             return None, "Book already returned"
 
+        was_overdue = loan.return_date < date.today()
         loan.is_returned = True
         if loan.book_copy:
             loan.book_copy.available = True
@@ -95,39 +173,155 @@ class LoanService:
         if not success:
             return None, "Failed to return book"
 
+        loan_stats_cache.record_return(overdue=int(was_overdue))
+        audit_log.record('return', user_id=loan.user_id, entity='loan', entity_id=loan.id,
+                         book_copy_id=loan.book_copy_id, overdue=was_overdue)
         return loan.json(), None
 
-    def get_loan_by_id_for_user(self, loan_id, user_id):
+    def return_by_book_copies(self, book_copy_ids):
+        """
+        Return the active loans of scanned book copies, whoever borrowed them.
+
+        Args:
+            book_copy_ids (list[int]): IDs of the returned copies, as scanned.
+
+        Returns:
+            tuple[list[dict], str]: (per-copy results in request order, error message).
+                Each result has book_copy_id, status ('returned' or 'failed') and
+                either loan_id and overdue or an error.
+        """
+        outcomes, error = self.loan_repo.return_by_book_copies(list(dict.fromkeys(book_copy_ids)))
+        if error:
+            return None, error
+
+        today = date.today()
+        results = []
+        seen = set()
+        returned = overdue = 0
+        for copy_id in book_copy_ids:
+            outcome = "Duplicate book_copy_id" if copy_id in seen else outcomes[copy_id]
+            seen.add(copy_id)
+            if isinstance(outcome, str):
+                results.append({'book_copy_id': copy_id, 'status': 'failed', 'error': outcome})
+                continue
+            was_overdue = outcome.return_date < today
+            returned += 1
+            overdue += was_overdue
+            audit_log.record('return', user_id=outcome.user_id, entity='loan', entity_id=outcome.id,
+                             book_copy_id=copy_id, overdue=was_overdue)
+            results.append({
+                'book_copy_id': copy_id,
+                'status': 'returned',
+                'loan_id': outcome.id,
+                'overdue': was_overdue
+            })
+
+        if returned:
+            loan_stats_cache.record_return(returned, overdue=overdue)
+        return results, None
+
+    def refresh_overdue_snapshot(self):
+        """
+        Add newly overdue loans to the overdue snapshot and drop returned ones.
+
+        Run periodically by the overdue scanner (OVERDUE_SCAN_INTERVAL) in every
+        worker process; a run is skipped while another one holds the scan claim.
+
+        Returns:
+            tuple[dict, str]: (scan JSON, error message)
+        """
+        owner = uuid.uuid4().hex
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if not self.overdue_repo.claim_scan(owner, now, current_app.config["OVERDUE_SCAN_LEASE"]):
+            return None, "Overdue scan already in progress"
+        try:
+            scan, error = self.overdue_repo.refresh(date.today())
+        finally:
+            self.overdue_repo.release_scan(owner)
+        if error:
+            return None, error
+        return scan.json(), None
+
+    def get_overdue_loans(self, limit, after=None, user_id=None, include=()):
+        """
+        Retrieve one keyset page of overdue loans.
+
+        Served from the overdue snapshot; if the scanner has not run yet today,
+        the snapshot is refreshed first, under the scan claim, so loans that fell
+        due since are included. If that refresh cannot run (another scan holds
+        the claim) or fails, the page is read from the loans table directly
+        rather than from the stale snapshot.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            user_id (int, optional): Only loans of this user.
+            include (Iterable[str], optional): Relationship paths to load eagerly and embed.
+
+        Returns:
+            tuple[list[dict], int | None]: Loan records with days_overdue and the next cursor.
+        """
+        today = date.today()
+        last_scan = self.overdue_repo.get_last_scan()
+        current = last_scan is not None and last_scan.scanned_through >= today
+        if not current:
+            _, error = self.refresh_overdue_snapshot()
+            current = error is None
+
+        loans, next_cursor = self.overdue_repo.get_page(
+            today, limit, after, user_id, include, from_snapshot=current
+        )
+        return [
+            dict(loan.json(include), days_overdue=(today - loan.return_date).days) for loan in loans
+        ], next_cursor
+
+    def get_loan_by_id_for_user(self, loan_id, user_id, include=()):
         """
         Fetch a specific loan by ID if it belongs to the user.
 
         Args:
             loan_id (int): Loan ID.
             user_id (int): User ID.
+            include (Iterable[str], optional): Relationship paths to load eagerly and embed.
 
         Returns:
             tuple[dict, str]: (loan JSON, error message)
         """
-        loan = self.loan_repo.get_by_id(loan_id)
+        loan = self.loan_repo.get_by_id(loan_id, include)
         if not loan:
             return None, "Loan not found"
         if loan.user_id != user_id:
             return None, "Unauthorized"
-        return loan.json(), None
+        return loan.json(include), None
 
-    def get_loan_statistics(self):
+    def get_loan_statistics(self, by_user=False, by_category=False, user_limit=None, user_after=None):
         """
         Get statistics for all loan records.
 
+        Totals alone come from one conditional-aggregate query and are served from
+        the in-process cache (LOAN_STATS_CACHE_TTL seconds, 0 disables it), which
+        checkouts and returns keep up to date. When breakdowns are requested, the
+        totals and every breakdown are computed together in one grouped query.
+
+        Args:
+            by_user (bool, optional): Include per-user counters. Default False.
+            by_category (bool, optional): Include per-category counters. Default False.
+            user_limit (int, optional): Page size of the per-user counters.
+            user_after (int, optional): Cursor of the per-user counters from the previous page.
+
         Returns:
-            dict: Dictionary with counts for total, returned, and not returned loans.
+            dict: Counts for total, returned, not returned and overdue loans,
+                plus 'by_user' / 'next_user_cursor' / 'by_category' when requested.
         """
-        total = self.loan_repo.count_all_loans()
-        returned = self.loan_repo.count_loans_by_return_status(True)
-        not_returned = self.loan_repo.count_loans_by_return_status(False)
+        today = date.today()
+        ttl = current_app.config['LOAN_STATS_CACHE_TTL']
+
+        if by_user or by_category:
+            return self.loan_repo.get_statistics_breakdown(today, by_user, by_category, user_limit, user_after)
 
-        return {
-            'total_loans': total,
-            'returned_loans': returned,
-            'not_returned_loans': not_returned
-        }
+        stats = loan_stats_cache.get() if ttl > 0 else None
+        if stats is None:
+            stats = self.loan_repo.get_statistics(today)
+            if ttl > 0:
+                loan_stats_cache.set(stats, ttl)
+        return stats
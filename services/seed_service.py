@@ -0,0 +1,348 @@
+"""
+Service for generating high-volume synthetic library data.
+Writes with Core executemany inserts (COPY on PostgreSQL) instead of per-object saves.
+"""
+
+import csv
+import io
+import random
+from datetime import date, timedelta
+from itertools import accumulate
+
+from extensions import db, table_versions
+from models.author_model import Author
+from models.book_copy_model import BookCopy
+from models.book_model import Book
+from models.category_model import Category
+from models.loan_model import Loan
+from models.user_model import User
+
+FIRST_NAMES = [
+    "Ada", "Alan", "Alice", "Amara", "Ana", "Boris", "Carmen", "Chen", "Clara", "Daniel",
+    "David", "Elena", "Emil", "Fatima", "Grace", "Hana", "Igor", "Isabel", "James", "Jonas",
+    "Julia", "Kenji", "Lara", "Leo", "Lina", "Marco", "Maya", "Mei", "Nadia", "Noah",
+    "Omar", "Paula", "Priya", "Rafael", "Rosa", "Samuel", "Sara", "Tomas", "Vera", "Yusuf",
+]
+LAST_NAMES = [
+    "Abe", "Alvarez", "Bauer", "Becker", "Cohen", "Costa", "Dubois", "Evans", "Fischer", "Garcia",
+    "Haddad", "Hansen", "Ito", "Jensen", "Kim", "Kowalski", "Levi", "Lopez", "Meyer", "Moreau",
+    "Nakamura", "Novak", "Okafor", "Olsen", "Park", "Petrov", "Quinn", "Rossi", "Sato", "Schmidt",
+    "Silva", "Smith", "Tanaka", "Torres", "Usman", "Varga", "Wagner", "Weiss", "Young", "Zhang",
+]
+CATEGORY_NAMES = [
+    "Fiction", "Science Fiction", "Fantasy", "Mystery", "Thriller", "Romance", "Horror",
+    "Historical Fiction", "Biography", "History", "Science", "Mathematics", "Philosophy",
+    "Psychology", "Poetry", "Drama", "Travel", "Cooking", "Art", "Music", "Religion",
+    "Business", "Computers", "Children", "Young Adult",
+]
+TITLE_ADJECTIVES = [
+    "Silent", "Hidden", "Last", "Broken", "Golden", "Forgotten", "Burning", "Distant", "Endless",
+    "Secret", "Crimson", "Frozen", "Lost", "Quiet", "Wild", "Hollow", "Iron", "Paper", "Glass", "Midnight",
+]
+TITLE_NOUNS = [
+    "River", "Garden", "Empire", "Letter", "Harbor", "Mountain", "Station", "Kingdom", "Library",
+    "Orchard", "Bridge", "Island", "Archive", "Compass", "Lantern", "Forest", "Tower", "Voyage", "Mirror", "City",
+]
+
+LOAN_PERIOD_DAYS = 14
+
+
+class SeedService:
+    """
+    Service that fills the database with realistic synthetic data at scale.
+
+    Generates authors, categories, books, copies, users and a multi-year loan
+    history. Book popularity follows a Zipf-like distribution, popular books get
+    more copies, and a share of the still active loans is overdue. All synthetic
+    users share one precomputed bcrypt hash of SYNTHETIC_PASSWORD, so no hashing
+    happens while seeding. Output is deterministic for a given seed and starting
+    database; new rows get IDs after the current maximum of each table.
+
+    Args:
+        seed (int, optional): Random seed. Default 42.
+        batch_size (int, optional): Rows per insert batch. Default 10000.
+
+    Attributes:
+        rng (random.Random): Seeded random generator.
+        batch_size (int): Rows per insert batch.
+    """
+    SYNTHETIC_PASSWORD = "Password@123"
+    # bcrypt hash (cost 12) of SYNTHETIC_PASSWORD
+    SYNTHETIC_PASSWORD_HASH = "$2b$12$b.TEiJRS2UVZKlAe9IcQEuoLPlUUAjD0RjqsPchHub03k6uShZYTu"
+
+    def __init__(self, seed=42, batch_size=10_000):
+        """
+        Initialize the generator.
+        """
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+
+    def seed(self, loans, users=None, books=None, authors=None, categories=None,
+             years=3, active_ratio=0.1, overdue_ratio=0.2):
+        """
+        Generate and insert a complete synthetic dataset.
+
+        Counts that are not given are derived from the number of loans.
+
+        Args:
+            loans (int): Number of loans to create.
+            users (int, optional): Number of users. Default loans / 20, at least 20.
+            books (int, optional): Number of books. Default loans / 50, at least 50.
+            authors (int, optional): Number of authors. Default books / 5, at least 10.
+            categories (int, optional): Number of categories. Default 25.
+            years (int, optional): Length of the loan history in years. Default 3.
+            active_ratio (float, optional): Share of loans still active. Default 0.1.
+            overdue_ratio (float, optional): Share of active loans that are overdue. Default 0.2.
+
+        Returns:
+            dict: Number of rows inserted per table.
+        """
+        users = users or max(20, loans // 20)
+        books = books or max(50, loans // 50)
+        authors = authors or max(10, books // 5)
+        categories = categories or len(CATEGORY_NAMES)
+
+        category_ids = self._insert_categories(categories)
+        author_ids = self._insert_authors(authors)
+        book_ids = self._insert_books(books, author_ids, category_ids)
+        copy_ids, copy_weights = self._insert_copies(book_ids)
+        user_ids = self._insert_users(users)
+        active_copies = self._insert_loans(loans, copy_ids, copy_weights, user_ids,
+                                           years, active_ratio, overdue_ratio)
+        self._mark_unavailable(active_copies)
+        self._reset_sequences()
+        db.session.commit()
+        # COPY bypasses the session, so its writes are not tracked automatically
+        table_versions.bump(*(model.__tablename__ for model in (Category, Author, Book, BookCopy, User, Loan)))
+
+        return {
+            "categories": len(category_ids),
+            "authors": len(author_ids),
+            "books": len(book_ids),
+            "book_copies": len(copy_ids),
+            "users": len(user_ids),
+            "loans": loans,
+        }
+
+    def _next_id(self, model):
+        """
+        Return the first free primary key of a model's table.
+        """
+        return (db.session.scalar(db.select(db.func.max(model.id))) or 0) + 1
+
+    def _bulk_insert(self, model, rows):
+        """
+        Insert rows in batches: COPY on PostgreSQL, Core executemany elsewhere.
+
+        Args:
+            model (db.Model): Target model class.
+            rows (Iterable[dict]): Column values per row; all rows share the same keys.
+        """
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._write_batch(model, batch)
+                batch = []
+        if batch:
+            self._write_batch(model, batch)
+
+    def _write_batch(self, model, batch):
+        """
+        Write one batch of rows with the fastest path the database offers.
+        """
+        session = db.session
+        if session.get_bind().dialect.name != "postgresql":
+            session.execute(db.insert(model), batch)
+            return
+
+        columns = list(batch[0])
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in batch:
+            writer.writerow([row[c] for c in columns])
+        buf.seek(0)
+
+        preparer = session.get_bind().dialect.identifier_preparer
+        table = preparer.format_table(model.__table__)
+        column_list = ", ".join(preparer.quote(c) for c in columns)
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)", buf)
+        finally:
+            cursor.close()
+
+    def _reset_sequences(self):
+        """
+        Move PostgreSQL id sequences past the explicitly inserted IDs.
+        """
+        session = db.session
+        if session.get_bind().dialect.name != "postgresql":
+            return
+        for model in (Category, Author, Book, BookCopy, User, Loan):
+            table = model.__table__.name
+            session.execute(db.text(
+                f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM \"{table}\"), 1))"
+            ))
+
+    def _insert_categories(self, count):
+        """
+        Insert categories named after common genres.
+        """
+        start = self._next_id(Category)
+        ids = list(range(start, start + count))
+
+        def name(n, i):
+            genre = CATEGORY_NAMES[n % len(CATEGORY_NAMES)]
+            # Plain genre names only on an empty table, so names stay unique
+            return genre if start == 1 and n < len(CATEGORY_NAMES) else f"{genre} #{i}"
+
+        self._bulk_insert(Category, ({"id": i, "name": name(n, i)} for n, i in enumerate(ids)))
+        return ids
+
+    def _insert_authors(self, count):
+        """
+        Insert authors with generated first/last name combinations.
+        """
+        start = self._next_id(Author)
+        ids = list(range(start, start + count))
+        self._bulk_insert(Author, (
+            {"id": i, "name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} #{i}"}
+            for i in ids
+        ))
+        return ids
+
+    def _insert_books(self, count, author_ids, category_ids):
+        """
+        Insert books; a few prolific authors and popular categories get most titles.
+        """
+        start = self._next_id(Book)
+        ids = list(range(start, start + count))
+        author_weights = list(accumulate(1 / (rank + 1) for rank in range(len(author_ids))))
+        category_weights = list(accumulate(1 / (rank + 1) for rank in range(len(category_ids))))
+        picked_authors = self.rng.choices(author_ids, cum_weights=author_weights, k=count)
+        picked_categories = self.rng.choices(category_ids, cum_weights=category_weights, k=count)
+
+        self._bulk_insert(Book, (
+            {
+                "id": i,
+                "title": f"The {self.rng.choice(TITLE_ADJECTIVES)} {self.rng.choice(TITLE_NOUNS)} ({i})",
+                "author_id": author_id,
+                "category_id": category_id,
+            }
+            for i, author_id, category_id in zip(ids, picked_authors, picked_categories)
+        ))
+        return ids
+
+    def _insert_copies(self, book_ids):
+        """
+        Insert 1-5 copies per book, more for popular books.
+
+        Returns:
+            tuple[list[int], list[float]]: Copy IDs and their cumulative popularity weights.
+        """
+        start = self._next_id(BookCopy)
+        copy_ids, copy_books, weights = [], [], []
+        next_id = start
+        for rank, book_id in enumerate(self.rng.sample(book_ids, len(book_ids))):
+            popularity = 1 / (rank + 1) ** 0.8
+            copies = 1 + round(4 * popularity ** 0.3)
+            for _ in range(copies):
+                copy_ids.append(next_id)
+                copy_books.append(book_id)
+                weights.append(popularity / copies)
+                next_id += 1
+
+        self._bulk_insert(BookCopy, (
+            {"id": copy_id, "book_id": book_id, "available": True,
+             "location": f"Floor {copy_id % 3 + 1}, Shelf {copy_id % 250 + 1}"}
+            for copy_id, book_id in zip(copy_ids, copy_books)
+        ))
+        return copy_ids, list(accumulate(weights))
+
+    def _insert_users(self, count):
+        """
+        Insert members plus a few librarians and admins, all with the precomputed hash.
+        """
+        start = self._next_id(User)
+        ids = list(range(start, start + count))
+
+        def role(i):
+            if i % 1000 == 1:
+                return "admin"
+            if i % 100 == 2:
+                return "librarian"
+            return "member"
+
+        self._bulk_insert(User, (
+            {
+                "id": i,
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password": self.SYNTHETIC_PASSWORD_HASH,
+                "role": role(i),
+                "is_active": self.rng.random() > 0.02,
+            }
+            for i in ids
+        ))
+        return ids
+
+    def _insert_loans(self, count, copy_ids, copy_weights, user_ids, years, active_ratio, overdue_ratio):
+        """
+        Insert the loan history: returned loans over `years`, plus active and overdue loans.
+
+        Active loans are spread over distinct copies (one active loan per copy)
+        and cover at most a third of all copies.
+        Popular copies and a heavy tail of frequent borrowers get more loans.
+
+        Returns:
+            list[int]: IDs of copies that now have an active loan.
+        """
+        today = date.today()
+        history_days = max(1, years * 365)
+        # Keep at least two thirds of the copies on the shelf
+        n_active = min(int(count * active_ratio), len(copy_ids) // 3)
+        n_overdue = int(n_active * overdue_ratio)
+
+        user_weights = list(accumulate(1 / (rank + 1) ** 0.5 for rank in range(len(user_ids))))
+        borrowers = self.rng.sample(user_ids, len(user_ids))
+        active_copies = self.rng.sample(copy_ids, n_active)
+
+        def loan(copy_id, loan_date, is_returned):
+            return {
+                "user_id": self.rng.choices(borrowers, cum_weights=user_weights)[0],
+                "book_copy_id": copy_id,
+                "loan_date": loan_date,
+                "return_date": loan_date + timedelta(days=LOAN_PERIOD_DAYS),
+                "is_returned": is_returned,
+            }
+
+        def rows():
+            for n, copy_id in enumerate(active_copies):
+                if n < n_overdue:
+                    days_ago = self.rng.randint(LOAN_PERIOD_DAYS + 1, LOAN_PERIOD_DAYS + 180)
+                else:
+                    days_ago = self.rng.randint(0, LOAN_PERIOD_DAYS)
+                yield loan(copy_id, today - timedelta(days=days_ago), False)
+
+            remaining = count - n_active
+            while remaining > 0:
+                chunk = min(remaining, self.batch_size)
+                for copy_id in self.rng.choices(copy_ids, cum_weights=copy_weights, k=chunk):
+                    days_ago = self.rng.randint(LOAN_PERIOD_DAYS + 1, history_days)
+                    yield loan(copy_id, today - timedelta(days=days_ago), True)
+                remaining -= chunk
+
+        self._bulk_insert(Loan, rows())
+        return active_copies
+
+    def _mark_unavailable(self, copy_ids):
+        """
+        Flag copies with an active loan as unavailable, in batches.
+        """
+        for n in range(0, len(copy_ids), self.batch_size):
+            batch = copy_ids[n:n + self.batch_size]
+            db.session.execute(
+                db.update(BookCopy).where(BookCopy.id.in_(batch)).values(available=False)
+            )
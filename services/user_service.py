@@ -1,7 +1,8 @@
 import re
 from models.user_model import User
 from repositories.user_repository import UserRepository
-from utils.password_utils import hash_password
+from utils.hash_pool import HashPoolBusy
+from utils.password_utils import hash_password, needs_rehash
 from werkzeug.security import check_password_hash  # required for authenticate_user
 
 
@@ -25,42 +26,6 @@ class UserService:
         """
         self.user_repository = user_repository or UserRepository()
 
-    def is_username_unique(self, username, exclude_user_id=None):
-        """
-        Check if username is unique.
-
-        Args:
-            username (str): Username to check.
-            exclude_user_id (int, optional): User ID to exclude from check (for updates).
-
-        Returns:
-            tuple[bool, str | None]: (True, None) if unique, (False, error) if taken.
-        """
-        existing_user = self.user_repository.find_by_username(username)
-        if not existing_user:
-            return True, None
-        if exclude_user_id and existing_user.id == exclude_user_id:
-            return True, None
-        return False, "Username already taken."
-
-    def is_email_unique(self, email, exclude_user_id=None):
-        """
-        Check if email is unique.
-
-        Args:
-            email (str): Email to check.
-            exclude_user_id (int, optional): User ID to exclude from check (for updates).
-
-        Returns:
-            tuple[bool, str | None]: (True, None) if unique, (False, error) if in use.
-        """
-        existing_user = self.user_repository.find_by_email(email)
-        if not existing_user:
-            return True, None
-        if exclude_user_id and existing_user.id == exclude_user_id:
-            return True, None
-        return False, "Email already in use."
-
     @classmethod
     def validate_username(cls, username):
         """
@@ -112,6 +77,9 @@ class UserService:
         """
         Create a new user after validating username, email, and password formats.
 
+        Username and email uniqueness (case-insensitive) is enforced by unique
+        indexes on insert, so a taken value costs no extra lookup.
+
         Args:
             username (str): Desired username (6–16 alphanumeric characters).
             password (str): Password (8–32 characters, must include lowercase, uppercase, digit, and special char).
@@ -132,14 +100,6 @@ class UserService:
         if not valid:
             return None, error
 
-        ok, err = self.is_username_unique(username)
-        if not ok:
-            return None, err
-
-        ok, err = self.is_email_unique(email)
-        if not ok:
-            return None, err
-
         hashed_password = hash_password(password)
         user = User(username=username, password=hashed_password, email=email)
         return self.user_repository.save(user)
@@ -180,6 +140,28 @@ class UserService:
         """
         return self.user_repository.find_by_username(username)
 
+    def upgrade_password_hash(self, user, password):
+        """
+        Rehash a verified password if its stored hash uses another bcrypt cost.
+
+        The upgrade is optional: if the hashing pool refuses the job, it is
+        skipped and retried on the next login instead of failing this one.
+
+        Args:
+            user (User): User whose password was just verified.
+            password (str): The verified plaintext password.
+
+        Returns:
+            bool: True if the stored hash was replaced.
+        """
+        if not needs_rehash(user.password):
+            return False
+        try:
+            new_hash = hash_password(password)
+        except HashPoolBusy:
+            return False
+        return self.user_repository.replace_password_hash(user, user.password, new_hash)
+
     def get_all_users(self):
         """
         Retrieve all users in the system.
@@ -189,6 +171,20 @@ class UserService:
         """
         return self.user_repository.find_all()
 
+    def get_users_page(self, limit, after=None, role=None):
+        """
+        Retrieve one keyset page of users, optionally filtered by role.
+
+        Args:
+            limit (int): Page size.
+            after (int, optional): Cursor from the previous page.
+            role (str, optional): Role filter.
+
+        Returns:
+            tuple[list[User], int | None]: Users and the next cursor.
+        """
+        return self.user_repository.find_page(limit, after, role=role)
+
     def delete_user(self, user_id):
         """
         Delete a user by their ID.
@@ -225,19 +221,13 @@ class UserService:
             valid, error = UserService.validate_username(username)
             if not valid:
                 return None, error
-            ok, err = self.is_username_unique(username, user.id)
-            if not ok:
-                return None, err
             user.username = username
 
         email = data.get('email')
         if email is not None:
-            valid, error = UserService.validate_email(email, user.id)
+            valid, error = UserService.validate_email(email)
             if not valid:
                 return None, error
-            ok, err = self.is_email_unique(email)
-            if not ok:
-                return None, err
             user.email = email
 
         password = data.get('password')
@@ -248,4 +238,9 @@ class UserService:
             user.password = hash_password(password)
 
         updated, error = self.user_repository.update(user)
-        return (updated, None) if updated else (None, "Failed to update user")
+        if updated:
+            return updated, None
+        # Report taken usernames/emails; hide other database errors
+        if error not in ("Username already taken.", "Email already in use."):
+            error = "Failed to update user"
+        return None, error
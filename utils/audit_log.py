@@ -0,0 +1,226 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import has_request_context
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+# Queue item asking the writer to exit after writing everything before it
+_STOP = object()
+
+
+class AuditLog:
+    """
+    Asynchronous, batched writer of the audit_event table.
+
+    `record` only puts the event on a bounded in-process queue, so request
+    threads never wait on audit I/O; if the queue is full the event is
+    dropped and counted instead. A daemon writer thread, started on the first
+    event a process records, collects events until AUDIT_BATCH_SIZE are
+    queued or AUDIT_FLUSH_INTERVAL seconds passed since the first of them,
+    and inserts them with one multi-row INSERT on its own connection. At
+    exit the writer drains the queue, waiting at most AUDIT_SHUTDOWN_TIMEOUT
+    seconds.
+
+    Attributes:
+        enabled (bool): Whether events are recorded.
+        written (int): Events inserted by this process.
+        dropped (int): Events dropped because the queue was full.
+        failed (int): Events lost because their batch could not be inserted.
+    """
+
+    def __init__(self):
+        """
+        Initialize a disabled log; `init_app` sets it up.
+        """
+        self.enabled = False
+        self.batch_size = 0
+        self.flush_interval = 0
+        self.shutdown_timeout = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = None
+        self._engine = None
+        self._table = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Create the queue from the app config and flush it at exit.
+
+        Args:
+            app (Flask): Application whose AUDIT_* config and database are used.
+        """
+        from extensions import db
+        from models.audit_event_model import AuditEvent
+
+        self.enabled = app.config["AUDIT_ENABLED"]
+        self.batch_size = app.config["AUDIT_BATCH_SIZE"]
+        self.flush_interval = app.config["AUDIT_FLUSH_INTERVAL"]
+        self.shutdown_timeout = app.config["AUDIT_SHUTDOWN_TIMEOUT"]
+        self._queue = queue.Queue(maxsize=app.config["AUDIT_QUEUE_SIZE"])
+        self._table = AuditEvent.__table__
+        with app.app_context():
+            self._engine = db.engine
+        atexit.register(self.stop)
+
+    @property
+    def queued(self):
+        """
+        Number of events waiting to be written.
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def record(self, event_type, user_id=None, entity=None, entity_id=None, **details):
+        """
+        Queue an audit event without blocking.
+
+        The authenticated user of the current request, if any, is recorded as
+        the actor.
+
+        Args:
+            event_type (str): What happened, e.g. 'login' or 'catalog_update'.
+            user_id (int, optional): User the event concerns.
+            entity (str, optional): Kind of object affected, e.g. 'loan'.
+            entity_id (int, optional): ID of the object affected.
+            **details: Further JSON-serializable event data.
+        """
+        if not self.enabled:
+            return
+        self._ensure_started()
+        event = {
+            "event_type": event_type,
+            "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+            "actor_id": _current_actor(),
+            "user_id": user_id,
+            "entity": entity,
+            "entity_id": entity_id,
+            "details": details or None,
+        }
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def flush(self, timeout=None):
+        """
+        Wait until every event queued so far is written.
+
+        Args:
+            timeout (float, optional): Seconds to wait at most.
+
+        Returns:
+            bool: True if the events were written within the timeout.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue is None or self._queue.empty()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self):
+        """
+        Write the queued events and stop the writer thread.
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(_STOP, timeout=self.shutdown_timeout)
+        except queue.Full:
+            logging.warning(f"Audit log: queue still full at exit, {self.queued} events lost")
+            return
+        thread.join(self.shutdown_timeout)
+
+    def _ensure_started(self):
+        """
+        Start the writer thread unless it already runs in this process.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        """
+        Write batches until a stop request is dequeued.
+        """
+        while True:
+            batch, waiters, stop = self._next_batch()
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _next_batch(self):
+        """
+        Collect the next batch, blocking until at least one item is queued.
+
+        Returns:
+            tuple[list[dict], list[threading.Event], bool]: Events to write,
+                flush waiters to notify afterwards and whether to stop.
+        """
+        batch = []
+        waiters = []
+        item = self._queue.get()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if item is _STOP:
+                return batch, waiters, True
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                return batch, waiters, False
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.batch_size or remaining <= 0:
+                return batch, waiters, False
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return batch, waiters, False
+
+    def _write(self, batch):
+        """
+        Insert one batch of events in a single transaction.
+        """
+        try:
+            with self._engine.begin() as connection:
+                connection.execute(self._table.insert(), batch)
+            self.written += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            logging.exception(f"Audit log: failed to write {len(batch)} events")
+
+
+def _current_actor():
+    """
+    Return the user ID of the current request's valid JWT, None without one.
+    """
+    if not has_request_context():
+        return None
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        # The route did not verify a token; use one the client sent anyway
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            return None
+    return int(identity) if identity is not None and str(identity).isdigit() else None
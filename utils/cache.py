@@ -0,0 +1,320 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+
+class CacheRegion:
+    """
+    One bounded, expiring cache region (e.g. all cached authors).
+
+    Entries live in an OrderedDict kept in least-recently-used order: a hit
+    moves the entry to the end and, once `max_items` is exceeded, the entry
+    at the front is evicted, so both are O(1). Every entry also carries its
+    expiry and is dropped when found expired. All access is under one lock,
+    and hits and misses are counted. List entries are keyed by a generation
+    number, so all of them can be invalidated at once by bumping it.
+
+    Args:
+        ttl (int): Seconds an entry stays valid; 0 or less disables the region.
+        max_items (int): Maximum number of entries kept.
+
+    Attributes:
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that went to the loader.
+        version (str or None): Table version stamp the entries were loaded under.
+    """
+
+    def __init__(self, ttl, max_items):
+        """
+        Initialize an empty region.
+        """
+        self.enabled = ttl > 0
+        self.ttl = ttl
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self._generation = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for `key`, calling `loader` on a miss.
+
+        None results are not cached, and neither are results loaded while an
+        invalidation happened, since they may predate the write.
+
+        Args:
+            key (str): Cache key.
+            loader (callable): Zero-argument function producing the value.
+
+        Returns:
+            Any: Cached or freshly loaded value.
+        """
+        if not self.enabled:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = (time.monotonic() + self.ttl, value)
+                    self._entries.move_to_end(key)
+                    if len(self._entries) > self.max_items:
+                        self._entries.popitem(last=False)
+        return value
+
+    def list_key(self, *parts):
+        """
+        Build a key for a list entry in the current generation.
+
+        Args:
+            *parts: Values identifying the list (e.g. limit and cursor).
+
+        Returns:
+            str: Cache key.
+        """
+        return ":".join(["list", str(self._generation), *map(str, parts)])
+
+    def invalidate(self, key=None):
+        """
+        Drop one entry and all list entries of the region.
+
+        Args:
+            key (str, optional): Key of a single entry to drop.
+        """
+        with self._lock:
+            if key is not None:
+                self._entries.pop(key, None)
+            self._generation += 1
+
+    def sync_version(self, version):
+        """
+        Drop every entry if the table changed since they were loaded.
+
+        Args:
+            version (str): Current version stamp of the region's table.
+        """
+        if version == self.version:
+            return
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self._generation += 1
+                self.version = version
+
+    def clear(self):
+        """
+        Drop every entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return the hit/miss counters of the region.
+
+        Returns:
+            dict: {"hits": int, "misses": int, "hit_rate": float}
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class CatalogCache:
+    """
+    Read-through cache for catalog lookups, split into per-entity regions.
+
+    Regions are created from the CACHE_REGIONS config in `init_app`; until then
+    (or for unknown entities) lookups go straight to the database. Each region
+    is named after its table; when the table's version stamp changes (a write
+    committed by any process), the region is emptied, so entries never outlive
+    a write made by another worker.
+    """
+
+    def __init__(self):
+        """
+        Initialize without regions.
+        """
+        self.regions = {}
+        self._versions = None
+
+    def init_app(self, app):
+        """
+        Create one region per entity from app config.
+
+        Args:
+            app (Flask): Application whose CACHE_REGIONS config is used.
+        """
+        from extensions import table_versions
+
+        self._versions = table_versions
+        self.regions = {
+            name: CacheRegion(settings["ttl"], settings["max_items"])
+            for name, settings in app.config["CACHE_REGIONS"].items()
+        }
+
+    def region(self, name):
+        """
+        Return the region for an entity, or None if it is not cached.
+
+        Args:
+            name (str): Entity name (e.g. "author").
+
+        Returns:
+            CacheRegion or None: Configured region.
+        """
+        region = self.regions.get(name)
+        if region is None or not region.enabled:
+            return None
+        if self._versions is not None:
+            region.sync_version(self._versions.get(name))
+        return region
+
+    def get_instance(self, name, session, model, key, loader):
+        """
+        Read-through lookup of a single model instance.
+
+        Args:
+            name (str): Region (entity) name.
+            session (Session): Session the returned instance is attached to.
+            model (type): Model class.
+            key (str): Cache key within the region.
+            loader (callable): Loads the instance from the database on a miss.
+
+        Returns:
+            db.Model or None: Instance attached to `session`.
+        """
+        region = self.region(name)
+        if region is None:
+            return loader()
+        row = region.get_or_load(key, lambda: to_cache_row(loader()))
+        return from_cache_row(session, model, row)
+
+    def get_instances(self, name, session, model, key_parts, loader):
+        """
+        Read-through lookup of a list of model instances.
+
+        Args:
+            name (str): Region (entity) name.
+            session (Session): Session the returned instances are attached to.
+            model (type): Model class.
+            key_parts (tuple): Values identifying the list.
+            loader (callable): Loads the list from the database on a miss.
+
+        Returns:
+            list[db.Model]: Instances attached to `session`.
+        """
+        region = self.region(name)
+        if region is None:
+            return loader()
+        rows = region.get_or_load(
+            region.list_key(*key_parts),
+            lambda: [to_cache_row(instance) for instance in loader()]
+        )
+        return [from_cache_row(session, model, row) for row in rows]
+
+    def get_page(self, name, session, model, key_parts, loader):
+        """
+        Read-through lookup of one keyset page of model instances.
+
+        Args:
+            name (str): Region (entity) name.
+            session (Session): Session the returned instances are attached to.
+            model (type): Model class.
+            key_parts (tuple): Values identifying the page (e.g. limit and cursor).
+            loader (callable): Loads (items, next_cursor) from the database on a miss.
+
+        Returns:
+            tuple[list[db.Model], int | None]: Instances attached to `session` and the next cursor.
+        """
+        region = self.region(name)
+        if region is None:
+            return loader()
+
+        def load_rows():
+            items, next_cursor = loader()
+            return [to_cache_row(instance) for instance in items], next_cursor
+
+        rows, next_cursor = region.get_or_load(region.list_key("page", *key_parts), load_rows)
+        return [from_cache_row(session, model, row) for row in rows], next_cursor
+
+    def invalidate(self, name, key=None):
+        """
+        Drop one entry and all list entries of an entity's region.
+
+        Args:
+            name (str): Region (entity) name.
+            key (str, optional): Key of a single entry to drop.
+        """
+        region = self.regions.get(name)
+        if region is not None:
+            region.invalidate(key)
+
+    def stats(self):
+        """
+        Return hit/miss counters of every region.
+
+        Returns:
+            dict: {entity: {"hits": int, "misses": int, "hit_rate": float}}
+        """
+        return {name: region.stats() for name, region in self.regions.items()}
+
+
+def to_cache_row(instance):
+    """
+    Convert a model instance into a plain dict of its column values.
+
+    Args:
+        instance (db.Model): Loaded model instance.
+
+    Returns:
+        dict or None: Column values, None if instance is None.
+    """
+    if instance is None:
+        return None
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+
+
+def from_cache_row(session, model, row):
+    """
+    Attach a cached row to the session as a persistent instance without a query.
+
+    The row is turned into a detached instance and merged with `load=False`,
+    so the result behaves like a normally loaded object (updates, deletes and
+    lazy relationships work) but no SELECT is emitted.
+
+    Args:
+        session (Session): Session to attach the instance to.
+        model (type): Model class of the row.
+        row (dict): Column values from `to_cache_row`.
+
+    Returns:
+        db.Model or None: Persistent instance, None if row is None.
+    """
+    if row is None:
+        return None
+    instance = model(**row)
+    make_transient_to_detached(instance)
+    return session.merge(instance, load=False)
@@ -0,0 +1,44 @@
+from sqlalchemy.exc import IntegrityError
+
+
+def is_unique_violation(error):
+    """
+    Check whether a database error was raised by a unique constraint or index.
+
+    Args:
+        error (Exception): Exception raised by a flush or commit.
+
+    Returns:
+        bool: True for unique violations on PostgreSQL and SQLite, False otherwise
+            (e.g. foreign key or NOT NULL violations).
+    """
+    if not isinstance(error, IntegrityError):
+        return False
+    orig = error.orig
+    if getattr(orig, 'pgcode', None) == '23505':
+        return True
+    return 'UNIQUE constraint failed' in str(orig)
+
+
+def violated_constraint(error):
+    """
+    Identify the constraint or index a database error was raised by.
+
+    Uses the driver's diagnostics where available (psycopg), else the first
+    line of the error message, which names the constraint on PostgreSQL
+    ('... unique constraint "uq_user_email_lower"') and the index or columns
+    on SQLite ("UNIQUE constraint failed: index 'uq_user_email_lower'" or
+    "UNIQUE constraint failed: user.email"). Later lines, such as PostgreSQL's
+    DETAIL with the conflicting values, are ignored.
+
+    Args:
+        error (IntegrityError): Exception raised by a flush or commit.
+
+    Returns:
+        str: Constraint name, or the text naming it.
+    """
+    orig = getattr(error, 'orig', error)
+    name = getattr(getattr(orig, 'diag', None), 'constraint_name', None)
+    if name:
+        return name
+    return str(orig).split('\n', 1)[0]
@@ -0,0 +1,60 @@
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+
+
+def conditional_get(*tables, include_tables=None):
+    """
+    Decorator adding strong ETags derived from table versions to a GET route.
+
+    The ETag hashes the request path and query string with the version stamps
+    of the tables the response is built from. If the client's If-None-Match
+    matches, the route is not called at all and a 304 is returned, so an
+    unchanged poll costs neither a query nor serialization. Versions are read
+    before the route runs, so a write racing with the request can only make
+    the ETag older than the body, never newer.
+
+    Args:
+        *tables (str): Tables the response always depends on.
+        include_tables (dict[str, tuple[str, ...]], optional): Extra tables per
+            `?include=` name, for routes that embed related objects.
+
+    Returns:
+        function: Decorator for a Flask view function.
+    """
+    def decorator(fn):
+        """
+        Wrap a view function with conditional GET handling.
+
+        Args:
+            fn (function): The route function to be decorated.
+
+        Returns:
+            function: Wrapped function answering matching requests with 304.
+        """
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            """
+            Return 304 if the client's copy is current, else the route's response with an ETag.
+            """
+            from extensions import table_versions
+
+            names = set(tables)
+            if include_tables:
+                for name in request.args.get('include', '').split(','):
+                    names.update(include_tables.get(name.strip(), ()))
+            versions = table_versions.get_many(sorted(names))
+            etag = hashlib.sha1("\n".join([request.full_path, *versions]).encode()).hexdigest()
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
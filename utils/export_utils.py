@@ -1,51 +1,150 @@
-from io import BytesIO
-import pandas as pd
-from sqlalchemy.inspection import inspect
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime
 
+import xlsxwriter
+from sqlalchemy import select
 
-def rows_to_dataframe(rows):
+from extensions import db
+
+
+def iter_table_rows(model, batch_size=1000):
     """
-    Convert SQLAlchemy rows to a pandas DataFrame by reflecting columns.
+    Stream the column values of every row of a model's table in batches.
+
+    Selects plain column tuples (no ORM objects, no identity map) and fetches
+    them with `yield_per`, which uses a server-side cursor where the driver
+    supports it. Only one batch is held in memory at a time.
+
+    Args:
+        model (db.Model): SQLAlchemy model class whose table is exported.
+        batch_size (int): Number of rows fetched per round trip.
 
-    Dynamically inspects SQLAlchemy model instances to extract column names
-    and values, creating a DataFrame with only the database columns (ignores
-    relationships and other non-column attributes).
+    Yields:
+        list[tuple]: Batches of row tuples ordered by primary key, in column order.
+    """
+    table = model.__table__
+    stmt = (
+        select(*table.columns)
+        .order_by(*table.primary_key.columns)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.session.execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def column_names(model):
+    """
+    Return the database column names of a model's table, in table order.
 
     Args:
-        rows (list): List of SQLAlchemy model instances (e.g., [User, User, ...]).
+        model (db.Model): SQLAlchemy model class.
 
     Returns:
-        pd.DataFrame: DataFrame with columns matching the SQLAlchemy model's
-                     database columns. Returns empty DataFrame if no rows provided.
+        list[str]: Column names.
     """
-    if not rows:
-        return pd.DataFrame()
-    mapper = inspect(rows[0]).mapper
-    cols = [c.key for c in mapper.columns]
-    data = [{c: getattr(r, c) for c in cols} for r in rows]
-    return pd.DataFrame(data, columns=cols)
+    return [c.name for c in model.__table__.columns]
 
 
-def make_xlsx_bytes(sheets: dict[str, pd.DataFrame]) -> BytesIO:
+def _json_default(value):
     """
-    Build an in-memory Excel (.xlsx) file with one or more sheets.
+    JSON fallback serializer for date and datetime values.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
-    Creates an Excel workbook in memory from a dictionary of sheet names and
-    DataFrames. Handles empty DataFrames by inserting a placeholder message.
-    Truncates sheet names to Excel's 31-character limit.
+def iter_csv(model, batch_size=1000):
+    """
+    Stream a model's table as CSV text, one chunk per fetched batch.
 
     Args:
-        sheets (dict[str, pd.DataFrame]): Dictionary mapping sheet names to DataFrames.
-                                        Example: {"users": user_df, "books": book_df}
+        model (db.Model): SQLAlchemy model class to export.
+        batch_size (int): Number of rows per database fetch and per yielded chunk.
+
+    Yields:
+        str: CSV header line, then one chunk of CSV lines per batch.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(column_names(model))
+    yield buf.getvalue()
+
+    for batch in iter_table_rows(model, batch_size):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(batch)
+        yield buf.getvalue()
+
+
+def iter_ndjson(model, batch_size=1000):
+    """
+    Stream a model's table as newline-delimited JSON, one object per row.
+
+    Args:
+        model (db.Model): SQLAlchemy model class to export.
+        batch_size (int): Number of rows per database fetch and per yielded chunk.
+
+    Yields:
+        str: One chunk of NDJSON lines per batch.
+    """
+    cols = column_names(model)
+    for batch in iter_table_rows(model, batch_size):
+        yield "".join(
+            json.dumps(dict(zip(cols, row)), default=_json_default) + "\n"
+            for row in batch
+        )
+
+
+def write_xlsx_streaming(sheets, batch_size=1000):
+    """
+    Write one or more tables to an .xlsx temp file using constant memory.
+
+    Uses xlsxwriter's `constant_memory` mode, which flushes each row to disk
+    as soon as the next one starts, so memory stays bounded regardless of the
+    number of rows. The workbook is assembled in an anonymous temp file that
+    is deleted when closed.
+
+    Args:
+        sheets (dict[str, db.Model]): Sheet name -> model class whose table fills the sheet.
+        batch_size (int): Number of rows per database fetch.
 
     Returns:
-        BytesIO: In-memory Excel file as bytes stream, ready for download or further processing.
-    """
-    buf = BytesIO()
-    with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
-        for sheet_name, df in sheets.items():
-            # Excel sheet names max 31 chars
-            safe = (sheet_name or "Sheet")[:31]
-            (df if not df.empty else pd.DataFrame({"info": ["(no rows)"]})).to_excel(writer, index=False, sheet_name=safe)
-    buf.seek(0)
-    return buf
+        file: Temp file positioned at the start of the finished workbook.
+    """
+    out = tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(out, {"constant_memory": True})
+    header_fmt = workbook.add_format({"bold": True})
+    date_fmt = workbook.add_format({"num_format": "yyyy-mm-dd"})
+    datetime_fmt = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+
+    for sheet_name, model in sheets.items():
+        # Excel sheet names max 31 chars
+        worksheet = workbook.add_worksheet((sheet_name or "Sheet")[:31])
+        worksheet.write_row(0, 0, column_names(model), header_fmt)
+
+        row_idx = 0
+        for batch in iter_table_rows(model, batch_size):
+            for row in batch:
+                row_idx += 1
+                for col_idx, value in enumerate(row):
+                    if isinstance(value, datetime):
+                        worksheet.write_datetime(row_idx, col_idx, value, datetime_fmt)
+                    elif isinstance(value, date):
+                        worksheet.write_datetime(row_idx, col_idx, value, date_fmt)
+                    else:
+                        worksheet.write(row_idx, col_idx, value)
+
+        if row_idx == 0:
+            worksheet.write(1, 0, "(no rows)")
+
+    workbook.close()
+    out.seek(0)
+    return out
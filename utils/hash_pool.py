@@ -0,0 +1,133 @@
+import atexit
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import ServiceUnavailable
+
+
+class HashPoolBusy(ServiceUnavailable):
+    """
+    Raised when a password hash or verification is refused by the hashing pool.
+
+    Answered as 503 with a Retry-After header by the global error handler.
+    """
+    description = "Password hashing is at capacity, please retry shortly"
+
+
+class HashPool:
+    """
+    Size-limited executor for bcrypt work with admission control.
+
+    bcrypt releases the GIL, so a few worker threads use a few cores while the
+    request threads only wait for their result. At most HASH_POOL_WORKERS jobs
+    run and HASH_POOL_MAX_QUEUE more wait; further jobs are refused at once
+    instead of piling up, so a login storm cannot tie up every request thread
+    and starve cheap reads. A job is also refused at submission when the
+    expected wait, the number of jobs ahead of it per worker times the
+    average job duration, exceeds HASH_POOL_MAX_WAIT seconds; a job that
+    still waited longer than that is refused when it reaches a worker,
+    since its client has likely given up.
+
+    Attributes:
+        workers (int): Number of worker threads, 0 runs jobs on the calling thread.
+        max_queue (int): Jobs allowed to wait for a worker.
+        max_wait (float): Seconds a job may wait before it is refused, 0 waits forever.
+        avg_duration (float): Moving average of the job run time in seconds.
+    """
+
+    # Weight of the latest job in the average run time
+    DURATION_SMOOTHING = 0.2
+
+    def __init__(self):
+        """
+        Initialize without an executor; jobs run inline until `init_app`.
+        """
+        self.workers = 0
+        self.max_queue = 0
+        self.max_wait = 0
+        self.avg_duration = 0.0
+        self._executor = None
+        self._slots = None
+        self._admitted = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Create the executor from the app config.
+
+        Worker threads are started on first use, so a pre-fork master process
+        that never hashes does not hand threads to its children.
+
+        Args:
+            app (Flask): Application whose HASH_POOL_* config is used.
+        """
+        self.workers = app.config["HASH_POOL_WORKERS"]
+        self.max_queue = app.config["HASH_POOL_MAX_QUEUE"]
+        self.max_wait = app.config["HASH_POOL_MAX_WAIT"]
+        if self.workers <= 0:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hash-pool")
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        atexit.register(self._executor.shutdown, wait=False, cancel_futures=True)
+
+    @property
+    def admitted(self):
+        """
+        Number of jobs currently running or waiting in the pool.
+        """
+        return self._admitted
+
+    def run(self, func, *args):
+        """
+        Run `func(*args)` on a pool worker and return its result.
+
+        Args:
+            func (callable): bcrypt operation to run.
+            *args: Arguments of `func`.
+
+        Returns:
+            Any: Result of `func`.
+
+        Raises:
+            HashPoolBusy: If the queue is full, the expected wait exceeds
+                max_wait or the job waited longer than max_wait.
+        """
+        from extensions import metrics
+
+        if self._executor is None:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            metrics.count_hash_rejected("queue_full")
+            raise HashPoolBusy(retry_after=1)
+
+        with self._lock:
+            ahead = self._admitted - self.workers + 1
+            self._admitted += 1
+        try:
+            if self.max_wait and ahead > 0 and ahead / self.workers * self.avg_duration > self.max_wait:
+                metrics.count_hash_rejected("wait_timeout")
+                raise HashPoolBusy(retry_after=1)
+            return self._executor.submit(self._run_job, func, args, time.perf_counter()).result()
+        finally:
+            with self._lock:
+                self._admitted -= 1
+            self._slots.release()
+
+    def _run_job(self, func, args, enqueued):
+        """
+        Record the queue wait of a job and run it unless it waited too long.
+        """
+        from extensions import metrics
+
+        waited = time.perf_counter() - enqueued
+        metrics.observe_hash_wait(waited)
+        if self.max_wait and waited > self.max_wait:
+            metrics.count_hash_rejected("wait_timeout")
+            raise HashPoolBusy(retry_after=1)
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            duration = time.perf_counter() - started
+            self.avg_duration += self.DURATION_SMOOTHING * (duration - self.avg_duration)
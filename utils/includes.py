@@ -0,0 +1,91 @@
+from flask import request
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def parse_include_arg(aliases):
+    """
+    Read the `include` query parameter and map it to relationship paths.
+
+    `include` is a comma-separated list of names the endpoint allows, e.g.
+    `?include=author,category,copies`. Each name maps to a dotted relationship
+    path from the endpoint's model, e.g. 'author' -> 'book.author' for copies.
+
+    Args:
+        aliases (dict[str, str]): Allowed include names and their relationship paths.
+
+    Returns:
+        tuple[tuple[str, ...] | None, str | None]: (paths, None) on success
+            or (None, error_message) on unknown names.
+    """
+    names = [name.strip() for name in request.args.get('include', '').split(',') if name.strip()]
+    unknown = sorted(set(names) - set(aliases))
+    if unknown:
+        return None, f"Unknown include: {', '.join(unknown)} (allowed: {', '.join(aliases)})"
+    return tuple(dict.fromkeys(aliases[name] for name in names)), None
+
+
+def loader_options(model, paths):
+    """
+    Build eager loading options for relationship paths.
+
+    Many-to-one relationships are joined into the main query, collections are
+    loaded with one extra `SELECT ... IN` query each, so a page costs a fixed
+    number of queries however many rows it has.
+
+    Args:
+        model (type): Mapped class the paths start from.
+        paths (Iterable[str]): Dotted relationship paths, e.g. 'book_copy.book.author'.
+
+    Returns:
+        list: Loader options for `Select.options()` or `Session.get()`.
+    """
+    options = []
+    for path in paths:
+        option = None
+        current = model
+        for name in path.split('.'):
+            attribute = getattr(current, name)
+            loader = 'selectinload' if attribute.property.uselist else 'joinedload'
+            if option is None:
+                option = (selectinload if loader == 'selectinload' else joinedload)(attribute)
+            else:
+                option = getattr(option, loader)(attribute)
+            current = attribute.property.mapper.class_
+        options.append(option)
+    return options
+
+
+def embed_includes(obj, data, paths):
+    """
+    Add the related objects named by relationship paths to a JSON dictionary.
+
+    Args:
+        obj (Model): Instance the paths start from.
+        data (dict): The instance's own JSON fields.
+        paths (Iterable[str]): Dotted relationship paths to embed.
+
+    Returns:
+        dict: `data` with one key per first path segment holding the related
+            object's JSON (a list for collections, None if missing).
+    """
+    nested = {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        nested.setdefault(name, [])
+        if rest:
+            nested[name].append(rest)
+
+    for name, children in nested.items():
+        value = getattr(obj, name)
+        if isinstance(value, list):
+            data[name] = [_to_json(item, children) for item in value]
+        else:
+            data[name] = _to_json(value, children) if value is not None else None
+    return data
+
+
+def _to_json(obj, paths):
+    """
+    Serialize a related object, passing nested paths on if there are any.
+    """
+    return obj.json(paths) if paths else obj.json()
@@ -0,0 +1,90 @@
+import threading
+import time
+from datetime import date
+
+
+class LoanStatsCache:
+    """
+    Process-local cache of loan totals with write-through updates.
+
+    Holds the result of the loan statistics query for a limited time. Checkouts
+    and returns adjust the cached counters in place instead of discarding them,
+    so the stats endpoint stays O(1) under write traffic. Entries also expire at
+    the end of the day because the overdue count depends on the current date.
+
+    Each worker process keeps its own copy; the TTL bounds how stale a worker's
+    view of writes made by other processes can get.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty cache.
+        """
+        self._lock = threading.Lock()
+        self._stats = None
+        self._day = None
+        self._expires_at = 0.0
+
+    def get(self):
+        """
+        Return a copy of the cached stats if they are still valid.
+
+        Returns:
+            dict or None: Cached loan totals, None if missing or expired.
+        """
+        with self._lock:
+            if self._stats is None:
+                return None
+            if time.monotonic() >= self._expires_at or self._day != date.today():
+                self._stats = None
+                return None
+            return dict(self._stats)
+
+    def set(self, stats, ttl):
+        """
+        Store freshly computed stats for `ttl` seconds.
+
+        Args:
+            stats (dict): Loan totals as returned by the statistics query.
+            ttl (float): Time to live in seconds.
+        """
+        with self._lock:
+            self._stats = dict(stats)
+            self._day = date.today()
+            self._expires_at = time.monotonic() + ttl
+
+    def record_checkout(self, count=1):
+        """
+        Apply new loans to the cached counters.
+
+        Args:
+            count (int, optional): Number of loans created. Default 1.
+        """
+        with self._lock:
+            if self._stats is not None:
+                self._stats['total_loans'] += count
+                self._stats['not_returned_loans'] += count
+
+    def record_return(self, count=1, overdue=0):
+        """
+        Apply returned loans to the cached counters.
+
+        Args:
+            count (int, optional): Number of loans returned. Default 1.
+            overdue (int, optional): How many of them were overdue. Default 0.
+        """
+        with self._lock:
+            if self._stats is not None:
+                self._stats['returned_loans'] += count
+                self._stats['not_returned_loans'] -= count
+                self._stats['overdue_loans'] -= overdue
+
+    def clear(self):
+        """
+        Drop the cached stats.
+        """
+        with self._lock:
+            self._stats = None
+
+
+loan_stats_cache = LoanStatsCache()
@@ -0,0 +1,480 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BCRYPT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Family name -> (type, help), in exposition order
+FAMILIES = {
+    "library_http_requests_total": ("counter", "HTTP requests by route, method and status."),
+    "library_http_request_duration_seconds": ("histogram", "HTTP request latency by route and method."),
+    "library_http_requests_in_flight": ("gauge", "HTTP requests currently being served."),
+    "library_db_pool_checked_out": ("gauge", "Database connections checked out of the pool."),
+    "library_db_pool_overflow": ("gauge", "Database connections open beyond the pool size."),
+    "library_cache_hits_total": ("counter", "Catalog cache hits by region."),
+    "library_cache_misses_total": ("counter", "Catalog cache misses by region."),
+    "library_cache_hit_ratio": ("gauge", "Catalog cache hit ratio by region."),
+    "library_bcrypt_verify_duration_seconds": ("histogram", "Time spent verifying bcrypt password hashes."),
+    "library_bcrypt_hash_duration_seconds": ("histogram", "Time spent creating bcrypt password hashes."),
+    "library_hash_pool_queue_wait_seconds": ("histogram", "Time bcrypt jobs waited for a hashing pool worker."),
+    "library_hash_pool_rejected_total": ("counter", "bcrypt jobs refused by the hashing pool by reason."),
+    "library_hash_pool_admitted": ("gauge", "bcrypt jobs running or waiting in the hashing pool."),
+    "library_audit_events_total": ("counter", "Audit events by outcome (written, dropped, failed)."),
+    "library_audit_queue_depth": ("gauge", "Audit events waiting to be written."),
+}
+
+
+class _Shard:
+    """
+    Metric values written by a single thread.
+
+    Only the owning thread writes, so updates need no lock; readers copy the
+    containers (atomic under the GIL) before iterating.
+    """
+
+    def __init__(self):
+        self.requests = {}
+        self.latency = {}
+        self.bcrypt = [0] * (len(BCRYPT_BUCKETS) + 1)
+        self.bcrypt_sum = 0.0
+        self.bcrypt_hash = [0] * (len(BCRYPT_BUCKETS) + 1)
+        self.bcrypt_hash_sum = 0.0
+        self.hash_wait = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.hash_wait_sum = 0.0
+        self.hash_rejected = {}
+        self.started = 0
+        self.finished = 0
+
+    def absorb(self, other):
+        """
+        Add the values of another shard to this one.
+
+        Args:
+            other (_Shard): Shard whose owning thread has exited.
+        """
+        for key, count in other.requests.items():
+            self.requests[key] = self.requests.get(key, 0) + count
+        for key, buckets in other.latency.items():
+            own = self.latency.get(key)
+            self.latency[key] = list(buckets) if own is None else [a + b for a, b in zip(own, buckets)]
+        for reason, count in other.hash_rejected.items():
+            self.hash_rejected[reason] = self.hash_rejected.get(reason, 0) + count
+        self.bcrypt = [a + b for a, b in zip(self.bcrypt, other.bcrypt)]
+        self.bcrypt_sum += other.bcrypt_sum
+        self.bcrypt_hash = [a + b for a, b in zip(self.bcrypt_hash, other.bcrypt_hash)]
+        self.bcrypt_hash_sum += other.bcrypt_hash_sum
+        self.hash_wait = [a + b for a, b in zip(self.hash_wait, other.hash_wait)]
+        self.hash_wait_sum += other.hash_wait_sum
+        self.started += other.started
+        self.finished += other.finished
+
+
+class MetricsCollector:
+    """
+    Lock-light Prometheus metrics for the app, aggregated across worker processes.
+
+    Each thread records into its own shard; shards are only summed when the
+    metrics are scraped. Shards of exited threads (e.g. the thread-per-request
+    development server) are folded into one retired shard whenever a thread
+    registers a shard or the metrics are collected, so their number stays
+    bounded by the live threads. With METRICS_MULTIPROC_DIR set, every process
+    also writes a snapshot of its totals to `<dir>/metrics_<pid>.json` at most
+    every METRICS_FLUSH_INTERVAL seconds (and at exit), and a scrape merges the
+    snapshots of all processes. Counters of exited processes are kept, their
+    gauges are dropped; a process that reuses an exited one's pid takes over
+    that file's counters before replacing it.
+
+    Attributes:
+        multiproc_dir (str or None): Directory shared by all worker processes.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty, per-process collector.
+        """
+        self.multiproc_dir = None
+        self.flush_interval = 0
+        self._engine = None
+        self._cache = None
+        self._hash_pool = None
+        self._audit_log = None
+        self._shards = []
+        self._retired = _Shard()
+        self._shards_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._local = threading.local()
+        self._last_flush = 0.0
+        self._inherited = {}
+        self._inherited_pid = None
+
+    def init_app(self, app):
+        """
+        Install request hooks and remember the sources of the pool and cache metrics.
+
+        Args:
+            app (Flask): Application to instrument.
+        """
+        from extensions import db, catalog_cache, hash_pool, audit_log
+
+        self.multiproc_dir = app.config["METRICS_MULTIPROC_DIR"] or None
+        self.flush_interval = app.config["METRICS_FLUSH_INTERVAL"]
+        with app.app_context():
+            self._engine = db.engine
+        self._cache = catalog_cache
+        self._hash_pool = hash_pool
+        self._audit_log = audit_log
+
+        if self.multiproc_dir:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            atexit.register(self.flush)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+
+    def _shard(self):
+        """
+        Return the calling thread's shard, registering it on first use.
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead_shards(self):
+        """
+        Fold the shards of exited threads into the retired shard.
+
+        Must be called with `_shards_lock` held. A dead thread no longer
+        writes its shard, so it can be read without racing.
+        """
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._retired.absorb(shard)
+        self._shards = live
+
+    def observe_bcrypt(self, seconds):
+        """
+        Record the duration of one bcrypt verification.
+
+        Args:
+            seconds (float): Time spent in the verification.
+        """
+        shard = self._shard()
+        shard.bcrypt[bisect_left(BCRYPT_BUCKETS, seconds)] += 1
+        shard.bcrypt_sum += seconds
+
+    def observe_bcrypt_hash(self, seconds):
+        """
+        Record the duration of creating one bcrypt hash.
+
+        Args:
+            seconds (float): Time spent hashing.
+        """
+        shard = self._shard()
+        shard.bcrypt_hash[bisect_left(BCRYPT_BUCKETS, seconds)] += 1
+        shard.bcrypt_hash_sum += seconds
+
+    def observe_hash_wait(self, seconds):
+        """
+        Record how long one bcrypt job waited for a hashing pool worker.
+
+        Args:
+            seconds (float): Time between submission and start of the job.
+        """
+        shard = self._shard()
+        shard.hash_wait[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        shard.hash_wait_sum += seconds
+
+    def count_hash_rejected(self, reason):
+        """
+        Count one bcrypt job refused by the hashing pool.
+
+        Args:
+            reason (str): "queue_full" or "wait_timeout".
+        """
+        shard = self._shard()
+        shard.hash_rejected[reason] = shard.hash_rejected.get(reason, 0) + 1
+
+    def _start_request(self):
+        """
+        Count the request as in flight and start its timer.
+        """
+        self._shard().started += 1
+        g.metrics_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        """
+        Record the request's status and latency.
+        """
+        started = g.get("metrics_started")
+        if started is None:
+            return response
+
+        elapsed = time.perf_counter() - started
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        route = (request.blueprint or "", rule, request.method)
+        shard = self._shard()
+
+        key = route + (str(response.status_code),)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        buckets = shard.latency.get(route)
+        if buckets is None:
+            buckets = shard.latency[route] = [0] * (len(LATENCY_BUCKETS) + 2)
+        buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        buckets[-1] += elapsed
+
+        if self.multiproc_dir and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return response
+
+    def _teardown_request(self, exc):
+        """
+        Mark the request as no longer in flight.
+        """
+        if g.pop("metrics_started", None) is not None:
+            self._shard().finished += 1
+
+    def collect(self):
+        """
+        Sum all shards of this process into samples.
+
+        Returns:
+            dict: {"counters": [[name, labels, value], ...], "gauges": [...]}, where
+                labels is a list of [label, value] pairs.
+        """
+        with self._shards_lock:
+            self._retire_dead_shards()
+            shards = [shard for _, shard in self._shards]
+            retired = _Shard()
+            retired.absorb(self._retired)
+        shards.append(retired)
+
+        counters = {}
+        gauges = {}
+
+        def add(target, name, labels, value):
+            key = (name, tuple(labels))
+            target[key] = target.get(key, 0) + value
+
+        in_flight = 0
+        for shard in shards:
+            in_flight += shard.started - shard.finished
+            for (blueprint, rule, method, status), count in shard.requests.copy().items():
+                add(counters, "library_http_requests_total",
+                    (("blueprint", blueprint), ("route", rule), ("method", method), ("status", status)), count)
+            for (blueprint, rule, method), buckets in shard.latency.copy().items():
+                labels = (("blueprint", blueprint), ("route", rule), ("method", method))
+                self._add_histogram(add, counters, "library_http_request_duration_seconds",
+                                    labels, LATENCY_BUCKETS, buckets[:-1], buckets[-1])
+            self._add_histogram(add, counters, "library_bcrypt_verify_duration_seconds",
+                                (), BCRYPT_BUCKETS, list(shard.bcrypt), shard.bcrypt_sum)
+            self._add_histogram(add, counters, "library_bcrypt_hash_duration_seconds",
+                                (), BCRYPT_BUCKETS, list(shard.bcrypt_hash), shard.bcrypt_hash_sum)
+            self._add_histogram(add, counters, "library_hash_pool_queue_wait_seconds",
+                                (), LATENCY_BUCKETS, list(shard.hash_wait), shard.hash_wait_sum)
+            for reason, count in shard.hash_rejected.copy().items():
+                add(counters, "library_hash_pool_rejected_total", (("reason", reason),), count)
+
+        add(gauges, "library_http_requests_in_flight", (), in_flight)
+
+        pool = self._engine.pool if self._engine is not None else None
+        if pool is not None and hasattr(pool, "checkedout"):
+            add(gauges, "library_db_pool_checked_out", (), pool.checkedout())
+            add(gauges, "library_db_pool_overflow", (), max(0, pool.overflow()))
+
+        if self._hash_pool is not None:
+            add(gauges, "library_hash_pool_admitted", (), self._hash_pool.admitted)
+
+        if self._audit_log is not None:
+            for outcome in ("written", "dropped", "failed"):
+                add(counters, "library_audit_events_total", (("outcome", outcome),), getattr(self._audit_log, outcome))
+            add(gauges, "library_audit_queue_depth", (), self._audit_log.queued)
+
+        if self._cache is not None:
+            for region, stats in self._cache.stats().items():
+                add(counters, "library_cache_hits_total", (("region", region),), stats["hits"])
+                add(counters, "library_cache_misses_total", (("region", region),), stats["misses"])
+
+        return {
+            "counters": [[name, [list(pair) for pair in labels], value] for (name, labels), value in counters.items()],
+            "gauges": [[name, [list(pair) for pair in labels], value] for (name, labels), value in gauges.items()],
+        }
+
+    @staticmethod
+    def _add_histogram(add, target, name, labels, bounds, counts, total):
+        """
+        Add cumulative bucket, sum and count samples of one histogram.
+
+        Args:
+            add (callable): Accumulator taking (target, name, labels, value).
+            target (dict): Samples to add to.
+            name (str): Histogram family name.
+            labels (tuple): Label pairs of the histogram.
+            bounds (tuple[float]): Bucket upper bounds, without +Inf.
+            counts (list[int]): Per-bucket (non-cumulative) counts, +Inf bucket last.
+            total (float): Sum of the observed values.
+        """
+        cumulative = 0
+        for bound, count in zip(bounds + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            add(target, f"{name}_bucket", labels + (("le", le),), cumulative)
+        add(target, f"{name}_sum", labels, total)
+        add(target, f"{name}_count", labels, cumulative)
+
+    def flush(self):
+        """
+        Write this process's snapshot to the shared directory.
+
+        Skipped if another thread is already flushing. The file is replaced
+        atomically, so readers never see a partial snapshot.
+        """
+        if not self.multiproc_dir or not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            snapshot = self._own_snapshot()
+            fd, tmp_path = tempfile.mkstemp(dir=self.multiproc_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, os.path.join(self.multiproc_dir, f"metrics_{os.getpid()}.json"))
+        finally:
+            self._flush_lock.release()
+
+    def _own_snapshot(self):
+        """
+        Collect this process's snapshot, including counters taken over with its pid.
+
+        Returns:
+            dict: collect() result plus "pid".
+        """
+        snapshot = dict(self.collect(), pid=os.getpid())
+        if not self.multiproc_dir:
+            return snapshot
+        if self._inherited_pid != os.getpid():
+            self._inherited = self._read_previous_counters()
+            self._inherited_pid = os.getpid()
+        if self._inherited:
+            counters = {(name, tuple(tuple(pair) for pair in labels)): value
+                        for name, labels, value in snapshot["counters"]}
+            for key, value in self._inherited.items():
+                counters[key] = counters.get(key, 0) + value
+            snapshot["counters"] = [[name, [list(pair) for pair in labels], value]
+                                    for (name, labels), value in counters.items()]
+        return snapshot
+
+    def _read_previous_counters(self):
+        """
+        Read the counters of an exited process whose snapshot file has this process's pid.
+
+        Returns:
+            dict: (name, labels) -> value, empty if there is no such file.
+        """
+        path = os.path.join(self.multiproc_dir, f"metrics_{os.getpid()}.json")
+        try:
+            with open(path) as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {(name, tuple(tuple(pair) for pair in labels)): value
+                for name, labels, value in previous.get("counters", [])}
+
+    def _snapshots(self):
+        """
+        Return the snapshots of all processes, this one freshly collected.
+        """
+        own = self._own_snapshot()
+        if not self.multiproc_dir:
+            return [own]
+
+        self.flush()
+        snapshots = [own]
+        for filename in os.listdir(self.multiproc_dir):
+            if not filename.startswith("metrics_") or filename == f"metrics_{os.getpid()}.json":
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, filename)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        """
+        Render the metrics of all processes in Prometheus text format.
+
+        Returns:
+            str: Exposition text (version 0.0.4).
+        """
+        samples = {}
+        for snapshot in self._snapshots():
+            alive = snapshot["pid"] == os.getpid() or _pid_alive(snapshot["pid"])
+            kinds = ("counters", "gauges") if alive else ("counters",)
+            for kind in kinds:
+                for name, labels, value in snapshot[kind]:
+                    key = (name, tuple(tuple(pair) for pair in labels))
+                    samples[key] = samples.get(key, 0) + value
+
+        for (name, labels), hits in list(samples.items()):
+            if name == "library_cache_hits_total":
+                total = hits + samples.get(("library_cache_misses_total", labels), 0)
+                samples[("library_cache_hit_ratio", labels)] = hits / total if total else 0.0
+
+        lines = []
+        for family, (kind, help_text) in FAMILIES.items():
+            family_samples = [
+                (key, value) for key, value in samples.items()
+                if key[0] == family or (kind == "histogram" and key[0].rsplit("_", 1)[0] == family)
+            ]
+            if not family_samples:
+                continue
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for (name, labels), value in family_samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {_format(value)}" if label_text else f"{name} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid):
+    """
+    Return whether a process with this pid is still running.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    """
+    Escape a label value for the text format.
+    """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value):
+    """
+    Format a sample value, dropping the fraction of whole numbers.
+    """
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
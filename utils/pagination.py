@@ -0,0 +1,188 @@
+from flask import current_app, request
+
+
+def parse_page_args(limit_arg='limit', after_arg='after'):
+    """
+    Read and validate keyset pagination parameters from the query string.
+
+    Reads `limit` (page size) and `after` (cursor: id of the last item of the
+    previous page). The page size falls back to PAGE_SIZE_DEFAULT and is capped
+    at PAGE_SIZE_MAX from the app config.
+
+    Args:
+        limit_arg (str, optional): Name of the page size parameter. Default 'limit'.
+        after_arg (str, optional): Name of the cursor parameter. Default 'after'.
+
+    Returns:
+        tuple[int | None, int | None, str | None]: (limit, after, None) on success
+            or (None, None, error_message) on invalid input.
+    """
+    limit = request.args.get(limit_arg, type=int)
+    after = request.args.get(after_arg, type=int)
+
+    if limit_arg in request.args and limit is None:
+        return None, None, f"{limit_arg} must be an integer"
+    if after_arg in request.args and after is None:
+        return None, None, f"{after_arg} must be an integer"
+
+    if limit is None:
+        limit = current_app.config['PAGE_SIZE_DEFAULT']
+    if limit < 1:
+        return None, None, f"{limit_arg} must be a positive integer"
+
+    return min(limit, current_app.config['PAGE_SIZE_MAX']), after, None
+
+
+def keyset_page(session, stmt, id_column, limit, after=None):
+    """
+    Execute a select statement as one keyset (seek) page ordered by id.
+
+    Filters on `id > after` and orders by the primary key, so every page is an
+    index range scan whose cost does not depend on how deep the page is.
+    One extra row is fetched to detect whether another page exists.
+
+    Args:
+        session (Session): Database session to execute with.
+        stmt (Select): Select statement for the entity, optionally filtered.
+        id_column (Column): Primary key column used as the cursor.
+        limit (int): Maximum number of items in the page.
+        after (int, optional): Cursor returned by the previous page.
+
+    Returns:
+        tuple[list, int | None]: (items, next_cursor); next_cursor is None on the last page.
+    """
+    if after is not None:
+        stmt = stmt.where(id_column > after)
+    stmt = stmt.order_by(id_column).limit(limit + 1)
+
+    items = session.scalars(stmt).all()
+    if len(items) > limit:
+        items = items[:limit]
+        return items, items[-1].id
+    return items, None
+
+
+def keyset_rows(session, stmt, id_column, limit, after=None):
+    """
+    Execute a select of plain columns as one keyset page of row tuples.
+
+    The Core counterpart of `keyset_page` for read-only listings: the
+    statement runs on the session's connection, so no ORM objects are built
+    or added to the identity map. The id column must be selected first; it
+    supplies the next cursor.
+
+    Args:
+        session (Session): Database session whose connection executes the statement.
+        stmt (Select): Select of the columns to return, id first, optionally filtered.
+        id_column (Column): Primary key column used as the cursor.
+        limit (int): Maximum number of rows in the page.
+        after (int, optional): Cursor returned by the previous page.
+
+    Returns:
+        tuple[list[str], list[tuple], int | None]: (column names, rows, next_cursor);
+            next_cursor is None on the last page.
+    """
+    if after is not None:
+        stmt = stmt.where(id_column > after)
+    stmt = stmt.order_by(id_column).limit(limit + 1)
+
+    result = session.connection().execute(stmt)
+    columns = list(result.keys())
+    rows = list(map(tuple, result))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return columns, rows, rows[-1][0]
+    return columns, rows, None
+
+
+def parse_format_arg():
+    """
+    Read and validate the `format` query parameter of list endpoints.
+
+    Returns:
+        tuple[str | None, str | None]: ('json' or 'columnar', None) on success
+            or (None, error_message) on invalid input.
+    """
+    fmt = request.args.get('format', 'json').strip().lower()
+    if fmt not in ('json', 'columnar'):
+        return None, "format must be json or columnar"
+    return fmt, None
+
+
+def rows_body(key, columns, rows, next_cursor, fmt):
+    """
+    Build the body of a list response from row tuples.
+
+    The columnar format returns the column names once and every row as an
+    array, so no per-row dict is built; the json format has the same shape
+    as the ORM-backed listing.
+
+    Args:
+        key (str): Name of the item list in the json format (e.g. 'books').
+        columns (list[str]): Column names of the rows.
+        rows (list[tuple]): Row values in column order.
+        next_cursor (int or None): Cursor of the next page.
+        fmt (str): 'json' or 'columnar'.
+
+    Returns:
+        dict: {key: [...], 'next_cursor'} or {'columns', 'rows', 'next_cursor'}.
+    """
+    if fmt == 'columnar':
+        return {'columns': columns, 'rows': rows, 'next_cursor': next_cursor}
+    return {key: [dict(zip(columns, row)) for row in rows], 'next_cursor': next_cursor}
+
+
+def str_to_bool(value):
+    """
+    Convert a query string flag ("true"/"false", "1"/"0") to bool.
+
+    Intended as a parser of `parse_filter_args`, which reports the raised
+    ValueError as an invalid parameter.
+
+    Args:
+        value (str): Raw query string value.
+
+    Returns:
+        bool: Parsed flag.
+
+    Raises:
+        ValueError: If the value is not a recognized boolean literal.
+    """
+    lowered = value.strip().lower()
+    if lowered in ('true', '1'):
+        return True
+    if lowered in ('false', '0'):
+        return False
+    raise ValueError(f"Invalid boolean value: {value}")
+
+
+# Parser -> what the value must be, for error messages
+FILTER_TYPE_NAMES = {int: "an integer", str_to_bool: "a boolean (true, false, 1 or 0)"}
+
+
+def parse_filter_args(**parsers):
+    """
+    Read and validate optional filter parameters from the query string.
+
+    Unlike `request.args.get(name, type=...)`, which turns an unparsable value
+    into None and so silently drops the filter, an invalid value is reported.
+
+    Args:
+        **parsers: Parameter name -> parser (e.g. int or str_to_bool) raising
+            ValueError on invalid input.
+
+    Returns:
+        tuple[dict | None, str | None]: ({name: value or None if absent}, None)
+            on success or (None, error_message) on invalid input.
+    """
+    values = {}
+    for name, parser in parsers.items():
+        raw = request.args.get(name)
+        if raw is None:
+            values[name] = None
+            continue
+        try:
+            values[name] = parser(raw)
+        except ValueError:
+            return None, f"{name} must be {FILTER_TYPE_NAMES.get(parser, 'valid')}"
+    return values, None
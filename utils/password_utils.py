@@ -1,20 +1,69 @@
-from extensions import bcrypt
+import time
 
+from flask import current_app
 
-def hash_password(password):
+from extensions import bcrypt, hash_pool, metrics
+
+
+def hash_password(password, rounds=None):
     """
     Hash a password using bcrypt for secure storage.
 
     Uses Flask-Bcrypt to generate a salted hash of the provided password.
-    The hash is decoded to UTF-8 string format for database storage.
+    The hash is decoded to UTF-8 string format for database storage. The work
+    runs on the hashing pool and its duration is recorded in the bcrypt metrics.
 
     Args:
         password (str): Plain text password to hash.
+        rounds (int, optional): bcrypt cost, defaults to BCRYPT_LOG_ROUNDS from the app config.
 
     Returns:
         str: Bcrypt hashed password as UTF-8 string, safe for database storage.
+
+    Raises:
+        HashPoolBusy: If the hashing pool is at capacity.
+    """
+    return hash_pool.run(_hash, password, rounds)
+
+
+def _hash(password, rounds):
+    """
+    Create a bcrypt hash and record the time it took.
+    """
+    started = time.perf_counter()
+    try:
+        return bcrypt.generate_password_hash(password, rounds).decode('utf-8')
+    finally:
+        metrics.observe_bcrypt_hash(time.perf_counter() - started)
+
+
+def hash_cost(hashed_password):
+    """
+    Read the cost (log2 rounds) a bcrypt hash was created with.
+
+    Args:
+        hashed_password (str): Bcrypt hash in modular crypt format ($2b$12$...).
+
+    Returns:
+        int or None: Cost of the hash, None if it is not a bcrypt hash.
+    """
+    parts = hashed_password.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password):
+    """
+    Check whether a stored hash differs from the configured bcrypt cost.
+
+    Args:
+        hashed_password (str): Stored bcrypt hash.
+
+    Returns:
+        bool: True if the hash should be replaced by one with BCRYPT_LOG_ROUNDS.
     """
-    return bcrypt.generate_password_hash(password).decode('utf-8')
+    return hash_cost(hashed_password) != current_app.config['BCRYPT_LOG_ROUNDS']
 
 
 def check_password(hashed_password, password):
@@ -22,7 +71,8 @@ def check_password(hashed_password, password):
     Verify a password against its hashed version.
 
     Uses bcrypt's secure comparison to check if a plain text password
-    matches the stored hash. Resistant to timing attacks.
+    matches the stored hash. Resistant to timing attacks. The verification
+    runs on the hashing pool and its duration is recorded in the bcrypt metrics.
 
     Args:
         hashed_password (str): Stored bcrypt hash from database.
@@ -30,5 +80,19 @@ def check_password(hashed_password, password):
 
     Returns:
         bool: True if password matches hash, False otherwise.
+
+    Raises:
+        HashPoolBusy: If the hashing pool is at capacity.
+    """
+    return hash_pool.run(_check, hashed_password, password)
+
+
+def _check(hashed_password, password):
+    """
+    Verify a password against a bcrypt hash and record the time it took.
     """
-    return bcrypt.check_password_hash(hashed_password, password)
\ No newline at end of file
+    started = time.perf_counter()
+    try:
+        return bcrypt.check_password_hash(hashed_password, password)
+    finally:
+        metrics.observe_bcrypt(time.perf_counter() - started)
\ No newline at end of file
@@ -0,0 +1,318 @@
+import itertools
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from limits import parse_many
+from limits.storage import MovingWindowSupport, Storage, storage_from_string
+from limits.strategies import MovingWindowRateLimiter
+from werkzeug.exceptions import TooManyRequests
+
+
+class RateLimitExceeded(TooManyRequests):
+    """
+    Raised when a request exceeds a route's rate limit.
+
+    Answered as 429 with a Retry-After header by the global error handler.
+    """
+    description = "Too many requests, please retry later"
+
+
+class SQLiteStorage(Storage, MovingWindowSupport):
+    """
+    `limits` storage backed by a local SQLite file, shared by all worker processes of a host.
+
+    Registered for `sqlite:///relative/path.db` and `sqlite:////absolute/path.db`
+    URIs. Every moving window entry is one row; acquiring runs in an IMMEDIATE
+    transaction, so concurrent processes serialize on the file lock and never
+    exceed a limit together. Expired rows of the acquired key are deleted on
+    every acquire, those of idle keys every PRUNE_EVERY acquires of a process.
+
+    Args:
+        uri (str): Storage URI naming the database file.
+        wrap_exceptions (bool, optional): Wrap sqlite3 errors in limits.errors.StorageError.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+    PRUNE_EVERY = 1000
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        """
+        Create the database file and tables if needed.
+        """
+        self.path = uri.split("://", 1)[1][1:]
+        self._local = threading.local()
+        self._acquires = itertools.count(1)  # next() is atomic, unlike += on a shared int
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS rate_limit_counter (
+                    key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS rate_limit_entry (
+                    key TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_rate_limit_entry_key_created_at
+                    ON rate_limit_entry (key, created_at);
+                CREATE INDEX IF NOT EXISTS ix_rate_limit_entry_expires_at
+                    ON rate_limit_entry (expires_at);
+            """)
+        finally:
+            connection.close()
+
+    @property
+    def base_exceptions(self):
+        """
+        Errors raised by the backend.
+        """
+        return sqlite3.Error
+
+    def _connect(self):
+        """
+        Open a connection in autocommit mode; transactions are started explicitly.
+        """
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @property
+    def _connection(self):
+        """
+        Connection of the calling thread, reopened after a fork.
+        """
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def incr(self, key, expiry, amount=1):
+        """
+        Increment a fixed window counter, starting a new window if it expired.
+        """
+        now = time.time()
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT INTO rate_limit_counter (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "value = CASE WHEN expires_at <= ? THEN excluded.value ELSE value + excluded.value END, "
+                "expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END",
+                (key, amount, now + expiry, now, now),
+            )
+            value = connection.execute("SELECT value FROM rate_limit_counter WHERE key = ?", (key,)).fetchone()[0]
+            connection.execute("COMMIT")
+            return value
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get(self, key):
+        """
+        Return the value of a fixed window counter, 0 if it expired.
+        """
+        row = self._connection.execute(
+            "SELECT value FROM rate_limit_counter WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        """
+        Return when a fixed window counter expires.
+        """
+        row = self._connection.execute(
+            "SELECT expires_at FROM rate_limit_counter WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self):
+        """
+        Return whether the database file is usable.
+        """
+        try:
+            self._connection.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        """
+        Delete every counter and window entry.
+        """
+        connection = self._connection
+        removed = connection.execute("DELETE FROM rate_limit_counter").rowcount
+        removed += connection.execute("DELETE FROM rate_limit_entry").rowcount
+        return removed
+
+    def clear(self, key):
+        """
+        Delete the counter and window entries of one key.
+        """
+        connection = self._connection
+        connection.execute("DELETE FROM rate_limit_counter WHERE key = ?", (key,))
+        connection.execute("DELETE FROM rate_limit_entry WHERE key = ?", (key,))
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        """
+        Add `amount` entries to a moving window unless that would exceed `limit`.
+        """
+        if amount > limit:
+            return False
+
+        now = time.time()
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "DELETE FROM rate_limit_entry WHERE key = ? AND created_at <= ?", (key, now - expiry)
+            )
+            if next(self._acquires) % self.PRUNE_EVERY == 0:
+                connection.execute("DELETE FROM rate_limit_entry WHERE expires_at <= ?", (now,))
+
+            count = connection.execute(
+                "SELECT COUNT(*) FROM rate_limit_entry WHERE key = ?", (key,)
+            ).fetchone()[0]
+            acquired = count + amount <= limit
+            if acquired:
+                connection.executemany(
+                    "INSERT INTO rate_limit_entry (key, created_at, expires_at) VALUES (?, ?, ?)",
+                    [(key, now, now + expiry)] * amount,
+                )
+            connection.execute("COMMIT")
+            return acquired
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get_moving_window(self, key, limit, expiry):
+        """
+        Return the oldest entry time and the number of entries in a moving window.
+        """
+        now = time.time()
+        oldest, count = self._connection.execute(
+            "SELECT MIN(created_at), COUNT(*) FROM rate_limit_entry WHERE key = ? AND created_at > ?",
+            (key, now - expiry),
+        ).fetchone()
+        return (oldest, count) if count else (now, 0)
+
+
+class RateLimiter:
+    """
+    Per-route, per-client rate limiting with the moving window strategy of `limits`.
+
+    Limits are declared by name in the RATE_LIMITS config (e.g. "login":
+    "10/minute;50/hour") and attached to routes with the `limit` decorator.
+    Every route keeps its own windows, per user for requests with a valid JWT
+    and per client IP otherwise. Counters live in RATE_LIMIT_STORAGE_URI:
+    `memory://` for a single process, `sqlite:////path/file.db` to share them
+    between the worker processes of a host.
+
+    Attributes:
+        enabled (bool): Whether limits are enforced.
+        limits (dict[str, list[RateLimitItem]]): Parsed limits per name.
+    """
+
+    def __init__(self):
+        """
+        Initialize disabled; `init_app` reads the limits and opens the storage.
+        """
+        self.enabled = False
+        self.limits = {}
+        self._strategy = None
+
+    def init_app(self, app):
+        """
+        Parse the configured limits and open the storage.
+
+        Args:
+            app (Flask): Application whose RATE_LIMIT_* config is used.
+        """
+        self.enabled = app.config["RATE_LIMIT_ENABLED"]
+        self.limits = {name: parse_many(value) for name, value in app.config["RATE_LIMITS"].items() if value}
+        if self.enabled:
+            self._strategy = MovingWindowRateLimiter(storage_from_string(app.config["RATE_LIMIT_STORAGE_URI"]))
+
+    def limit(self, name):
+        """
+        Decorator enforcing the named limit on a route.
+
+        Args:
+            name (str): Key of RATE_LIMITS; routes without a configured value are not limited.
+
+        Returns:
+            function: Decorator for a Flask view function.
+        """
+        def decorator(fn):
+            """
+            Wrap a view function with the rate limit check.
+
+            Args:
+                fn (function): The route function to be decorated.
+
+            Returns:
+                function: Wrapped function raising RateLimitExceeded over the limit.
+            """
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                """
+                Count the request and call the route if it is within the limit.
+                """
+                self.check(name)
+                return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def check(self, name):
+        """
+        Count the current request against the named limit.
+
+        Every window is tested before any is hit, so a request refused by one
+        window (e.g. the hour) does not use up a slot of another (the minute).
+
+        Args:
+            name (str): Key of RATE_LIMITS.
+
+        Raises:
+            RateLimitExceeded: If any of the limit's windows is exhausted.
+        """
+        items = self.limits.get(name)
+        if not self.enabled or not items:
+            return
+
+        client = self._client()
+        for item in items:
+            if not self._strategy.test(item, request.endpoint, client):
+                self._exceeded(item, client)
+        for item in items:
+            # A concurrent request may have taken the last slot since the test
+            if not self._strategy.hit(item, request.endpoint, client):
+                self._exceeded(item, client)
+
+    def _exceeded(self, item, client):
+        """
+        Raise RateLimitExceeded with the time until the window frees a slot.
+        """
+        reset_at, _ = self._strategy.get_window_stats(item, request.endpoint, client)
+        raise RateLimitExceeded(retry_after=max(1, math.ceil(reset_at - time.time())))
+
+    @staticmethod
+    def _client():
+        """
+        Identify the client: the JWT identity if a valid token is sent, else the remote address.
+        """
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        return f"user:{identity}" if identity else f"ip:{request.remote_addr}"
@@ -0,0 +1,84 @@
+import atexit
+import logging
+import threading
+
+
+class PeriodicJob:
+    """
+    Run a function every few seconds on a daemon thread of the app process.
+
+    The thread is started by the first request a process serves, so the job
+    runs in every serving worker but not in `flask` CLI commands or in a
+    pre-fork master process. Jobs must tolerate concurrent runs from other
+    worker processes.
+
+    Attributes:
+        name (str): Thread name, also used in log messages.
+        interval (float): Seconds between two runs, 0 disables the job.
+    """
+
+    def __init__(self, name, func):
+        """
+        Initialize a stopped job.
+
+        Args:
+            name (str): Thread name, also used in log messages.
+            func (callable): Function to run, called without arguments inside an app context.
+        """
+        self.name = name
+        self.interval = 0
+        self._func = func
+        self._app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def init_app(self, app, interval):
+        """
+        Schedule the job on the app if the interval is positive.
+
+        Args:
+            app (Flask): Application whose context the job runs in.
+            interval (float): Seconds between two runs, 0 disables the job.
+        """
+        self.interval = interval
+        if interval <= 0:
+            return
+        self._app = app
+        app.before_request(self._ensure_started)
+        atexit.register(self.stop)
+
+    def run_once(self):
+        """
+        Run the job once in an app context, logging any failure.
+        """
+        with self._app.app_context():
+            try:
+                self._func()
+            except Exception:
+                logging.exception(f"Scheduled job {self.name} failed")
+
+    def stop(self):
+        """
+        Ask the job thread to exit after its current run.
+        """
+        self._stop.set()
+
+    def _ensure_started(self):
+        """
+        Start the job thread unless it is already running in this process.
+        """
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """
+        Run the job right away, then every `interval` seconds until stopped.
+        """
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
@@ -0,0 +1,205 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_MAX_LOGGED_PARAMETERS = 1000
+
+
+def statement_shape(statement):
+    """
+    Reduce a SQL statement to its shape by dropping literals and extra whitespace.
+
+    Bound parameters are already placeholders, so two statements with the same
+    shape differ only in their parameters (the signature of an N+1 pattern).
+
+    Args:
+        statement (str): SQL text as sent to the driver.
+
+    Returns:
+        str: Normalized statement.
+    """
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+
+
+class SqlProfiler:
+    """
+    Opt-in per-request SQL profiler and N+1 detector.
+
+    Hooks the engine's cursor events to count statements and their time per
+    request, flags statement shapes repeated at least SQL_N_PLUS_ONE_THRESHOLD
+    times, adds a `Server-Timing` header to every response and keeps the last
+    SQL_PROFILER_BUFFER_SIZE request profiles in a ring buffer. Statements
+    slower than SQL_SLOW_QUERY_MS are logged with parameters and EXPLAIN output.
+    Does nothing unless SQL_PROFILER_ENABLED is set.
+
+    Attributes:
+        enabled (bool): Whether the profiler is installed.
+    """
+
+    def __init__(self):
+        """
+        Initialize a disabled profiler with an empty buffer.
+        """
+        self.enabled = False
+        self.slow_ms = 0
+        self.n_plus_one_threshold = 0
+        self.explain = False
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def init_app(self, app):
+        """
+        Install engine listeners and request hooks if enabled in app config.
+
+        Args:
+            app (Flask): Application to profile.
+        """
+        from extensions import db
+
+        self.enabled = app.config["SQL_PROFILER_ENABLED"]
+        if not self.enabled:
+            return
+
+        self.slow_ms = app.config["SQL_SLOW_QUERY_MS"]
+        self.n_plus_one_threshold = app.config["SQL_N_PLUS_ONE_THRESHOLD"]
+        self.explain = app.config["SQL_EXPLAIN_SLOW_QUERIES"]
+        self._buffer = deque(maxlen=app.config["SQL_PROFILER_BUFFER_SIZE"])
+
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(db.engine, "after_cursor_execute", self._after_cursor_execute)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def recent(self, limit=None):
+        """
+        Return the most recent request profiles, newest first.
+
+        Args:
+            limit (int, optional): Maximum number of profiles.
+
+        Returns:
+            list[dict]: Request profiles.
+        """
+        with self._lock:
+            profiles = list(self._buffer)
+        profiles.reverse()
+        return profiles[:limit] if limit else profiles
+
+    def _start_request(self):
+        """
+        Reset the per-request counters.
+        """
+        g.sql_profile = {
+            "started": time.perf_counter(),
+            "count": 0,
+            "duration": 0.0,
+            "shapes": Counter(),
+            "slow": [],
+        }
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        """
+        Remember when a statement started.
+        """
+        conn.info.setdefault("sql_profiler_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        """
+        Account a finished statement to the current request and log it if slow.
+        """
+        elapsed = time.perf_counter() - conn.info["sql_profiler_start"].pop()
+        if getattr(self._local, "explaining", False):
+            return
+
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= self.slow_ms:
+            self._log_slow(cursor, statement, parameters, executemany, elapsed_ms)
+
+        if not has_request_context() or "sql_profile" not in g:
+            return
+        profile = g.sql_profile
+        profile["count"] += 1
+        profile["duration"] += elapsed
+        profile["shapes"][statement_shape(statement)] += 1
+        if elapsed_ms >= self.slow_ms:
+            profile["slow"].append({"statement": statement, "duration_ms": round(elapsed_ms, 3)})
+
+    def _log_slow(self, cursor, statement, parameters, executemany, elapsed_ms):
+        """
+        Log a slow statement with its parameters and, for SELECTs, its plan.
+
+        The plan is read through a separate DBAPI cursor on the same connection,
+        so it neither fires engine events nor disturbs the pending result.
+        """
+        plan = None
+        if self.explain and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+            prefix = "EXPLAIN QUERY PLAN " if cursor.__class__.__module__.startswith("sqlite3") else "EXPLAIN "
+            self._local.explaining = True
+            explain_cursor = cursor.connection.cursor()
+            try:
+                explain_cursor.execute(prefix + statement, parameters)
+                plan = "\n".join(" ".join(str(col) for col in row) for row in explain_cursor.fetchall())
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+            finally:
+                explain_cursor.close()
+                self._local.explaining = False
+
+        logged_parameters = repr(parameters)
+        if len(logged_parameters) > _MAX_LOGGED_PARAMETERS:
+            logged_parameters = logged_parameters[:_MAX_LOGGED_PARAMETERS] + "..."
+        logging.warning(
+            f"Slow SQL ({elapsed_ms:.1f} ms): {statement}\nParameters: {logged_parameters}"
+            + (f"\nPlan:\n{plan}" if plan else "")
+        )
+
+    def _finish_request(self, response):
+        """
+        Add the Server-Timing header and store the request profile.
+        """
+        profile = g.pop("sql_profile", None)
+        if profile is None:
+            return response
+
+        total_ms = (time.perf_counter() - profile["started"]) * 1000
+        sql_ms = profile["duration"] * 1000
+        repeated = [
+            {"statement": shape, "count": count}
+            for shape, count in profile["shapes"].most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={sql_ms:.2f};desc="{profile["count"]} queries", app;dur={total_ms:.2f}'
+        )
+        if repeated:
+            logging.warning(
+                f"Possible N+1 in {request.method} {request.path}: "
+                + "; ".join(f"{r['count']}x {r['statement']}" for r in repeated)
+            )
+
+        with self._lock:
+            self._buffer.append({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "method": request.method,
+                "path": request.full_path.rstrip("?"),
+                "status": response.status_code,
+                "duration_ms": round(total_ms, 3),
+                "sql_count": profile["count"],
+                "sql_ms": round(sql_ms, 3),
+                "n_plus_one": repeated,
+                "slow_queries": profile["slow"],
+            })
+        return response
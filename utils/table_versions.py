@@ -0,0 +1,142 @@
+import hashlib
+import itertools
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+
+
+class TableVersions:
+    """
+    Per-table version stamps shared by all worker processes of a host.
+
+    Every committed transaction that inserted, updated or deleted rows of a
+    table gives the table a new, never reused stamp. Writes are picked up from
+    the session (flushed ORM objects and ORM-executed INSERT/UPDATE/DELETE
+    statements), so every repository write path is covered without explicit
+    calls; writes outside the session must call `bump`.
+
+    Each stamp is a small file in TABLE_VERSION_DIR that is replaced
+    atomically, so reading a version costs one file read and no database
+    round trip.
+
+    Attributes:
+        directory (str or None): Directory holding one stamp file per table.
+    """
+
+    def __init__(self):
+        """
+        Initialize without a directory; `init_app` sets it up.
+        """
+        self.directory = None
+        self._counter = itertools.count()
+
+    def init_app(self, app):
+        """
+        Create the stamp directory and track writes of the app's session.
+
+        Without TABLE_VERSION_DIR, a directory in the system temp dir derived
+        from the database URL is used, so all processes on the host serving the
+        same database share it.
+
+        Args:
+            app (Flask): Application whose database writes are tracked.
+        """
+        from extensions import db
+
+        database_hash = hashlib.sha1(app.config["SQLALCHEMY_DATABASE_URI"].encode()).hexdigest()[:12]
+        self.directory = app.config["TABLE_VERSION_DIR"] or os.path.join(
+            tempfile.gettempdir(), f"library-table-versions-{database_hash}"
+        )
+        os.makedirs(self.directory, exist_ok=True)
+
+        event.listen(db.session, "after_flush", self._after_flush)
+        event.listen(db.session, "do_orm_execute", self._do_orm_execute)
+        event.listen(db.session, "after_commit", self._after_commit)
+        event.listen(db.session, "after_rollback", self._after_rollback)
+
+    def get(self, table):
+        """
+        Return the current version stamp of a table.
+
+        Args:
+            table (str): Table name.
+
+        Returns:
+            str: Opaque version stamp.
+        """
+        path = os.path.join(self.directory, table)
+        try:
+            with open(path) as f:
+                return f.read()
+        except FileNotFoundError:
+            return self.bump(table)[table]
+
+    def get_many(self, tables):
+        """
+        Return the version stamps of several tables.
+
+        Args:
+            tables (Iterable[str]): Table names.
+
+        Returns:
+            list[str]: Stamps in the order of `tables`.
+        """
+        return [self.get(table) for table in tables]
+
+    def bump(self, *tables):
+        """
+        Give tables a new version stamp.
+
+        Args:
+            *tables (str): Names of the tables that changed.
+
+        Returns:
+            dict[str, str]: New stamp per table.
+        """
+        stamps = {}
+        for table in tables:
+            stamp = f"{time.time_ns():x}-{os.getpid():x}-{next(self._counter):x}"
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(stamp)
+            os.replace(tmp_path, os.path.join(self.directory, table))
+            stamps[table] = stamp
+        return stamps
+
+    @staticmethod
+    def _pending(session):
+        """
+        Return the set of tables written by the session's current transaction.
+        """
+        return session.info.setdefault("table_versions_pending", set())
+
+    def _after_flush(self, session, flush_context):
+        """
+        Remember the tables of flushed new, changed and deleted objects.
+        """
+        pending = self._pending(session)
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            pending.add(instance.__table__.name)
+
+    def _do_orm_execute(self, orm_execute_state):
+        """
+        Remember the table of INSERT, UPDATE and DELETE statements run through the session.
+        """
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            self._pending(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+    def _after_commit(self, session):
+        """
+        Bump the tables written by the committed transaction.
+        """
+        pending = session.info.pop("table_versions_pending", None)
+        if pending:
+            self.bump(*sorted(pending))
+
+    def _after_rollback(self, session):
+        """
+        Forget the writes of a rolled back transaction.
+        """
+        session.info.pop("table_versions_pending", None)
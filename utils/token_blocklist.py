@@ -0,0 +1,109 @@
+import threading
+import time
+
+
+class TokenBlocklist:
+    """
+    In-memory set of revoked JWT identifiers, synced from the revoked_token table.
+
+    Every JWT check (`jwt_required`, `role_required`) consults the blocklist
+    through the JWTManager's `token_in_blocklist_loader`, which is a single
+    dict lookup, so revocation adds no query to authenticated requests.
+    A token revoked by this process is blocked at once; revocations made by
+    other worker processes are picked up by `sync`, which a periodic job runs
+    every TOKEN_BLOCKLIST_SYNC_INTERVAL seconds and which only reloads the
+    table when its version stamp changed. Entries carry the token's expiry
+    and are dropped once it has passed, when the token is rejected anyway.
+
+    Attributes:
+        version (str or None): Table version stamp of the last reload.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty, never synced blocklist.
+        """
+        self.version = None
+        self._entries = {}
+        self._earliest_expiry = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Register the blocklist check with the JWT manager and load it on the first request.
+
+        Args:
+            app (Flask): Application whose tokens are checked.
+        """
+        from extensions import jwt
+
+        jwt.token_in_blocklist_loader(self._is_blocked)
+        app.before_request(self._ensure_synced)
+
+    def __len__(self):
+        """
+        Number of revoked tokens currently held.
+        """
+        return len(self._entries)
+
+    def is_revoked(self, jti):
+        """
+        Check whether a token identifier was revoked.
+
+        Args:
+            jti (str): Token identifier.
+
+        Returns:
+            bool: True if the token is revoked.
+        """
+        return jti in self._entries
+
+    def add(self, jti, expires_at):
+        """
+        Block a token in this process right away.
+
+        Args:
+            jti (str): Token identifier.
+            expires_at (int): Token expiry as a Unix timestamp.
+        """
+        with self._lock:
+            self._entries[jti] = expires_at
+            if self._earliest_expiry is None or expires_at < self._earliest_expiry:
+                self._earliest_expiry = expires_at
+
+    def sync(self):
+        """
+        Reload the revoked tokens if the table changed, else drop expired entries.
+
+        Must run inside an app context.
+        """
+        from extensions import table_versions
+        from repositories.revoked_token_repository import RevokedTokenRepository
+
+        now = int(time.time())
+        version = table_versions.get("revoked_token")
+        with self._lock:
+            if version != self.version:
+                entries = {row.jti: row.expires_at for row in RevokedTokenRepository().get_active(now)}
+                # Tokens added locally whose commit the reload raced with stay blocked
+                entries.update((jti, exp) for jti, exp in self._entries.items() if exp > now)
+                self.version = version
+            elif self._earliest_expiry is not None and self._earliest_expiry <= now:
+                entries = {jti: exp for jti, exp in self._entries.items() if exp > now}
+            else:
+                return
+            self._entries = entries
+            self._earliest_expiry = min(entries.values(), default=None)
+
+    def _ensure_synced(self):
+        """
+        Load the blocklist before the first request this process serves.
+        """
+        if self.version is None:
+            self.sync()
+
+    def _is_blocked(self, jwt_header, jwt_payload):
+        """
+        `token_in_blocklist_loader` callback of the JWT manager.
+        """
+        return jwt_payload["jti"] in self._entries